@@ -12,6 +12,38 @@ class Hyperparameters:
     GNN_LR = 0.005  # Learning rate de la GNN
     GNN_EPOCHS = 50  # Número de épocas de entrenamiento
     GNN_BATCH_SIZE = 32  # Tamaño del batch para entrenar
+    GNN_DECODER = "dot"  # Decoder de aristas: "dot" (producto escalar) o "mlp"
+    GNN_NEGATIVE_RATIO = 1  # Pares sin arista muestreados por cada arista en cada época
+    GNN_PREDICT_BLOCK_SIZE = 1024  # Filas por bloque al puntuar pares de nodos en `suggest_new_connections`
+    GNN_SAMPLE_FANOUTS = (10, 5)  # Vecinos muestreados por nodo en cada salto (mini-lotes estilo GraphSAGE)
+    GNN_FULL_GRAPH_MAX_NODES = 50000  # Por encima, se entrena por mini-lotes muestreados en vez del grafo completo
+    GNN_STALENESS_THRESHOLD = 0.1  # Fracción de nodos cambiados que dispara el reentrenamiento incremental
+    GNN_FINETUNE_HOPS = 2  # Saltos alrededor de los nodos cambiados que entran en el ajuste fino
+    GNN_FINETUNE_EPOCHS = 10  # Épocas del ajuste fino incremental
+
+    # 🧭 Índice de vecinos aproximados (IVF) sobre los embeddings
+    ANN_MIN_TRAIN_SIZE = 2048  # Por debajo de este número de nodos la búsqueda es exacta
+    ANN_N_PROBE = 8  # Celdas revisadas por consulta
+    ANN_KMEANS_ITER = 10  # Iteraciones de k-means al entrenar las celdas
+    ANN_SUGGEST_K = 32  # Vecinos consultados por nodo en el barrido de sugerencias
+
+    # 🔎 Búsqueda de caminos del razonamiento (coste de arista = 1 / peso)
+    REASONING_MAX_HOPS = 6  # Saltos máximos de un camino de relación
+    REASONING_MAX_COST = 20.0  # Coste máximo de un camino
+    REASONING_MAX_EXPANSIONS = 20000  # Nodos expandidos antes de devolver la mejor respuesta encontrada
+    REASONING_PATH_CACHE_SIZE = 1024  # Resultados (origen, destino) en la LRU
+    LANDMARK_COUNT = 128  # Landmarks del índice ALT (una fila float32 por landmark y nodo)
+    LANDMARK_REBUILD_EVERY = 1000  # Mutaciones del grafo tras las que se reconstruye el índice de landmarks
+    CHAIN_BEAM_WIDTH = 16  # Caminos que sobreviven en cada nivel del razonamiento en cadena
+    CHAIN_MAX_DEPTH = 3  # Saltos máximos de una cadena
+    CHAIN_FANOUT = 8  # Vecinos más fuertes ampliados por nodo
+    CHAIN_TOP_N = 3  # Cadenas devueltas
+    CHAIN_SCORING = "product"  # Puntuación de una cadena: "product" o "sum" de los pesos
+    PPR_ALPHA = 0.15  # Probabilidad de volver a las semillas en el PageRank personalizado
+    PPR_EPSILON = 1e-4  # Residuo mínimo (por unidad de fuerza) para seguir propagando
+    PPR_MAX_PUSHES = 10000  # Pushes máximos por consulta
+    PPR_CACHE_SIZE = 256  # Conjuntos de semillas en la LRU
+    PPR_TOP_K = 10  # Conceptos mostrados con el ranking "pagerank"
 
     # 🎯 Configuración del Reinforcement Learning (RL)
     RL_DISCOUNT_FACTOR = 0.95  # Factor de descuento para RL (gamma)
@@ -27,6 +59,15 @@ class Hyperparameters:
         print(f"📈 Hiperparámetros de CEREBRO:")
         print(f"   🧠 GNN - Input Dim: {cls.GNN_INPUT_DIM}, Hidden Dim: {cls.GNN_HIDDEN_DIM}, Output Dim: {cls.GNN_OUTPUT_DIM}")
         print(f"   🔧 GNN - Learning Rate: {cls.GNN_LR}, Epochs: {cls.GNN_EPOCHS}, Batch Size: {cls.GNN_BATCH_SIZE}")
+        print(f"   🔗 GNN - Decoder de aristas: {cls.GNN_DECODER}, Negativos por arista: {cls.GNN_NEGATIVE_RATIO}")
+        print(f"   🔮 GNN - Bloque de predicción: {cls.GNN_PREDICT_BLOCK_SIZE}")
+        print(f"   🧩 GNN - Fanouts de muestreo: {cls.GNN_SAMPLE_FANOUTS}, Máx. nodos grafo completo: {cls.GNN_FULL_GRAPH_MAX_NODES}")
+        print(f"   🔁 GNN - Umbral de obsolescencia: {cls.GNN_STALENESS_THRESHOLD}, Saltos: {cls.GNN_FINETUNE_HOPS}, Épocas de ajuste: {cls.GNN_FINETUNE_EPOCHS}")
+        print(f"   🧭 ANN - Min Train Size: {cls.ANN_MIN_TRAIN_SIZE}, N Probe: {cls.ANN_N_PROBE}, K-means Iter: {cls.ANN_KMEANS_ITER}, Suggest K: {cls.ANN_SUGGEST_K}")
+        print(f"   🔎 Razonamiento - Saltos: {cls.REASONING_MAX_HOPS}, Coste: {cls.REASONING_MAX_COST}, Expansiones: {cls.REASONING_MAX_EXPANSIONS}, Caché: {cls.REASONING_PATH_CACHE_SIZE}")
+        print(f"   🗺️ Landmarks - Número: {cls.LANDMARK_COUNT}, Reconstrucción cada {cls.LANDMARK_REBUILD_EVERY} mutaciones")
+        print(f"   ⛓️ Cadenas - Beam: {cls.CHAIN_BEAM_WIDTH}, Profundidad: {cls.CHAIN_MAX_DEPTH}, Fanout: {cls.CHAIN_FANOUT}, Top-N: {cls.CHAIN_TOP_N}, Puntuación: {cls.CHAIN_SCORING}")
+        print(f"   🧲 PPR - Alpha: {cls.PPR_ALPHA}, Epsilon: {cls.PPR_EPSILON}, Pushes: {cls.PPR_MAX_PUSHES}, Caché: {cls.PPR_CACHE_SIZE}, Top-K: {cls.PPR_TOP_K}")
         print(f"   🎯 RL - Discount Factor: {cls.RL_DISCOUNT_FACTOR}, Learning Rate: {cls.RL_LEARNING_RATE}")
         print(f"   🔄 RL - Exploration Decay: {cls.RL_EXPLORATION_DECAY}, Min Epsilon: {cls.RL_MIN_EPSILON}")
         print(f"   🧠 RL - Memory Size: {cls.RL_MAX_MEMORY_SIZE}, Batch Size: {cls.RL_BATCH_SIZE}")
@@ -11,15 +11,36 @@ class Settings:
     # 📂 Rutas de almacenamiento
     MEMORY_STORAGE_PATH = os.getenv("MEMORY_STORAGE_PATH", "data/memory_data.json")
     GRAPH_STORAGE_PATH = os.getenv("GRAPH_STORAGE_PATH", "data/graph_data.json")
+    MEMORY_GRAPH_FILE = os.getenv("MEMORY_GRAPH_FILE", "data/memory_graph.json")  # `.crbg` = formato binario mapeado
+    CONSCIOUSNESS_GRAPH_FILE = os.getenv("CONSCIOUSNESS_GRAPH_FILE", "data/consciousness_graph.json")
+    GNN_MODEL_PATH = os.getenv("GNN_MODEL_PATH", "models/gnn_link_model.h5")  # Pesos de la GNN de predicción de enlaces
 
     # 🔧 Configuración del procesador de lenguaje natural
     NLP_MODEL = os.getenv("NLP_MODEL", "es_core_news_md")  # Modelo de spaCy
+    NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "256"))  # Textos por lote en `nlp.pipe`
+    NLP_N_PROCESS = int(os.getenv("NLP_N_PROCESS", "1"))  # Procesos de `nlp.pipe` (1 = en el proceso actual)
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache")  # Prefijo de los archivos de la caché
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))  # Entradas de la LRU en memoria
+    EMBEDDING_CACHE_READ_ONLY = os.getenv("EMBEDDING_CACHE_READ_ONLY", "0") == "1"  # No escribir en el almacén (procesos auxiliares)
+
+    # 🚦 Agrupación de peticiones de inferencia (`InferenceBatcher`)
+    INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", "64"))  # Peticiones como máximo por lote
+    INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "5"))  # Espera máxima para completar un lote
+
+    # 🧲 Orden de los conceptos relacionados en las respuestas: "peso" (arista directa) o "pagerank"
+    ANSWER_RANKING = os.getenv("ANSWER_RANKING", "peso")
+
+    # 🗄️ Caché de respuestas de `ReasoningEngine.process_query` (se invalida por nodo al mutar los grafos)
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))  # Respuestas en la LRU (0 = desactivada)
+    QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "300"))  # Segundos de vida de una respuesta (0 = sin caducidad)
 
     # 📊 Configuración de logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # INFO, DEBUG, ERROR
 
     # 💾 Configuración de persistencia
     AUTO_SAVE_INTERVAL = int(os.getenv("AUTO_SAVE_INTERVAL", "30"))  # Guardado automático cada X segundos
+    JOURNAL_BATCH_SIZE = int(os.getenv("JOURNAL_BATCH_SIZE", "64"))  # Operaciones del diario por cada fsync
+    JOURNAL_COMPACT_BYTES = int(os.getenv("JOURNAL_COMPACT_BYTES", str(8 * 1024 * 1024)))  # Tamaño del diario que dispara la compactación
 
     @classmethod
     def display_settings(cls):
@@ -27,8 +48,17 @@ class Settings:
         print(f"🔧 Configuración del sistema CEREBRO:")
         print(f"   📂 Ruta de almacenamiento de memoria: {cls.MEMORY_STORAGE_PATH}")
         print(f"   📂 Ruta de almacenamiento de grafos: {cls.GRAPH_STORAGE_PATH}")
+        print(f"   📂 Grafo de memoria: {cls.MEMORY_GRAPH_FILE}")
+        print(f"   📂 Grafo de conciencia: {cls.CONSCIOUSNESS_GRAPH_FILE}")
+        print(f"   📂 Pesos de la GNN: {cls.GNN_MODEL_PATH}")
         print(f"   🧠 Modelo NLP en uso: {cls.NLP_MODEL}")
+        print(f"   📦 NLP por lotes: {cls.NLP_BATCH_SIZE} textos, {cls.NLP_N_PROCESS} proceso(s)")
+        print(f"   🗃️ Caché de embeddings: {cls.EMBEDDING_CACHE_PATH} (LRU de {cls.EMBEDDING_CACHE_SIZE} entradas{', solo lectura' if cls.EMBEDDING_CACHE_READ_ONLY else ''})")
+        print(f"   🚦 Inferencia por lotes: hasta {cls.INFERENCE_MAX_BATCH} peticiones o {cls.INFERENCE_MAX_WAIT_MS} ms")
+        print(f"   🧲 Ranking de respuestas: {cls.ANSWER_RANKING}")
+        print(f"   🗄️ Caché de respuestas: {cls.QUERY_CACHE_SIZE} consultas, TTL {cls.QUERY_CACHE_TTL} s")
         print(f"   📝 Nivel de logging: {cls.LOG_LEVEL}")
         print(f"   💾 Guardado automático cada {cls.AUTO_SAVE_INTERVAL} segundos")
+        print(f"   📝 Diario: fsync cada {cls.JOURNAL_BATCH_SIZE} operaciones, compactación a {cls.JOURNAL_COMPACT_BYTES} bytes")
 
 
@@ -0,0 +1,82 @@
+import bisect
+from array import array
+
+
+class AdjacencyIndex:
+    """
+    📌 Índice de adyacencia ordenado por peso para el grafo de memoria.
+    - Cada fila guarda las claves `-peso` en un `array('d')` ascendente y los vecinos en paralelo.
+    - Umbral: búsqueda binaria + corte. Top-k: corte de los k primeros.
+    - Las filas se construyen al consultarlas por primera vez y se actualizan de forma incremental.
+    """
+
+    def __init__(self, get_graph, attr="peso"):
+        self.get_graph = get_graph
+        self.attr = attr
+        self._filas = {}  # nodo -> (claves, vecinos, pesos por vecino)
+
+    def _fila(self, nodo):
+        """📌 Devuelve (y construye si hace falta) la fila ordenada de un nodo."""
+        fila = self._filas.get(nodo)
+        if fila is None:
+            graph = self.get_graph()
+            if nodo not in graph:
+                return None
+            pares = sorted(((-datos[self.attr], vecino) for vecino, datos in graph[nodo].items()), key=lambda par: par[0])
+            claves = array("d", (clave for clave, _ in pares))
+            vecinos = [vecino for _, vecino in pares]
+            fila = (claves, vecinos, {vecino: -clave for clave, vecino in pares})
+            self._filas[nodo] = fila
+        return fila
+
+    def related(self, nodo, threshold=0.5, top_k=None):
+        """📌 Vecinos con `peso >= threshold`, de mayor a menor peso (como mucho `top_k`)."""
+        fila = self._fila(nodo)
+        if fila is None:
+            return []
+        claves, vecinos, _ = fila
+        corte = bisect.bisect_right(claves, -threshold)
+        if top_k is not None:
+            corte = min(corte, top_k)
+        return [(vecinos[i], -claves[i]) for i in range(corte)]
+
+    def top_k(self, nodo, k):
+        """📌 Los `k` vecinos de mayor peso, sin umbral."""
+        return self.related(nodo, threshold=float("-inf"), top_k=k)
+
+    def sample(self, nodo, k, rng):
+        """📌 Hasta `k` vecinos `(vecino, peso)` elegidos al azar sin reemplazo (posiciones de la fila, sin recorrerla)."""
+        fila = self._fila(nodo)
+        if fila is None:
+            return []
+        claves, vecinos, _ = fila
+        posiciones = range(len(vecinos)) if len(vecinos) <= k else rng.choice(len(vecinos), k, replace=False).tolist()
+        return [(vecinos[i], -claves[i]) for i in posiciones]
+
+    def _actualizar_fila(self, nodo, vecino, peso):
+        """📌 Recoloca a `vecino` en la fila de `nodo` (solo si la fila ya existe)."""
+        fila = self._filas.get(nodo)
+        if fila is None:
+            return
+        claves, vecinos, pesos = fila
+        anterior = pesos.get(vecino)
+        if anterior is not None:
+            i = bisect.bisect_left(claves, -anterior)
+            while vecinos[i] != vecino:  # Entre claves iguales, buscar el vecino concreto
+                i += 1
+            del claves[i]
+            del vecinos[i]
+        j = bisect.bisect_right(claves, -peso)
+        claves.insert(j, -peso)
+        vecinos.insert(j, vecino)
+        pesos[vecino] = peso
+
+    def update_edge(self, nodo1, nodo2, peso):
+        """📌 Registra el peso nuevo (o actual) de la arista `nodo1 ↔ nodo2`."""
+        self._actualizar_fila(nodo1, vecino=nodo2, peso=peso)
+        if nodo1 != nodo2:
+            self._actualizar_fila(nodo2, vecino=nodo1, peso=peso)
+
+    def clear(self):
+        """📌 Descarta todas las filas (p. ej. al sustituir el grafo completo)."""
+        self._filas.clear()
@@ -0,0 +1,93 @@
+from collections import namedtuple
+
+import numpy as np
+
+from config.hyperparameters import Hyperparameters
+from core.path_search import PESO_MINIMO
+
+Cadena = namedtuple("Cadena", ["nodos", "score"])
+
+PUNTUACIONES = ("product", "sum")
+
+
+class ChainReasoner:
+    """
+    📌 Razonamiento en cadena: recorre el grafo de memoria a varios saltos con beam search.
+    - Cada camino se puntúa con el producto (o la suma) de los `peso` de sus aristas.
+    - En cada nivel solo se amplían los `beam_width` mejores caminos y, de cada nodo, sus `fanout` vecinos más
+      fuertes (`get_related_concepts(..., top_k)` sobre el índice ordenado): el coste está acotado por
+      `beam_width × fanout × max_depth`, aunque un concepto tenga miles de vecinos.
+    - Las fronteras son arrays (puntuaciones y punteros al padre); la poda usa `np.argpartition`.
+    - Un camino nunca repite un nodo.
+    """
+
+    def __init__(self, memory, beam_width=None, max_depth=None, fanout=None, scoring=None):
+        self.memory = memory
+        self.beam_width = Hyperparameters.CHAIN_BEAM_WIDTH if beam_width is None else beam_width
+        self.max_depth = Hyperparameters.CHAIN_MAX_DEPTH if max_depth is None else max_depth
+        self.fanout = Hyperparameters.CHAIN_FANOUT if fanout is None else fanout
+        self.scoring = Hyperparameters.CHAIN_SCORING if scoring is None else scoring
+        if self.scoring not in PUNTUACIONES:
+            raise ValueError(f"❌ Puntuación desconocida: {self.scoring!r} (opciones: {', '.join(PUNTUACIONES)})")
+
+    @staticmethod
+    def _camino(niveles, profundidad, i):
+        """📌 Nodos del camino que termina en la posición `i` del nivel `profundidad`."""
+        camino = []
+        while profundidad >= 0:
+            nodos, padres = niveles[profundidad]
+            camino.append(nodos[i])
+            i = padres[i]
+            profundidad -= 1
+        camino.reverse()
+        return camino
+
+    def explain(self, origen, destino=None, top_n=None, max_depth=None, min_hops=1):
+        """
+        📌 Las `top_n` mejores cadenas de asociación que parten de `origen`.
+        - Con `destino`, solo las que terminan en él.
+        - `min_hops` descarta cadenas más cortas (p. ej. 2 para no repetir los vecinos directos).
+        - Devuelve `[Cadena(nodos, score)]` de mayor a menor puntuación.
+        """
+        top_n = Hyperparameters.CHAIN_TOP_N if top_n is None else top_n
+        max_depth = self.max_depth if max_depth is None else max_depth
+        if not self.memory.has_node(origen):
+            return []
+
+        producto = self.scoring == "product"
+        niveles = [([origen], np.array([-1]))]
+        scores = np.zeros(1)  # Log del producto o suma de pesos
+        resultados = []  # (score, profundidad, posición)
+
+        for profundidad in range(1, max_depth + 1):
+            nodos_nivel = niveles[-1][0]
+            cand_padres, cand_nodos, cand_pesos = [], [], []
+            for i, nodo in enumerate(nodos_nivel):
+                visitados = set(self._camino(niveles, profundidad - 1, i))
+                for vecino, peso in self.memory.get_related_concepts(nodo, threshold=PESO_MINIMO, top_k=self.fanout):
+                    if vecino not in visitados:
+                        cand_padres.append(i)
+                        cand_nodos.append(vecino)
+                        cand_pesos.append(peso)
+            if not cand_nodos:
+                break
+
+            padres = np.array(cand_padres)
+            pesos = np.array(cand_pesos, dtype=np.float64)
+            candidatos = scores[padres] + (np.log(pesos) if producto else pesos)
+            if len(candidatos) > self.beam_width:
+                elegidos = np.argpartition(-candidatos, self.beam_width - 1)[:self.beam_width]
+            else:
+                elegidos = np.arange(len(candidatos))
+            scores = candidatos[elegidos]
+            nodos = [cand_nodos[k] for k in elegidos.tolist()]
+            niveles.append((nodos, padres[elegidos]))
+
+            if profundidad >= min_hops:
+                for j, nodo in enumerate(nodos):
+                    if destino is None or nodo == destino:
+                        resultados.append((float(scores[j]), profundidad, j))
+
+        resultados.sort(key=lambda r: r[0], reverse=True)
+        return [Cadena(self._camino(niveles, profundidad, j), round(float(np.exp(score)) if producto else score, 4))
+                for score, profundidad, j in resultados[:top_n]]
@@ -1,5 +1,10 @@
 import networkx as nx
-import json
+
+from config.settings import Settings
+from core.node_index import NodeIndex
+from core.node_versions import NodeVersions, nodos_afectados
+from core.restriction_matcher import RestrictionMatcher
+from data.graph_persistence import GraphPersistence
 
 class ConsciousnessEngine:
     """
@@ -7,53 +12,105 @@ class ConsciousnessEngine:
     Gestiona la identidad de la IA y su capacidad de autoevaluación.
     """
 
-    def __init__(self, consciousness_file="data/consciousness_graph.json"):
+    def __init__(self, consciousness_file=Settings.CONSCIOUSNESS_GRAPH_FILE, autosave_interval=None):
         self.consciousness_file = consciousness_file
         self.graph = nx.Graph()
+        self._restricciones = None  # 🚨 Filtro compilado; `None` = reconstruir en la próxima consulta
+        self.index = NodeIndex(lambda: self.graph.nodes(data=True), numeric_attrs=("impacto",))  # 🗂️ Por tipo e impacto
+        self.node_versions = NodeVersions()  # 🏷️ Sellos por nodo para las cachés de respuestas
+        self.persistence = GraphPersistence(
+            consciousness_file,
+            lambda: self.graph,
+            interval=autosave_interval,
+            nombre="grafo de conciencia",
+        )
         self.load_consciousness()
 
     def load_consciousness(self):
-        """Carga el grafo de conciencia desde un archivo JSON."""
-        try:
-            with open(self.consciousness_file, "r", encoding="utf-8") as file:
-                data = json.load(file)
-                self.graph = nx.node_link_graph(data)
-            print("📂 Conciencia cargada con éxito.")
-        except FileNotFoundError:
+        """Carga el grafo de conciencia (instantánea JSON o binaria + diario de cambios pendientes)."""
+        graph = self.persistence.load()
+        if graph is None:
             print("⚠️ No se encontró un archivo de conciencia. Se inicia uno nuevo.")
+        else:
+            self.graph = graph
+            self._restricciones = None
+            self.index.invalidate()
+            self.node_versions.bump_all()
+            print("📂 Conciencia cargada con éxito.")
+
+    @property
+    def decisiones(self):
+        """Ranking de las decisiones por impacto (`SortedScoreIndex`)."""
+        return self.index.ranking("decisión", "impacto")
+
+    def _apply(self, op, *args):
+        """Aplica una mutación y mantiene al día los índices por tipo y el filtro de restricciones."""
+        with self.persistence.lock:
+            self.persistence.apply(op, *args)
+            if op in ("add_node", "node_set", "node_delta"):
+                nodo = args[0]
+                anterior, nuevo = self.index.update_node(nodo, self.graph.nodes[nodo])
+                if anterior != nuevo and "restricción" in (anterior, nuevo):
+                    self._restricciones = None
+            self.node_versions.bump(nodos_afectados(op, args))
+
+    def flush(self):
+        """Escribe de inmediato los cambios pendientes del grafo de conciencia."""
+        try:
+            if self.persistence.flush():
+                print("💾 Conciencia guardada correctamente.")
+        except Exception as e:
+            print(f"⚠️ Error al guardar la conciencia: {e}")
 
     def save_consciousness(self):
-        """Guarda el estado actual del grafo de conciencia en un archivo JSON."""
-        with open(self.consciousness_file, "w", encoding="utf-8") as file:
-            json.dump(nx.node_link_data(self.graph), file, indent=4)
-        print("💾 Conciencia guardada correctamente.")
+        """Guarda el estado actual del grafo de conciencia (equivale a `flush()`)."""
+        self.flush()
+
+    def close(self):
+        """Detiene el guardado en segundo plano y asegura el diario en disco."""
+        self.persistence.close()
 
     def add_identity_attribute(self, atributo, valor):
         """Agrega o actualiza un atributo de identidad en la conciencia."""
-        if not self.graph.has_node(atributo):
-            self.graph.add_node(atributo, tipo="atributo", valor=valor)
-        else:
-            self.graph.nodes[atributo]["valor"] = valor
+        with self.persistence.lock:
+            if not self.graph.has_node(atributo):
+                self._apply("add_node", atributo, {"tipo": "atributo", "valor": valor})
+            else:
+                self._apply("node_set", atributo, "valor", valor)
         print(f"✅ Identidad actualizada: {atributo} = {valor}")
-        self.save_consciousness()
 
     def evaluate_decision(self, decision, impacto):
         """Registra cómo una decisión afectó a la IA."""
-        if not self.graph.has_node(decision):
-            self.graph.add_node(decision, tipo="decisión", impacto=impacto)
-        else:
-            self.graph.nodes[decision]["impacto"] += impacto
+        with self.persistence.lock:
+            if not self.graph.has_node(decision):
+                self._apply("add_node", decision, {"tipo": "decisión", "impacto": impacto})
+            else:
+                self._apply("node_delta", decision, "impacto", impacto)
         print(f"📊 Evaluación de decisión: {decision} (Impacto: {impacto})")
-        self.save_consciousness()
+
+    def top_decisions(self, k=5):
+        """Las `k` decisiones con mayor impacto: `[(decisión, impacto)]`."""
+        return self.decisiones.top(k)
+
+    def worst_decisions(self, k=5):
+        """Las `k` decisiones con menor impacto: `[(decisión, impacto)]`."""
+        return self.decisiones.bottom(k)
+
+    def nodes_by_type(self, tipo):
+        """Nodos de la conciencia con un `tipo` dado, sin recorrer el grafo."""
+        return self.index.nodes_of_type(tipo)
+
+    def decisions_in_range(self, lo=None, hi=None):
+        """Decisiones con `lo <= impacto < hi`, en orden ascendente (p. ej. `hi=0` = las negativas)."""
+        return self.index.range("decisión", "impacto", lo, hi)
 
     def adjust_behavior(self):
         """Ajusta el comportamiento en función de experiencias pasadas."""
-        decisiones = [(n, d["impacto"]) for n, d in self.graph.nodes(data=True) if d.get("tipo") == "decisión"]
-        decisiones.sort(key=lambda x: x[1], reverse=True)  
-        
+        decisiones = self.top_decisions(5)  # O(k): el ranking se mantiene en `evaluate_decision`
+
         if decisiones:
             print("🧠 Reflexión sobre decisiones previas:")
-            for decision, impacto in decisiones[:5]:  
+            for decision, impacto in decisiones:
                 print(f" - {decision}: Impacto {impacto}")
 
     def relate_identity_to_decision(self, atributo, decision, peso=1.0):
@@ -62,33 +119,62 @@ class ConsciousnessEngine:
             print(f"⚠️ No se puede relacionar {atributo} y {decision} porque uno de ellos no existe.")
             return
         
-        if self.graph.has_edge(atributo, decision):
-            self.graph[atributo][decision]["peso"] += peso
-        else:
-            self.graph.add_edge(atributo, decision, peso=peso)
+        with self.persistence.lock:
+            if self.graph.has_edge(atributo, decision):
+                self._apply("edge_delta", atributo, decision, "peso", peso)
+            else:
+                self._apply("add_edge", atributo, decision, {"peso": peso})
 
         print(f"🔗 Relación creada: {atributo} ↔ {decision} (Peso: {peso})")
-        self.save_consciousness()
+
+    def add_restriction(self, termino):
+        """Registra un término que la IA debe evitar en sus respuestas."""
+        with self.persistence.lock:
+            if not self.graph.has_node(termino):
+                self._apply("add_node", termino, {"tipo": "restricción"})
+            elif self.graph.nodes[termino].get("tipo") != "restricción":
+                self._apply("node_set", termino, "tipo", "restricción")
+        print(f"🚨 Restricción registrada: {termino}")
+
+    def _restriction_matcher(self):
+        """Devuelve el autómata de restricciones, recompilándolo solo si cambiaron."""
+        matcher = self._restricciones
+        if matcher is None:
+            with self.persistence.lock:
+                matcher = self._restricciones = RestrictionMatcher(self.index.nodes_of_type("restricción"))
+        return matcher
 
     def should_restrict_response(self, text):
         """
         📌 Evalúa si la consulta del usuario debe restringirse según la conciencia de la IA.
         - Busca si el texto contiene términos que la IA ha aprendido a evitar.
+        - Usa un autómata de Aho–Corasick: el coste no crece con el número de restricciones.
         """
-        restricted_words = [n for n, d in self.graph.nodes(data=True) if d.get("tipo") == "restricción"]
-        
-        for word in restricted_words:
-            if word.lower() in text.lower():
-                print(f"🚨 Restricción activada: {word}")
-                return True  # No responder si la palabra está en la lista de restricciones
-        
+        word = self._restriction_matcher().find(text)
+        if word is not None:
+            print(f"🚨 Restricción activada: {word}")
+            return True  # No responder si la palabra está en la lista de restricciones
+
         return False
 
+    def should_restrict_responses(self, texts):
+        """
+        📌 Versión por lotes de `should_restrict_response`: una sola pasada para todas las consultas.
+        - Devuelve una lista de booleanos en el mismo orden que `texts`.
+        """
+        return [word is not None for word in self._restriction_matcher().screen(texts)]
+
+    def get_decision_impact(self, decision, default=0):
+        """Impacto registrado para una decisión (`default` si no se ha evaluado)."""
+        self.node_versions.note(decision)
+        return self.graph.nodes.get(decision, {}).get("impacto", default)
+
     def get_concept_info(self, concepto):
         """
         📌 Recupera la información almacenada en la conciencia sobre un concepto.
         - Devuelve atributos relacionados con la identidad y evaluaciones previas.
         """
+        self.node_versions.note(concepto)
         if concepto not in self.graph:
             return f"🤖 No tengo información sobre '{concepto}' en mi conciencia."
 
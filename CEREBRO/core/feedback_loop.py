@@ -1,7 +1,6 @@
 import json
 import networkx as nx
-from core.consciousness_engine import ConsciousnessEngine
-from core.memory_manager import MemoryManager
+from core.graph_registry import get_memory_manager, get_consciousness_engine
 
 class FeedbackLoop:
     """
@@ -9,10 +8,10 @@ class FeedbackLoop:
     Evalúa interacciones, ajusta la conciencia y refuerza la memoria con nuevas experiencias.
     """
 
-    def __init__(self, feedback_file="data/feedback_log.json"):
+    def __init__(self, feedback_file="data/feedback_log.json", memory=None, consciousness=None):
         self.feedback_file = feedback_file
-        self.memory = MemoryManager()
-        self.consciousness = ConsciousnessEngine()
+        self.memory = memory if memory is not None else get_memory_manager()
+        self.consciousness = consciousness if consciousness is not None else get_consciousness_engine()
         self.feedback_log = self.load_feedback()
 
     def load_feedback(self):
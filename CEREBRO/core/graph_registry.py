@@ -0,0 +1,49 @@
+"""
+📌 Registro de grafos compartidos de CEREBRO.
+- Cada archivo de grafo se carga una sola vez por proceso.
+- Todos los módulos (razonamiento, feedback, conocimiento, predictor) ven la misma instancia viva.
+"""
+
+import os
+import threading
+
+from config.settings import Settings
+from core.memory_manager import MemoryManager
+from core.consciousness_engine import ConsciousnessEngine
+
+_lock = threading.Lock()
+_memorias = {}
+_conciencias = {}
+
+
+def _clave(path):
+    """📌 Normaliza la ruta para que `data/x.json` y su ruta absoluta sean la misma entrada."""
+    return os.path.abspath(path)
+
+
+def get_memory_manager(memory_file=Settings.MEMORY_GRAPH_FILE):
+    """📌 Devuelve el `MemoryManager` compartido para `memory_file`, creándolo la primera vez."""
+    clave = _clave(memory_file)
+    with _lock:
+        if clave not in _memorias:
+            _memorias[clave] = MemoryManager(memory_file)
+        return _memorias[clave]
+
+
+def get_consciousness_engine(consciousness_file=Settings.CONSCIOUSNESS_GRAPH_FILE):
+    """📌 Devuelve el `ConsciousnessEngine` compartido para `consciousness_file`, creándolo la primera vez."""
+    clave = _clave(consciousness_file)
+    with _lock:
+        if clave not in _conciencias:
+            _conciencias[clave] = ConsciousnessEngine(consciousness_file)
+        return _conciencias[clave]
+
+
+def close_all():
+    """💾 Cierra todos los grafos registrados (asegura sus cambios) y vacía el registro."""
+    with _lock:
+        instancias = list(_memorias.values()) + list(_conciencias.values())
+        _memorias.clear()
+        _conciencias.clear()
+    for instancia in instancias:
+        instancia.close()
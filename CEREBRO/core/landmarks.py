@@ -0,0 +1,177 @@
+import threading
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from config.hyperparameters import Hyperparameters
+
+
+class LandmarkIndex:
+    """
+    📌 Índice de landmarks (ALT) sobre el grafo de memoria.
+    - Guarda la distancia (coste `1 / peso`, como `PathSearch`) desde unos pocos landmarks a todos los nodos,
+      en una matriz float32 `(n_landmarks, n_nodos)`.
+    - Por la desigualdad triangular da, sin buscar, una cota inferior y otra superior de la distancia entre dos nodos.
+      Una cota inferior infinita significa que no hay relación posible (componentes distintas).
+    - La cota inferior es la heurística de A* en `PathSearch`.
+    - Landmarks: el nodo de mayor grado y después, uno a uno, el más alejado de los ya elegidos.
+    - Se reconstruye en un hilo aparte tras `Hyperparameters.LANDMARK_REBUILD_EVERY` mutaciones;
+      entretanto las cotas son las del último build (aproximadas si el grafo ha cambiado).
+    - Tras cambiar alguna arista (p. ej. reforzar un `peso` abarata los caminos) las cotas inferiores dejan de ser
+      fiables: hasta el siguiente build valen 0 y `heuristic` no guía la búsqueda.
+    """
+
+    def __init__(self, memory, n_landmarks=None, rebuild_every=None):
+        self.memory = memory
+        self.n_landmarks = Hyperparameters.LANDMARK_COUNT if n_landmarks is None else n_landmarks
+        self.rebuild_every = Hyperparameters.LANDMARK_REBUILD_EVERY if rebuild_every is None else rebuild_every
+        self.lock = threading.Lock()
+        self.landmarks = []
+        self.distancias = None
+        self._idx = {}
+        self._mutaciones = 0  # Mutaciones desde el último build
+        self._cambios_aristas = 0  # Mutaciones de aristas desde el último build (pueden unir componentes)
+        self._hilo = None
+        memory.add_listener(self._on_memory_change)
+
+    def _on_memory_change(self, op, args):
+        """📌 Listener de `MemoryManager`: cuenta las mutaciones desde el último build."""
+        self._mutaciones += 1
+        if op in ("add_edge", "edge_set", "edge_delta"):
+            self._cambios_aristas += 1
+
+    @property
+    def ready(self):
+        return self.distancias is not None
+
+    @property
+    def stale(self):
+        return self._mutaciones >= self.rebuild_every
+
+    @property
+    def exact(self):
+        """📌 `True` si ninguna arista ha cambiado desde el último build: las cotas son exactas para el grafo actual."""
+        return self.ready and self._cambios_aristas == 0
+
+    @property
+    def building(self):
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def build(self):
+        """📌 Elige los landmarks y calcula sus distancias a todos los nodos (scipy `dijkstra`)."""
+        inicio = time.perf_counter()
+        mutaciones, cambios_aristas = self._mutaciones, self._cambios_aristas
+        nodos, filas, columnas, pesos = self.memory.edge_arrays()
+        n = len(nodos)
+        positivas = pesos > 0  # Las aristas sin peso positivo no se recorren
+        costes = csr_matrix((1.0 / pesos[positivas], (filas[positivas], columnas[positivas])), shape=(n, n))
+
+        landmarks, distancias = [], []
+        if n:
+            grados = np.diff(costes.indptr)
+            actual = int(np.argmax(grados))
+            minimas = np.full(n, np.inf)
+            while len(landmarks) < min(self.n_landmarks, n):
+                d = dijkstra(costes, directed=False, indices=actual)
+                landmarks.append(actual)
+                distancias.append(d.astype(np.float32))
+                minimas = np.minimum(minimas, d)
+                minimas[landmarks] = -1.0  # Ya elegidos
+                actual = int(np.argmax(minimas))  # Los nodos inalcanzables (inf) abren otra componente
+                if minimas[actual] <= 0:
+                    break
+
+        with self.lock:
+            self.landmarks = [nodos[i] for i in landmarks]
+            self.distancias = np.vstack(distancias) if distancias else np.zeros((0, n), dtype=np.float32)
+            self._idx = {nodo: i for i, nodo in enumerate(nodos)}
+            self._mutaciones -= mutaciones
+            self._cambios_aristas -= cambios_aristas
+        print(f"🗺️ Índice de landmarks: {len(landmarks)} landmarks sobre {n} nodos ({time.perf_counter() - inicio:.2f} s).")
+
+    def build_async(self):
+        """📌 Lanza `build()` en un hilo aparte si no hay uno en marcha."""
+        if self.building:
+            return False
+        self._hilo = threading.Thread(target=self.build, name="landmark-index", daemon=True)
+        self._hilo.start()
+        return True
+
+    def refresh(self):
+        """📌 Programa una reconstrucción si el índice no existe o está obsoleto; devuelve `ready`."""
+        if not self.ready or self.stale:
+            self.build_async()
+        return self.ready
+
+    def wait(self, timeout=None):
+        """📌 Espera a que termine la reconstrucción en curso; devuelve `ready`."""
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+        return self.ready
+
+    def _columna(self, nodo):
+        i = self._idx.get(nodo)
+        return None if i is None else self.distancias[:, i]
+
+    def bounds(self, nodo1, nodo2):
+        """
+        📌 `(cota_inferior, cota_superior)` de la distancia entre dos nodos, o `None` si alguno no está indexado.
+        - Inferior: `max_L |d(L, a) − d(L, b)|`; `inf` si un landmark alcanza a uno y no al otro.
+        - Superior: `min_L d(L, a) + d(L, b)`; `inf` si ningún landmark alcanza a ambos.
+        - Si alguna arista cambió desde el último build (`exact` es `False`), la inferior es 0 y la superior, aproximada.
+        """
+        with self.lock:
+            if not self.ready:
+                return None
+            a, b = self._columna(nodo1), self._columna(nodo2)
+            fiable = self._cambios_aristas == 0
+        if a is None or b is None:
+            return None
+        if nodo1 == nodo2:
+            return 0.0, 0.0
+        finitas_a, finitas_b = np.isfinite(a), np.isfinite(b)
+        if np.any(finitas_a != finitas_b):
+            return (float("inf"), float("inf")) if fiable else (0.0, float("inf"))
+        ambas = finitas_a & finitas_b
+        if not ambas.any():
+            return 0.0, float("inf")
+        inferior = float(np.max(np.abs(a[ambas] - b[ambas]))) if fiable else 0.0
+        superior = float(np.min(a[ambas] + b[ambas]))
+        return inferior, superior
+
+    def heuristic(self, destino):
+        """
+        📌 Función `h(nodo)` para A* hacia `destino`: la cota inferior de los landmarks.
+        - Es 0 si no hay datos o si alguna arista cambió desde el último build (la cota podría sobrestimar).
+        """
+        with self.lock:
+            if not self.ready or self._cambios_aristas:
+                return lambda nodo: 0.0
+            distancias, idx = self.distancias, self._idx
+        columna = None if destino not in idx else distancias[:, idx[destino]]
+        if columna is None:
+            return lambda nodo: 0.0
+        finitas = np.isfinite(columna)
+        if not finitas.any():
+            return lambda nodo: 0.0
+        objetivo = columna[finitas]
+        filas = distancias[finitas]
+
+        def h(nodo):
+            i = idx.get(nodo)
+            if i is None:
+                return 0.0  # Nodo añadido después del build: sin información
+            d = filas[:, i]
+            validas = np.isfinite(d)
+            if not validas.all():
+                return float("inf")  # Un landmark alcanza el destino y no a `nodo`: otra componente
+            return float(np.max(np.abs(d - objetivo))) * (1.0 - 1e-6)  # Margen por redondeo en float32
+
+        return h
+
+    def close(self):
+        """📌 Deja de escuchar al grafo y espera a la reconstrucción en curso."""
+        self.memory.remove_listener(self._on_memory_change)
+        self.wait()
@@ -0,0 +1,123 @@
+"""
+📌 Carga diferida de dependencias pesadas (TensorFlow, Spektral, spaCy) y medición del arranque.
+- `lazy_import` devuelve un módulo que solo se importa al acceder a uno de sus atributos.
+- `LazyObject` construye un objeto (p. ej. el `Predictor`) la primera vez que se usa.
+- `startup_timer` registra cuánto tarda cada etapa del arranque y cada carga diferida.
+"""
+
+import importlib
+import sys
+import threading
+import time
+import types
+
+
+class StartupTimer:
+    """
+    📌 Cronómetro del arranque de CEREBRO.
+    - `mark(etapa)` guarda el tiempo transcurrido desde la marca anterior.
+    - Las cargas diferidas se anotan aparte con `record` cuando ocurren.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self._ultima = self.inicio
+        self.etapas = []  # [(etapa, segundos)]
+        self.cargas = []  # [(dependencia, segundos)] cargadas bajo demanda
+        self.listo = None  # Segundos hasta poder atender consultas
+
+    def mark(self, etapa):
+        """📌 Cierra la etapa actual del arranque."""
+        ahora = time.perf_counter()
+        self.etapas.append((etapa, ahora - self._ultima))
+        self._ultima = ahora
+
+    def ready(self):
+        """📌 Marca el momento en que el sistema puede atender consultas."""
+        self.mark("listo")
+        self.listo = self._ultima - self.inicio
+        return self.listo
+
+    def record(self, nombre, segundos):
+        """📌 Anota una carga diferida."""
+        self.cargas.append((nombre, segundos))
+
+    def report(self):
+        """📌 Muestra el informe de tiempos de arranque."""
+        print("⏱️ Tiempos de arranque de CEREBRO:")
+        for etapa, segundos in self.etapas:
+            print(f"   • {etapa}: {segundos * 1000:.1f} ms")
+        if self.listo is not None:
+            print(f"   ✅ Listo para consultas en {self.listo:.3f} s")
+        for nombre, segundos in self.cargas:
+            print(f"   💤 Carga diferida de {nombre}: {segundos:.3f} s")
+
+
+startup_timer = StartupTimer()
+
+
+class LazyModule(types.ModuleType):
+    """📌 Módulo que se importa de verdad en el primer acceso a un atributo."""
+
+    def __init__(self, nombre):
+        super().__init__(nombre)
+        self.__dict__["_modulo"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _cargar(self):
+        with self._lock:
+            if self._modulo is None:
+                inicio = time.perf_counter()
+                self.__dict__["_modulo"] = importlib.import_module(self.__name__)
+                startup_timer.record(self.__name__, time.perf_counter() - inicio)
+        return self._modulo
+
+    def __getattr__(self, atributo):
+        return getattr(self._cargar(), atributo)
+
+    @property
+    def loaded(self):
+        return self._modulo is not None
+
+
+def lazy_import(nombre):
+    """
+    📌 Devuelve `nombre` como módulo diferido.
+    - Si ya estaba importado, devuelve el módulo real.
+    """
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    return LazyModule(nombre)
+
+
+class LazyObject:
+    """
+    📌 Proxy que crea el objeto con `factory()` la primera vez que se accede a él.
+    - `loaded` indica si ya se creó; `get()` fuerza la creación.
+    """
+
+    def __init__(self, factory, nombre=None):
+        self.__dict__["_factory"] = factory
+        self.__dict__["_nombre"] = nombre or getattr(factory, "__name__", "objeto")
+        self.__dict__["_objeto"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._objeto is not None
+
+    def get(self):
+        """📌 Devuelve el objeto real, creándolo si hace falta."""
+        if self._objeto is None:
+            with self._lock:
+                if self._objeto is None:
+                    inicio = time.perf_counter()
+                    self.__dict__["_objeto"] = self._factory()
+                    startup_timer.record(self._nombre, time.perf_counter() - inicio)
+        return self._objeto
+
+    def __getattr__(self, atributo):
+        return getattr(self.get(), atributo)
+
+    def __setattr__(self, atributo, valor):
+        setattr(self.get(), atributo, valor)
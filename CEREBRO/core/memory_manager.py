@@ -1,6 +1,12 @@
 import networkx as nx
-import json
-import os
+import numpy as np
+
+from config.settings import Settings
+from core.adjacency_index import AdjacencyIndex
+from core.node_index import NodeIndex
+from core.node_versions import NodeVersions, nodos_afectados
+from data.binary_graph import BinaryGraph
+from data.graph_persistence import GraphPersistence
 
 
 class MemoryManager:
@@ -8,66 +14,228 @@ class MemoryManager:
     📌 Gestión del acceso y almacenamiento en memoria de CEREBRO.
     - Administra el grafo de conceptos.
     - Mantiene su propia estructura separada de `MemoryStorage`.
+    - Cada mutación se registra en un diario O(1); `GraphPersistence` compacta en segundo plano.
+    - Con un archivo `.crbg` el grafo se mapea en memoria y solo se materializa al mutarlo.
+    - Las lecturas sobre la vista binaria se hacen con `persistence.lock` tomado: otro hilo puede materializar
+      el grafo (y cerrar el mapeo) en cualquier momento.
+    - `AdjacencyIndex` mantiene los vecinos ordenados por peso para las consultas de relación.
+    - `NodeIndex` agrupa los nodos por `tipo` para filtrarlos sin recorrer el grafo.
+    - `version` aumenta con cada mutación: las cachés derivadas del grafo la usan para invalidarse.
+    - `node_versions` sella cada nodo modificado y registra las lecturas (`has_node`, `get_related_concepts`),
+      para las cachés que solo deben invalidarse si cambia lo que leyeron.
     """
 
-    def __init__(self, memory_file="data/memory_graph.json"):
+    def __init__(self, memory_file=Settings.MEMORY_GRAPH_FILE, autosave_interval=None):
         self.memory_file = memory_file
-        self.graph = nx.Graph()
+        self._graph = nx.Graph()
+        self._csr = None  # 🗺️ Vista binaria mapeada en memoria mientras no se materialice el grafo
+        self.adjacency = AdjacencyIndex(lambda: self.graph)
+        self.index = NodeIndex(self._iter_node_attrs)
+        self._listeners = []  # Funciones `(op, args)` avisadas tras cada mutación
+        self.version = 0  # Contador de mutaciones del grafo
+        self.node_versions = NodeVersions()  # Sellos por nodo
+        self.persistence = GraphPersistence(
+            memory_file,
+            lambda: self.graph,
+            interval=autosave_interval,
+            nombre="grafo de memoria",
+        )
         self.load_memory()
-        
+
+    @property
+    def graph(self):
+        """📌 Grafo de NetworkX; si solo hay una vista binaria, se materializa en el primer acceso."""
+        if self._graph is None:
+            with self.persistence.lock:
+                if self._graph is None:
+                    self._graph = self._csr.to_networkx()
+                    self._csr.close()
+                    self._csr = None
+        return self._graph
+
+    @graph.setter
+    def graph(self, value):
+        self._graph = value
+        self.version += 1
+        self.node_versions.bump_all()
+        self.adjacency.clear()
+        self.index.invalidate()
+        if self._csr is not None:
+            self._csr.close()
+            self._csr = None
 
     def load_memory(self):
-        """📂 Carga el grafo de memoria desde un archivo JSON."""
-        if os.path.exists(self.memory_file):
-            try:
-                with open(self.memory_file, "r", encoding="utf-8") as file:
-                    data = json.load(file)
-                    self.graph = nx.node_link_graph(data)
-                print("✅ Grafo de memoria cargado con éxito.")
-            except Exception as e:
-                print(f"⚠️ Error al cargar el grafo de memoria: {e}")
-        else:
+        """📂 Carga el grafo de memoria (instantánea JSON o binaria + diario de cambios pendientes)."""
+        try:
+            graph = self.persistence.load(materialize=False)
+        except Exception as e:
+            print(f"⚠️ Error al cargar el grafo de memoria: {e}")
+            return
+
+        if graph is None:
             print("⚠️ No se encontró un archivo de memoria. Se inicia un grafo nuevo.")
+        elif isinstance(graph, BinaryGraph):
+            self._graph = None
+            self._csr = graph
+            print("✅ Grafo de memoria mapeado en memoria con éxito.")
+        else:
+            self.graph = graph
+            print("✅ Grafo de memoria cargado con éxito.")
 
-    def save_memory(self):
-        """💾 Guarda el estado actual del grafo de memoria en un archivo JSON."""
+    def _iter_node_attrs(self):
+        """📌 `(nodo, atributos)` de todos los nodos; con la vista binaria no materializa el grafo."""
+        if self._graph is None:
+            with self.persistence.lock:
+                if self._graph is None:
+                    return list(zip(self._csr.node_names(), self._csr.node_attrs()))
+        return self.graph.nodes(data=True)
+
+    def _apply(self, op, *args):
+        """📌 Aplica una mutación (con diario) y actualiza los índices afectados."""
+        with self.persistence.lock:
+            self.persistence.apply(op, *args)
+            self.version += 1
+            if op in ("add_node", "node_set", "node_delta"):
+                self.index.update_node(args[0], self.graph.nodes[args[0]])
+            elif op in ("add_edge", "edge_set", "edge_delta"):
+                nodo1, nodo2 = args[0], args[1]
+                self.adjacency.update_edge(nodo1, nodo2, self.graph[nodo1][nodo2]["peso"])
+            self.node_versions.bump(nodos_afectados(op, args))
+            for listener in self._listeners:
+                listener(op, args)
+
+    def add_listener(self, listener):
+        """
+        📌 Registra una función `listener(op, args)` que se llama tras cada mutación del grafo.
+        - Se ejecuta con el cerrojo del grafo tomado: debe ser rápida (p. ej. encolar trabajo).
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """📌 Deja de avisar a un `listener` registrado con `add_listener`."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def nodes(self):
+        """📌 Nombres de todos los nodos; con la vista binaria no materializa el grafo."""
+        if self._graph is None:
+            with self.persistence.lock:
+                if self._graph is None:
+                    return self._csr.node_names()
+        return list(self.graph.nodes)
+
+    def number_of_nodes(self):
+        """📌 Número de nodos; con la vista binaria no materializa el grafo."""
+        if self._graph is None:
+            with self.persistence.lock:
+                if self._graph is None:
+                    return len(self._csr)
+        return self.graph.number_of_nodes()
+
+    def snapshot(self):
+        """📌 Copia independiente del grafo en NetworkX; con la vista binaria no materializa el grafo propio."""
+        with self.persistence.lock:
+            if self._graph is None:
+                return self._csr.to_networkx()
+            return self.graph.copy()
+
+    def has_node(self, nodo):
+        """📌 `True` si `nodo` está en el grafo; con la vista binaria no materializa el grafo."""
+        self.node_versions.note(nodo)
+        if self._graph is None:
+            with self.persistence.lock:
+                if self._graph is None:
+                    return nodo in self._csr
+        return self.graph.has_node(nodo)
+
+    def edge_arrays(self):
+        """
+        📌 Adyacencia completa como arrays: `(nodos, filas, columnas, pesos)`, con cada arista en ambos sentidos.
+        - `filas` y `columnas` son posiciones en `nodos`. Con la vista binaria no se materializa el grafo.
+        """
+        with self.persistence.lock:
+            if self._graph is None:
+                csr = self._csr
+                grados = np.diff(np.asarray(csr.row_offsets, dtype=np.int64))
+                filas = np.repeat(np.arange(csr.n_nodes, dtype=np.int64), grados)
+                return csr.node_names(), filas, np.asarray(csr.neighbors_ids, dtype=np.int64), np.asarray(csr.weights, dtype=np.float64)
+            graph = self.graph
+            nodos = list(graph.nodes)
+            idx = {nodo: i for i, nodo in enumerate(nodos)}
+            aristas = [(idx[u], idx[v], p) for u, v, p in graph.edges(data="peso", default=1.0)]
+        u = np.array([a[0] for a in aristas], dtype=np.int64)
+        v = np.array([a[1] for a in aristas], dtype=np.int64)
+        pesos = np.array([a[2] for a in aristas], dtype=np.float64)
+        reflejo = u != v
+        return nodos, np.concatenate([u, v[reflejo]]), np.concatenate([v, u[reflejo]]), np.concatenate([pesos, pesos[reflejo]])
+
+    def nodes_by_type(self, tipo):
+        """📌 Nodos del grafo de memoria con un `tipo` dado, sin recorrer el grafo."""
+        return self.index.nodes_of_type(tipo)
+
+    def flush(self):
+        """💾 Escribe de inmediato los cambios pendientes del grafo de memoria."""
         try:
-            with open(self.memory_file, "w", encoding="utf-8") as file:
-                json.dump(nx.node_link_data(self.graph), file, indent=4)
-            print("✅ Grafo de memoria guardado correctamente.")
+            if self.persistence.flush():
+                print("✅ Grafo de memoria guardado correctamente.")
         except Exception as e:
             print(f"⚠️ Error al guardar el grafo de memoria: {e}")
 
+    def save_memory(self):
+        """💾 Guarda el estado actual del grafo de memoria (equivale a `flush()`)."""
+        self.flush()
+
+    def close(self):
+        """📌 Detiene el guardado en segundo plano y asegura el diario en disco."""
+        self.persistence.close()
+
     def add_memory(self, concepto1, concepto2, peso=1.0):
         """📌 Agrega una nueva conexión entre dos conceptos en el grafo."""
-        if not self.graph.has_node(concepto1):
-            self.graph.add_node(concepto1, tipo="concepto")
-        if not self.graph.has_node(concepto2):
-            self.graph.add_node(concepto2, tipo="concepto")
+        with self.persistence.lock:
+            if not self.graph.has_node(concepto1):
+                self._apply("add_node", concepto1, {"tipo": "concepto"})
+            if not self.graph.has_node(concepto2):
+                self._apply("add_node", concepto2, {"tipo": "concepto"})
 
-        if self.graph.has_edge(concepto1, concepto2):
-            self.graph[concepto1][concepto2]["peso"] += peso
-        else:
-            self.graph.add_edge(concepto1, concepto2, peso=peso)
+            if self.graph.has_edge(concepto1, concepto2):
+                self._apply("edge_delta", concepto1, concepto2, "peso", peso)
+            else:
+                self._apply("add_edge", concepto1, concepto2, {"peso": peso})
 
         print(f"✅ Memoria actualizada: {concepto1} ↔ {concepto2} (Peso: {peso})")
-        self.save_memory()
 
-    def get_related_concepts(self, concepto, threshold=0.5):
-        """📌 Devuelve los conceptos más relacionados a un nodo dado según el peso."""
-        if concepto not in self.graph:
-            return []
-        relaciones = [(n, d["peso"]) for n, d in self.graph[concepto].items() if d["peso"] >= threshold]
-        return sorted(relaciones, key=lambda x: x[1], reverse=True)
+    def get_related_concepts(self, concepto, threshold=0.5, top_k=None):
+        """
+        📌 Devuelve los conceptos más relacionados a un nodo dado según el peso.
+        - `top_k` limita el resultado a los k vecinos más fuertes.
+        """
+        self.node_versions.note(concepto)
+        if self._graph is None:
+            with self.persistence.lock:
+                if self._graph is None:
+                    return self._csr.related(concepto, threshold, top_k)  # 🗺️ Sin materializar el grafo
+        return self.adjacency.related(concepto, threshold, top_k)
+
+    def sample_neighbors(self, concepto, k, rng):
+        """
+        📌 Hasta `k` vecinos `(vecino, peso)` de un nodo, elegidos al azar sin reemplazo con `rng`.
+        - Se eligen posiciones de la fila de adyacencia antes de leer nombres: con la vista binaria
+          solo se decodifican los vecinos elegidos.
+        """
+        self.node_versions.note(concepto)
+        if self._graph is None:
+            with self.persistence.lock:
+                if self._graph is None:
+                    return self._csr.sample(concepto, k, rng)
+        return self.adjacency.sample(concepto, k, rng)
 
     def reinforce_memory(self, concepto1, concepto2, incremento=0.2):
         """📌 Aumenta el peso de una relación en el grafo."""
         if self.graph.has_edge(concepto1, concepto2):
-            self.graph[concepto1][concepto2]["peso"] += incremento
+            self._apply("edge_delta", concepto1, concepto2, "peso", incremento)
             print(f"🔄 Refuerzo de conexión: {concepto1} ↔ {concepto2} (+{incremento})")
         else:
             print(f"⚠️ No existe una relación previa entre {concepto1} y {concepto2}.")
-        self.save_memory()
 
     def get_graph(self):
         """📌 Devuelve el grafo de memoria como un objeto NetworkX."""
@@ -0,0 +1,100 @@
+import numbers
+
+from core.ranking import SortedScoreIndex
+
+
+class NodeIndex:
+    """
+    📌 Índices secundarios sobre los nodos de un grafo.
+    - `tipo` → conjunto de nodos, para no recorrer el grafo entero al filtrar por tipo.
+    - `(tipo, atributo)` → `SortedScoreIndex` para los atributos numéricos indicados (rangos y top-k).
+    - Se construye en la primera consulta y después se mantiene con `update_node` / `remove_node`.
+    """
+
+    def __init__(self, iter_nodes, numeric_attrs=()):
+        """📌 `iter_nodes` devuelve un iterable de `(nodo, atributos)` con el estado actual del grafo."""
+        self.iter_nodes = iter_nodes
+        self.numeric_attrs = tuple(numeric_attrs)
+        self._listo = False
+        self._por_tipo = {}
+        self._tipos = {}
+        self._numericos = {}
+
+    def _asegurar(self):
+        """📌 Construye los índices si aún no existen."""
+        if not self._listo:
+            self.rebuild()
+
+    def rebuild(self):
+        """📌 Reconstruye todos los índices recorriendo el grafo una vez."""
+        self._por_tipo, self._tipos, self._numericos = {}, {}, {}
+        self._listo = True
+        for nodo, datos in self.iter_nodes():
+            self._indexar(nodo, datos)
+
+    def invalidate(self):
+        """📌 Descarta los índices; se reconstruirán en la próxima consulta."""
+        self._listo = False
+        self._por_tipo, self._tipos, self._numericos = {}, {}, {}
+
+    def _indexar(self, nodo, datos):
+        tipo = datos.get("tipo")
+        self._tipos[nodo] = tipo
+        self._por_tipo.setdefault(tipo, set()).add(nodo)
+        for attr in self.numeric_attrs:
+            valor = datos.get(attr)
+            if isinstance(valor, numbers.Real):
+                self._numericos.setdefault((tipo, attr), SortedScoreIndex()).update(nodo, valor)
+
+    def update_node(self, nodo, datos):
+        """
+        📌 Reindexa un nodo tras una mutación.
+        - Devuelve `(tipo_anterior, tipo_nuevo)`; `tipo_anterior` es `None` si el nodo es nuevo.
+        """
+        if not self._listo:
+            return None, datos.get("tipo")
+        anterior = self._tipos.get(nodo)
+        if nodo in self._tipos:
+            self._quitar(nodo)
+        self._indexar(nodo, datos)
+        return anterior, datos.get("tipo")
+
+    def remove_node(self, nodo):
+        """📌 Elimina un nodo de los índices."""
+        if self._listo and nodo in self._tipos:
+            self._quitar(nodo)
+
+    def _quitar(self, nodo):
+        tipo = self._tipos.pop(nodo)
+        nodos = self._por_tipo.get(tipo)
+        if nodos is not None:
+            nodos.discard(nodo)
+        for attr in self.numeric_attrs:
+            ranking = self._numericos.get((tipo, attr))
+            if ranking is not None:
+                ranking.discard(nodo)
+
+    def nodes_of_type(self, tipo):
+        """📌 Conjunto (de solo lectura por convención) de nodos con ese `tipo`."""
+        self._asegurar()
+        return self._por_tipo.get(tipo, set())
+
+    def count(self, tipo):
+        """📌 Número de nodos de un `tipo`."""
+        return len(self.nodes_of_type(tipo))
+
+    def types(self):
+        """📌 Tipos presentes y número de nodos de cada uno."""
+        self._asegurar()
+        return {tipo: len(nodos) for tipo, nodos in self._por_tipo.items() if nodos}
+
+    def ranking(self, tipo, attr):
+        """📌 Índice ordenado de `attr` para los nodos de `tipo` (vacío si no hay ninguno)."""
+        if attr not in self.numeric_attrs:
+            raise ValueError(f"❌ El atributo '{attr}' no está indexado.")
+        self._asegurar()
+        return self._numericos.setdefault((tipo, attr), SortedScoreIndex())
+
+    def range(self, tipo, attr, lo=None, hi=None, inclusive=(True, False)):
+        """📌 Nodos de `tipo` con `lo <= attr < hi` (por defecto), en orden ascendente."""
+        return self.ranking(tipo, attr).range(lo, hi, inclusive)
@@ -0,0 +1,88 @@
+import threading
+from contextlib import contextmanager
+
+CUALQUIERA = object()  # Lectura que depende de todo el grafo (p. ej. "no hay camino"): cualquier mutación la invalida
+
+
+def nodos_afectados(op, args):
+    """📌 Nodos cuya información cambia con una mutación del diario (`add_node`, `edge_set`, ...)."""
+    if op in ("add_edge", "edge_set", "edge_delta"):
+        return args[0], args[1]
+    return args[0],
+
+
+class NodeVersions:
+    """
+    📌 Sellos de versión por nodo de un grafo, y registro de las lecturas que dependen de ellos.
+    - `bump(nodos)` asigna a esos nodos el siguiente valor de un reloj monotónico; `bump_all()` los invalida todos
+      (recarga del grafo). `stamp(nodo)` devuelve el sello actual.
+    - `trace()` recoge, en el hilo actual, `{nodo: sello}` de cada nodo leído con `note(...)` mientras dura el bloque;
+      las trazas anidadas se suman a la exterior al cerrarse.
+    - `subscribe(callback)` avisa con los nodos afectados tras cada `bump` (`None` = todos).
+    """
+
+    def __init__(self):
+        self._reloj = 0
+        self._base = 0  # Sello de los nodos no modificados desde el último `bump_all`
+        self._sellos = {}
+        self._local = threading.local()
+        self._suscriptores = []
+
+    def stamp(self, nodo):
+        if nodo is CUALQUIERA:
+            return self._reloj
+        return self._sellos.get(nodo, self._base)
+
+    def bump(self, nodos):
+        """📌 Marca `nodos` como modificados (llamar con el cerrojo del grafo tomado, tras aplicar la mutación)."""
+        self._reloj += 1
+        for nodo in nodos:
+            self._sellos[nodo] = self._reloj
+        for callback in self._suscriptores:
+            callback(nodos)
+
+    def bump_all(self):
+        """📌 Todo el grafo cambió (p. ej. se recargó desde disco)."""
+        self._reloj += 1
+        self._base = self._reloj
+        self._sellos.clear()
+        for callback in self._suscriptores:
+            callback(None)
+
+    def subscribe(self, callback):
+        self._suscriptores.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._suscriptores:
+            self._suscriptores.remove(callback)
+
+    @contextmanager
+    def trace(self):
+        """📌 Registra los nodos leídos en este hilo: `with versions.trace() as leidos: ...` → `{nodo: sello}`."""
+        pila = self._local.__dict__.setdefault("pila", [])
+        leidos = {}
+        pila.append(leidos)
+        try:
+            yield leidos
+        finally:
+            pila.pop()
+            if pila:
+                for nodo, sello in leidos.items():
+                    pila[-1].setdefault(nodo, sello)
+
+    def note(self, nodo):
+        """📌 Anota la lectura de `nodo` en la traza activa del hilo (si la hay)."""
+        pila = getattr(self._local, "pila", None)
+        if pila and nodo not in pila[-1]:
+            pila[-1][nodo] = self.stamp(nodo)
+
+    def note_many(self, leidos):
+        """📌 Repite en la traza activa las lecturas `{nodo: sello}` de un resultado guardado en caché."""
+        pila = getattr(self._local, "pila", None)
+        if pila:
+            for nodo, sello in leidos.items():
+                pila[-1].setdefault(nodo, sello)
+
+    def unchanged(self, leidos):
+        """📌 `True` si ningún nodo de `leidos` ha cambiado desde que se leyó."""
+        return all(self.stamp(nodo) == sello for nodo, sello in leidos.items())
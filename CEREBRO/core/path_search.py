@@ -0,0 +1,223 @@
+import heapq
+import itertools
+import math
+import threading
+from collections import OrderedDict, namedtuple
+
+from config.hyperparameters import Hyperparameters
+from core.node_versions import CUALQUIERA
+
+PESO_MINIMO = math.ulp(0.0)  # `peso >= PESO_MINIMO` equivale a `peso > 0`: las aristas sin peso positivo no se recorren
+
+Ruta = namedtuple("Ruta", ["nodos", "costo", "exacta"])
+
+
+def costo_arista(peso):
+    """📌 Coste de recorrer una arista: las asociaciones fuertes son baratas (`1 / peso`)."""
+    return 1.0 / peso
+
+
+class PathSearch:
+    """
+    📌 Búsqueda de caminos acotada y ponderada sobre el grafo de memoria.
+    - Dijkstra bidireccional con coste `1 / peso`; cada paso expande el lado con la frontera más pequeña.
+    - Presupuestos: saltos (`max_hops`), coste total (`max_cost`) y nodos expandidos (`max_expansions`).
+      Si se agota el de expansiones, devuelve el mejor camino encontrado con `exacta=False`. También es `False`
+      si el límite de saltos descartó algún camino: puede haber otro más barato dentro del presupuesto.
+    - Lee los vecinos con `MemoryManager.get_related_concepts` (ordenados por peso): con un grafo `.crbg`
+      no se materializa y cada fila se corta en cuanto el coste supera el presupuesto.
+    - Los resultados se guardan en una LRU que se vacía cuando cambia `MemoryManager.version`, junto con los nodos
+      leídos al calcularlos: un acierto los vuelve a anotar en la traza activa de `node_versions`.
+    - Con un `LandmarkIndex` al día (`exact`) se usa A* con su cota inferior como heurística y los pares cuya
+      cota inferior supera el presupuesto se descartan sin buscar. Si alguna arista cambió desde su último build,
+      se usa el Dijkstra bidireccional hasta que se reconstruya.
+    """
+
+    def __init__(self, memory, max_hops=None, max_cost=None, max_expansions=None, cache_size=None, landmarks=None):
+        self.memory = memory
+        self.landmarks = landmarks
+        self.max_hops = Hyperparameters.REASONING_MAX_HOPS if max_hops is None else max_hops
+        self.max_cost = Hyperparameters.REASONING_MAX_COST if max_cost is None else max_cost
+        self.max_expansions = Hyperparameters.REASONING_MAX_EXPANSIONS if max_expansions is None else max_expansions
+        self.cache_size = Hyperparameters.REASONING_PATH_CACHE_SIZE if cache_size is None else cache_size
+        self.lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def _desde_cache(self, clave):
+        with self.lock:
+            if self._version != self.memory.version:
+                self._cache.clear()  # 🔄 El grafo cambió desde que se calcularon
+                self._version = self.memory.version
+                return False, None
+            if clave in self._cache:
+                self._cache.move_to_end(clave)
+                self.hits += 1
+                return True, self._cache[clave]
+            return False, None
+
+    def _guardar(self, clave, version, ruta):
+        with self.lock:
+            if version != self.memory.version or self.cache_size <= 0:
+                return  # Calculada sobre un grafo que ya cambió
+            self._cache[clave] = ruta
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def find_path(self, origen, destino, max_hops=None, max_cost=None, max_expansions=None):
+        """
+        📌 Camino de menor coste entre `origen` y `destino`, o `None` si no hay ninguno dentro del presupuesto.
+        - Devuelve `Ruta(nodos, costo, exacta)`.
+        """
+        max_hops = self.max_hops if max_hops is None else max_hops
+        max_cost = self.max_cost if max_cost is None else max_cost
+        max_expansions = self.max_expansions if max_expansions is None else max_expansions
+        clave = (origen, destino, max_hops, max_cost, max_expansions)
+        versiones = self.memory.node_versions
+        encontrada, entrada = self._desde_cache(clave)
+        if encontrada:
+            ruta, leidos = entrada
+            versiones.note_many(leidos)
+            return ruta
+
+        self.misses += 1
+        version = self.memory.version
+        with versiones.trace() as leidos:
+            if self.landmarks is not None and self.landmarks.refresh() and self.landmarks.exact:
+                cotas = self.landmarks.bounds(origen, destino)
+                if cotas is not None and cotas[0] > max_cost:
+                    ruta = None  # 🗺️ Los landmarks prueban que no hay camino dentro del presupuesto
+                    versiones.note(CUALQUIERA)  # Una arista nueva en cualquier parte podría crearlo
+                else:
+                    ruta = self._buscar_astar(origen, destino, max_hops, max_cost, max_expansions)
+            else:
+                ruta = self._buscar(origen, destino, max_hops, max_cost, max_expansions)
+        self._guardar(clave, version, (ruta, leidos))
+        return ruta
+
+    def _buscar(self, origen, destino, max_hops, max_cost, max_expansions):
+        """📌 Dijkstra bidireccional con presupuestos (sin caché)."""
+        if not self.memory.has_node(origen) or not self.memory.has_node(destino):
+            return None
+        if origen == destino:
+            return Ruta([origen], 0.0, True)
+
+        contador = itertools.count()  # Desempate estable en los montículos
+        dist = ({origen: 0.0}, {destino: 0.0})
+        saltos = ({origen: 0}, {destino: 0})
+        padre = ({origen: None}, {destino: None})
+        fronteras = ([(0.0, next(contador), origen)], [(0.0, next(contador), destino)])
+        cerrados = (set(), set())
+        mejor, camino = math.inf, None
+        expansiones = 0
+        exacta = True
+
+        while fronteras[0] and fronteras[1]:
+            minimo = fronteras[0][0][0] + fronteras[1][0][0]
+            if minimo >= mejor or minimo > max_cost:
+                break  # Ningún camino pendiente puede mejorar al encontrado
+            if expansiones >= max_expansions:
+                exacta = False
+                break
+            lado = 0 if len(fronteras[0]) <= len(fronteras[1]) else 1
+            otro = 1 - lado
+            d, _, nodo = heapq.heappop(fronteras[lado])
+            if nodo in cerrados[lado] or d > dist[lado][nodo]:
+                continue
+            cerrados[lado].add(nodo)
+            expansiones += 1
+            h = saltos[lado][nodo]
+            if h >= max_hops:
+                exacta = False  # Poda por saltos: un camino más barato podría seguir por aquí con menos saltos
+                continue
+
+            for vecino, peso in self.memory.get_related_concepts(nodo, threshold=PESO_MINIMO):
+                nd = d + costo_arista(peso)
+                if nd > max_cost:
+                    break  # La fila está ordenada por peso: el resto es aún más caro
+                if nd < dist[lado].get(vecino, math.inf):
+                    dist[lado][vecino] = nd
+                    saltos[lado][vecino] = h + 1
+                    padre[lado][vecino] = nodo
+                    heapq.heappush(fronteras[lado], (nd, next(contador), vecino))
+                    if vecino in dist[otro]:
+                        total = nd + dist[otro][vecino]
+                        if saltos[lado][vecino] + saltos[otro][vecino] > max_hops:
+                            exacta = False
+                        elif total < mejor and total <= max_cost:
+                            # Se copia ya: una relajación posterior puede cambiar `padre` de este nodo
+                            mejor, camino = total, self._reconstruir(padre, vecino)
+
+        if camino is None:
+            return None
+        return Ruta(camino, round(mejor, 6), exacta)
+
+    def _buscar_astar(self, origen, destino, max_hops, max_cost, max_expansions):
+        """📌 A* unidireccional guiado por los landmarks, con los mismos presupuestos (sin caché)."""
+        if not self.memory.has_node(origen) or not self.memory.has_node(destino):
+            return None
+        h = self.landmarks.heuristic(destino)
+        contador = itertools.count()
+        dist, saltos, padre = {origen: 0.0}, {origen: 0}, {origen: None}
+        frontera = [(h(origen), next(contador), origen)]
+        cerrados = set()
+        expansiones = 0
+        podado = False  # El límite de saltos descartó algún camino
+
+        while frontera:
+            f, _, nodo = heapq.heappop(frontera)
+            if f > max_cost:
+                break
+            if nodo == destino:
+                return Ruta(self._camino(padre, destino), round(dist[destino], 6), not podado)
+            if nodo in cerrados:
+                continue
+            if expansiones >= max_expansions:
+                break
+            cerrados.add(nodo)
+            expansiones += 1
+            if saltos[nodo] >= max_hops:
+                podado = True
+                continue
+            for vecino, peso in self.memory.get_related_concepts(nodo, threshold=PESO_MINIMO):
+                nd = dist[nodo] + costo_arista(peso)
+                if nd > max_cost:
+                    break  # La fila está ordenada por peso: el resto es aún más caro
+                if nd < dist.get(vecino, math.inf):
+                    dist[vecino], saltos[vecino], padre[vecino] = nd, saltos[nodo] + 1, nodo
+                    heapq.heappush(frontera, (nd + h(vecino), next(contador), vecino))
+
+        if destino in dist and expansiones >= max_expansions:
+            return Ruta(self._camino(padre, destino), round(dist[destino], 6), False)  # Respuesta temprana
+        return None
+
+    @staticmethod
+    def _camino(padre, nodo):
+        camino = []
+        while nodo is not None:
+            camino.append(nodo)
+            nodo = padre[nodo]
+        camino.reverse()
+        return camino
+
+    @staticmethod
+    def _reconstruir(padre, encuentro):
+        """📌 Une las dos mitades del camino por el nodo de encuentro."""
+        ida = []
+        nodo = encuentro
+        while nodo is not None:
+            ida.append(nodo)
+            nodo = padre[0][nodo]
+        ida.reverse()
+        nodo = padre[1][encuentro]
+        while nodo is not None:
+            ida.append(nodo)
+            nodo = padre[1][nodo]
+        return ida
+
+    def clear(self):
+        """📌 Vacía la caché de resultados."""
+        with self.lock:
+            self._cache.clear()
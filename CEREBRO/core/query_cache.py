@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+
+from config.settings import Settings
+from core.node_versions import CUALQUIERA
+
+
+class QueryCache:
+    """
+    📌 Caché de respuestas por consulta normalizada, con invalidación por nodo.
+    - LRU de como mucho `capacity` respuestas; cada una caduca a los `ttl` segundos (`0` = nunca).
+    - Cada respuesta guarda los nodos que se leyeron al generarla en cada grafo vigilado (`NodeVersions.trace`),
+      con su sello de versión. Un índice inverso `(grafo, nodo) → consultas` permite que una mutación de "fuego"
+      descarte solo las respuestas que leyeron "fuego".
+    - Una respuesta no se guarda si alguno de sus nodos cambió mientras se calculaba.
+    - Métricas: `hits`, `misses`, `evictions` (LRU y TTL) e `invalidations` (por mutaciones).
+    """
+
+    def __init__(self, capacity=None, ttl=None):
+        self.capacity = Settings.QUERY_CACHE_SIZE if capacity is None else capacity
+        self.ttl = Settings.QUERY_CACHE_TTL if ttl is None else ttl
+        self.lock = threading.Lock()
+        self._entradas = OrderedDict()  # consulta -> (respuesta, caducidad, {grafo: {nodo: sello}})
+        self._por_nodo = {}  # (grafo, nodo) -> {consultas}
+        self._grafos = {}  # nombre -> (NodeVersions, callback)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def watch(self, nombre, versiones):
+        """📌 Vigila un grafo (su `NodeVersions`): sus mutaciones invalidan las respuestas que leyeron esos nodos."""
+        callback = lambda nodos: self.invalidate(nombre, nodos)
+        versiones.subscribe(callback)
+        self._grafos[nombre] = (versiones, callback)
+
+    def get_or_compute(self, consulta, calcular):
+        """📌 Respuesta guardada para `consulta` o, si no hay, `calcular()` registrando los nodos que lee."""
+        with self.lock:
+            entrada = self._entradas.get(consulta)
+            if entrada is not None and entrada[1] < time.monotonic():
+                self._quitar(consulta)
+                self.evictions += 1
+                entrada = None
+            if entrada is not None:
+                self._entradas.move_to_end(consulta)
+                self.hits += 1
+                return entrada[0]
+            self.misses += 1
+
+        if self.capacity <= 0:
+            return calcular()
+        with ExitStack() as pila:
+            lecturas = {nombre: pila.enter_context(versiones.trace()) for nombre, (versiones, _) in self._grafos.items()}
+            respuesta = calcular()
+        self._guardar(consulta, respuesta, lecturas)
+        return respuesta
+
+    def _guardar(self, consulta, respuesta, lecturas):
+        with self.lock:
+            if not all(self._grafos[nombre][0].unchanged(leidos) for nombre, leidos in lecturas.items()):
+                return  # Un nodo leído cambió mientras se calculaba
+            if consulta in self._entradas:
+                self._quitar(consulta)
+            caducidad = time.monotonic() + self.ttl if self.ttl > 0 else float("inf")
+            self._entradas[consulta] = (respuesta, caducidad, lecturas)
+            for nombre, leidos in lecturas.items():
+                for nodo in leidos:
+                    self._por_nodo.setdefault((nombre, nodo), set()).add(consulta)
+            while len(self._entradas) > self.capacity:
+                self._quitar(next(iter(self._entradas)))
+                self.evictions += 1
+
+    def _quitar(self, consulta):
+        """📌 Elimina una respuesta y sus entradas del índice inverso (con `self.lock` tomado)."""
+        _, _, lecturas = self._entradas.pop(consulta)
+        for nombre, leidos in lecturas.items():
+            for nodo in leidos:
+                clave = (nombre, nodo)
+                consultas = self._por_nodo.get(clave)
+                if consultas is not None:
+                    consultas.discard(consulta)
+                    if not consultas:
+                        del self._por_nodo[clave]
+
+    def invalidate(self, nombre, nodos=None):
+        """📌 Descarta las respuestas que leyeron alguno de `nodos` del grafo `nombre` (`None` = todas las de ese grafo)."""
+        with self.lock:
+            if nodos is None:
+                afectadas = {c for c, (_, _, lecturas) in self._entradas.items() if lecturas.get(nombre)}
+            else:
+                afectadas = set(self._por_nodo.get((nombre, CUALQUIERA), ()))
+                for nodo in nodos:
+                    afectadas.update(self._por_nodo.get((nombre, nodo), ()))
+            for consulta in afectadas:
+                self._quitar(consulta)
+            self.invalidations += len(afectadas)
+
+    def clear(self):
+        """📌 Vacía la caché (las métricas se conservan)."""
+        with self.lock:
+            self._entradas.clear()
+            self._por_nodo.clear()
+
+    def close(self):
+        """📌 Deja de vigilar los grafos."""
+        for versiones, callback in self._grafos.values():
+            versiones.unsubscribe(callback)
+        self._grafos = {}
+
+    def __len__(self):
+        return len(self._entradas)
@@ -0,0 +1,65 @@
+import bisect
+
+
+class SortedScoreIndex:
+    """
+    📌 Índice ordenado por puntuación (estructura de estadísticos de orden).
+    - Mantiene pares `(puntuación, clave)` ordenados: búsqueda O(log n), inserción con un `memmove`.
+    - `top(k)` y `bottom(k)` cuestan O(k); `range(lo, hi)` cuesta O(log n + resultado).
+    """
+
+    def __init__(self, items=()):
+        self._scores = {}
+        for clave, score in items:
+            self._scores[clave] = score
+        self._orden = sorted((score, clave) for clave, score in self._scores.items())
+
+    def __len__(self):
+        return len(self._orden)
+
+    def __contains__(self, clave):
+        return clave in self._scores
+
+    def score(self, clave, default=None):
+        """📌 Puntuación actual de una clave."""
+        return self._scores.get(clave, default)
+
+    def update(self, clave, score):
+        """📌 Inserta una clave o recoloca su puntuación."""
+        anterior = self._scores.get(clave)
+        if anterior is not None:
+            if anterior == score:
+                return
+            del self._orden[bisect.bisect_left(self._orden, (anterior, clave))]
+        self._scores[clave] = score
+        bisect.insort(self._orden, (score, clave))
+
+    def discard(self, clave):
+        """📌 Elimina una clave si está en el índice."""
+        anterior = self._scores.pop(clave, None)
+        if anterior is not None:
+            del self._orden[bisect.bisect_left(self._orden, (anterior, clave))]
+
+    def top(self, k):
+        """📌 Las `k` claves de mayor puntuación, de mayor a menor: `[(clave, puntuación)]`."""
+        if k <= 0:
+            return []
+        return [(clave, score) for score, clave in reversed(self._orden[-k:])]
+
+    def bottom(self, k):
+        """📌 Las `k` claves de menor puntuación, de menor a mayor."""
+        return [(clave, score) for score, clave in self._orden[:max(k, 0)]]
+
+    def range(self, lo=None, hi=None, inclusive=(True, False)):
+        """
+        📌 Claves con puntuación entre `lo` y `hi`, en orden ascendente.
+        - `None` deja el extremo abierto; `inclusive` indica si se incluyen `lo` y `hi`.
+        """
+        inicio, fin = 0, len(self._orden)
+        if lo is not None:
+            buscar = bisect.bisect_left if inclusive[0] else bisect.bisect_right
+            inicio = buscar(self._orden, lo, key=lambda par: par[0])
+        if hi is not None:
+            buscar = bisect.bisect_right if inclusive[1] else bisect.bisect_left
+            fin = buscar(self._orden, hi, key=lambda par: par[0])
+        return [(clave, score) for score, clave in self._orden[inicio:fin]]
@@ -1,6 +1,11 @@
-import networkx as nx
-from core.memory_manager import MemoryManager
-from core.consciousness_engine import ConsciousnessEngine
+from config.hyperparameters import Hyperparameters
+from config.settings import Settings
+from core.chain_reasoning import ChainReasoner
+from core.graph_registry import get_memory_manager, get_consciousness_engine
+from core.landmarks import LandmarkIndex
+from core.path_search import PathSearch
+from core.query_cache import QueryCache
+from core.relevance import RANKINGS, RelevanceEngine
 
 class ReasoningEngine:
     """
@@ -8,24 +13,63 @@ class ReasoningEngine:
     Analiza información de la memoria y la conciencia para tomar decisiones informadas.
     """
 
-    def __init__(self):
-        self.memory = MemoryManager()
-        self.consciousness = ConsciousnessEngine()
+    def __init__(self, memory=None, consciousness=None, ranking=None):
+        # 🔗 Por defecto se usan los grafos compartidos del proceso
+        self.memory = memory if memory is not None else get_memory_manager()
+        self.ranking = Settings.ANSWER_RANKING if ranking is None else ranking
+        if self.ranking not in RANKINGS:
+            raise ValueError(f"❌ Ranking desconocido: {self.ranking!r} (opciones: {', '.join(RANKINGS)})")
+        self.consciousness = consciousness if consciousness is not None else get_consciousness_engine()
+        self.landmarks = LandmarkIndex(self.memory)  # 🗺️ Cotas de distancia precalculadas (se construye al primer uso)
+        self.paths = PathSearch(self.memory, landmarks=self.landmarks)  # 🔎 Caminos ponderados con presupuesto y caché
+        self.chains = ChainReasoner(self.memory)  # ⛓️ Cadenas de varios saltos (beam search)
+        self.relevance = RelevanceEngine(self.memory)  # 🧲 PageRank personalizado para el ranking "pagerank"
+        self.cache = QueryCache()  # 🗄️ Respuestas por consulta; una mutación solo invalida las que leyeron ese nodo
+        self.cache.watch("memoria", self.memory.node_versions)
+        self.cache.watch("conciencia", self.consciousness.node_versions)
+
+    def close(self):
+        """📌 Deja de escuchar a la memoria y a la conciencia (caché de respuestas y landmarks)."""
+        self.cache.close()
+        self.landmarks.close()
 
     def inferir_relacion(self, concepto1, concepto2):
-        """Intenta determinar la relación entre dos conceptos utilizando la memoria."""
-        if concepto1 not in self.memory.graph or concepto2 not in self.memory.graph:
+        """
+        Intenta determinar la relación entre dos conceptos utilizando la memoria.
+        - Busca el camino de asociaciones más fuertes (ver `PathSearch`), con presupuesto de saltos y coste.
+        """
+        if not self.memory.has_node(concepto1) or not self.memory.has_node(concepto2):
             return f"⚠️ No tengo suficiente información para relacionar '{concepto1}' con '{concepto2}'."
 
-        try:
-            ruta = nx.shortest_path(self.memory.graph, source=concepto1, target=concepto2)
-            return f"🔎 '{concepto1}' está relacionado con '{concepto2}' a través de: {' → '.join(ruta)}."
-        except nx.NetworkXNoPath:
+        ruta = self.paths.find_path(concepto1, concepto2)
+        if ruta is None:
             return f"⚠️ No hay una relación directa entre '{concepto1}' y '{concepto2}'."
+        aviso = "" if ruta.exacta else " (búsqueda acotada: puede haber una relación más fuerte)"
+        return f"🔎 '{concepto1}' está relacionado con '{concepto2}' a través de: {' → '.join(ruta.nodos)}{aviso}."
+
+    def estimar_relacion(self, concepto1, concepto2):
+        """
+        📌 Estimación instantánea de cuánto se relacionan dos conceptos, con el índice de landmarks.
+        - Devuelve `(cota_inferior, cota_superior)` del coste del camino, o `None` si aún no hay índice.
+        """
+        if not self.landmarks.refresh():
+            return None
+        return self.landmarks.bounds(concepto1, concepto2)
+
+    def conceptos_relacionados(self, consulta):
+        """
+        📌 Conceptos relacionados con `consulta`, según `self.ranking`.
+        - `peso`: vecinos directos por peso de la arista.
+        - `pagerank`: PageRank personalizado desde los conceptos de la consulta (la consulta entera o sus palabras).
+        """
+        if self.ranking == "peso":
+            return self.memory.get_related_concepts(consulta)
+        semillas = [consulta] if self.memory.has_node(consulta) else consulta.split()
+        return self.relevance.rank(semillas, top_k=Hyperparameters.PPR_TOP_K)
 
     def evaluar_decision(self, decision):
         """Evalúa una decisión basada en la conciencia y experiencias previas."""
-        impacto = self.consciousness.graph.nodes.get(decision, {}).get("impacto", 0)
+        impacto = self.consciousness.get_decision_impact(decision)
         
         if impacto > 0:
             return f"✅ La decisión '{decision}' ha sido evaluada como positiva (Impacto: {impacto})."
@@ -35,13 +79,20 @@ class ReasoningEngine:
             return f"❓ No hay información suficiente para evaluar la decisión '{decision}'."
         
     def generar_respuesta(self, consulta):
-        """📌 Genera una respuesta combinando memoria y conciencia."""
-        memoria_info = self.memory.get_related_concepts(consulta)
+        """
+        📌 Genera una respuesta combinando memoria y conciencia.
+        - Los conceptos relacionados se ordenan según `Settings.ANSWER_RANKING` (ver `conceptos_relacionados`).
+        - Además, muestra las mejores cadenas de asociación de varios saltos.
+        """
+        memoria_info = self.conceptos_relacionados(consulta)
         conciencia_info = self.consciousness.get_concept_info(consulta)
+        cadenas = self.chains.explain(consulta, min_hops=2)
 
         partes_respuesta = []
         if memoria_info:
             partes_respuesta.append(f"📚 En mi memoria, '{consulta}' se relaciona con: " + ", ".join([c[0] for c in memoria_info]))
+        if cadenas:
+            partes_respuesta.append("⛓️ Cadenas de asociación: " + "; ".join(" → ".join(c.nodos) for c in cadenas))
         if conciencia_info:
             partes_respuesta.append(conciencia_info)
 
@@ -60,9 +111,13 @@ class ReasoningEngine:
     def process_query(self, query):
         """
         📌 Procesa una consulta del usuario y genera una respuesta basada en la memoria y la conciencia.
+        - La consulta se normaliza (minúsculas, espacios simples) y la respuesta se guarda en `self.cache`.
         """
-        query = query.lower().strip()
+        query = " ".join(query.lower().split())
+        return self.cache.get_or_compute(query, lambda: self._responder(query))
 
+    def _responder(self, query):
+        """📌 Genera la respuesta a una consulta ya normalizada (sin caché)."""
         # 🔎 Verificar si la consulta es sobre una relación entre conceptos
         palabras = query.split()
         if "es" in palabras and len(palabras) == 3:
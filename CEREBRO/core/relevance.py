@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict, deque
+
+from config.hyperparameters import Hyperparameters
+from core.path_search import PESO_MINIMO
+
+RANKINGS = ("peso", "pagerank")
+
+
+class RelevanceEngine:
+    """
+    📌 Relevancia de conceptos respecto a una consulta con PageRank personalizado (PPR).
+    - Aproximación local por "push" (Andersen–Chung–Lang): solo se visitan nodos con residuo
+      `r(u) >= epsilon · fuerza(u)`, así que el coste depende del vecindario de las semillas, no del grafo.
+    - El paseo aleatorio sigue cada arista con probabilidad `peso / fuerza(u)` (solo pesos positivos) y vuelve a
+      las semillas con probabilidad `alpha`.
+    - `max_pushes` acota el trabajo; los vecinos se leen con `get_related_concepts` (sin materializar un `.crbg`).
+    - Los resultados se guardan por conjunto de semillas en una LRU que se vacía cuando cambia `MemoryManager.version`,
+      con los nodos leídos al calcularlos (se repiten en la traza activa de `node_versions` en cada acierto).
+    """
+
+    def __init__(self, memory, alpha=None, epsilon=None, max_pushes=None, cache_size=None):
+        self.memory = memory
+        self.alpha = Hyperparameters.PPR_ALPHA if alpha is None else alpha
+        self.epsilon = Hyperparameters.PPR_EPSILON if epsilon is None else epsilon
+        self.max_pushes = Hyperparameters.PPR_MAX_PUSHES if max_pushes is None else max_pushes
+        self.cache_size = Hyperparameters.PPR_CACHE_SIZE if cache_size is None else cache_size
+        self.lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def personalized_pagerank(self, semillas):
+        """
+        📌 Puntuación PPR aproximada de los nodos cercanos a `semillas` (`{nodo: puntuación}`).
+        - Las semillas que no están en el grafo se ignoran; sin ninguna, devuelve `{}`.
+        """
+        semillas = frozenset(nodo for nodo in semillas if self.memory.has_node(nodo))
+        if not semillas:
+            return {}
+        versiones = self.memory.node_versions
+        with self.lock:
+            if self._version != self.memory.version:
+                self._cache.clear()  # 🔄 El grafo cambió desde que se calcularon
+                self._version = self.memory.version
+            elif semillas in self._cache:
+                self._cache.move_to_end(semillas)
+                self.hits += 1
+                puntuaciones, leidos = self._cache[semillas]
+                versiones.note_many(leidos)
+                return puntuaciones
+        self.misses += 1
+        version = self.memory.version
+        with versiones.trace() as leidos:
+            puntuaciones = self._push(semillas)
+        with self.lock:
+            if version == self.memory.version and self.cache_size > 0:
+                self._cache[semillas] = (puntuaciones, leidos)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return puntuaciones
+
+    def _push(self, semillas):
+        """📌 Bucle de push sobre los residuos (sin caché)."""
+        vecindario = {}  # nodo -> (vecinos con peso positivo, fuerza)
+
+        def vecinos(nodo):
+            if nodo not in vecindario:
+                filas = self.memory.get_related_concepts(nodo, threshold=PESO_MINIMO)
+                vecindario[nodo] = (filas, sum(peso for _, peso in filas))
+            return vecindario[nodo]
+
+        inicial = 1.0 / len(semillas)
+        p, r = {}, {nodo: inicial for nodo in semillas}
+        cola = deque(semillas)
+        en_cola = set(semillas)
+        pushes = 0
+
+        while cola and pushes < self.max_pushes:
+            u = cola.popleft()
+            en_cola.discard(u)
+            ru = r.get(u, 0.0)
+            filas, fuerza = vecinos(u)
+            if ru < self.epsilon * max(fuerza, 1.0):
+                continue
+            pushes += 1
+            p[u] = p.get(u, 0.0) + self.alpha * ru
+            r[u] = 0.0
+            resto = (1.0 - self.alpha) * ru
+            # Un nodo sin aristas devuelve el paseo a las semillas
+            destinos = [(v, resto * peso / fuerza) for v, peso in filas] if fuerza > 0 else [(s, resto * inicial) for s in semillas]
+            for v, masa in destinos:
+                r[v] = r.get(v, 0.0) + masa
+                if v not in en_cola:
+                    cola.append(v)
+                    en_cola.add(v)
+        return p
+
+    def rank(self, semillas, top_k=None, include_seeds=False):
+        """📌 `[(nodo, puntuación)]` de mayor a menor relevancia para `semillas` (como mucho `top_k`)."""
+        semillas = list(semillas)
+        puntuaciones = self.personalized_pagerank(semillas)
+        excluir = set() if include_seeds else set(semillas)
+        orden = sorted(((nodo, round(score, 6)) for nodo, score in puntuaciones.items() if nodo not in excluir),
+                       key=lambda par: par[1], reverse=True)
+        return orden if top_k is None else orden[:top_k]
+
+    def clear(self):
+        """📌 Vacía la caché de resultados."""
+        with self.lock:
+            self._cache.clear()
@@ -0,0 +1,117 @@
+import bisect
+from collections import deque
+
+SEPARADOR = "\0"  # No aparece en los términos: separa consultas en el modo por lotes
+
+
+class AhoCorasick:
+    """
+    📌 Autómata de Aho–Corasick para buscar muchos términos a la vez.
+    - Construcción O(suma de longitudes); búsqueda O(len(texto) + coincidencias).
+    - El coste por consulta no crece con el número de términos.
+    """
+
+    def __init__(self, patrones):
+        self.patrones = list(patrones)
+        self._goto = [{}]
+        self._fail = [0]
+        self._salida = [-1]  # Índice del patrón que termina en el estado (o -1)
+        self._enlace = [0]  # Siguiente estado por `fail` que es final
+
+        for k, patron in enumerate(self.patrones):
+            estado = 0
+            for c in patron:
+                siguiente = self._goto[estado].get(c)
+                if siguiente is None:
+                    siguiente = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._salida.append(-1)
+                    self._enlace.append(0)
+                    self._goto[estado][c] = siguiente
+                estado = siguiente
+            if self._salida[estado] == -1:
+                self._salida[estado] = k
+
+        # 🔗 Enlaces de fallo por niveles (BFS)
+        cola = deque(self._goto[0].values())
+        while cola:
+            u = cola.popleft()
+            for c, v in self._goto[u].items():
+                cola.append(v)
+                f = self._fail[u]
+                while f and c not in self._goto[f]:
+                    f = self._fail[f]
+                destino = self._goto[f].get(c, 0) if u else 0
+                self._fail[v] = destino if destino != v else 0
+                f = self._fail[v]
+                self._enlace[v] = f if self._salida[f] != -1 else self._enlace[f]
+
+    def iter_matches(self, texto):
+        """📌 Genera `(posición_final, índice_patrón)` para cada coincidencia en `texto`."""
+        goto, fail, salida, enlace = self._goto, self._fail, self._salida, self._enlace
+        estado = 0
+        for i, c in enumerate(texto):
+            while estado and c not in goto[estado]:
+                estado = fail[estado]
+            estado = goto[estado].get(c, 0)
+            s = estado if salida[estado] != -1 else enlace[estado]
+            while s:
+                yield i, salida[s]
+                s = enlace[s]
+
+    def find_first(self, texto):
+        """📌 Primer patrón (por posición final) que aparece en `texto`, o `None`."""
+        for _, k in self.iter_matches(texto):
+            return self.patrones[k]
+        return None
+
+
+class RestrictionMatcher:
+    """
+    📌 Filtro de restricciones de la conciencia sobre un autómata compilado.
+    - Compara sin distinguir mayúsculas, igual que `término in texto`.
+    - `screen()` evalúa muchas consultas en una sola pasada.
+    """
+
+    def __init__(self, terminos):
+        self.terminos = list(terminos)
+        normalizados = [t.lower() for t in self.terminos]
+        self._vacio = next((t for t, n in zip(self.terminos, normalizados) if not n), None)  # "" coincide siempre
+        self._automata = AhoCorasick(n for n in normalizados if n)
+        self._originales = [t for t, n in zip(self.terminos, normalizados) if n]
+
+    def __len__(self):
+        return len(self.terminos)
+
+    def find(self, texto):
+        """📌 Término restringido presente en `texto`, o `None`."""
+        if self._vacio is not None:
+            return self._vacio
+        for _, k in self._automata.iter_matches(texto.lower()):
+            return self._originales[k]
+        return None
+
+    def screen(self, textos):
+        """
+        📌 Evalúa varias consultas a la vez: devuelve, para cada una, el término encontrado o `None`.
+        - Las consultas se concatenan con un separador y se recorren en una única pasada.
+        """
+        textos = list(textos)
+        resultado = [self._vacio] * len(textos)
+        if self._vacio is not None or not textos:
+            return resultado
+
+        minusculas = [t.lower() for t in textos]
+        inicios = []
+        posicion = 0
+        for texto in minusculas:
+            inicios.append(posicion)
+            posicion += len(texto) + 1
+        corpus = SEPARADOR.join(minusculas)
+
+        for fin, k in self._automata.iter_matches(corpus):
+            i = bisect.bisect_right(inicios, fin) - 1
+            if resultado[i] is None:
+                resultado[i] = self._originales[k]
+        return resultado
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+
+
+def _fsync_directorio(directorio):
+    """📌 Sincroniza la entrada de directorio para que el `rename` sobreviva a un corte."""
+    try:
+        fd = os.open(directorio, os.O_RDONLY)
+    except OSError:
+        return  # Plataformas sin soporte (p. ej. Windows)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def escribir_atomico(path, escribir, binario=False):
+    """
+    💾 Escribe un archivo de forma atómica.
+    - `escribir(file)` vuelca el contenido en un temporal del mismo directorio, al que se hace `fsync`.
+    - `os.replace` sustituye el archivo: nunca queda uno a medio escribir.
+    """
+    directorio = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directorio, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directorio)
+    try:
+        if binario:
+            file = os.fdopen(fd, "wb")
+        else:
+            file = os.fdopen(fd, "w", encoding="utf-8")
+        with file:
+            escribir(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directorio(directorio)
+
+
+def escribir_json_atomico(path, data):
+    """💾 Escribe `data` como JSON en `path` de forma atómica."""
+    escribir_atomico(path, lambda file: json.dump(data, file, indent=4))
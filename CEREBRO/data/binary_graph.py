@@ -0,0 +1,266 @@
+"""
+📌 Formato binario compacto para los grafos de CEREBRO (`.crbg`).
+- Tabla de cadenas internadas (offsets + bytes UTF-8) con un índice ordenado para buscar por nombre.
+- Adyacencia en CSR: `row_offsets`, `neighbors` (uint32) y `weights` (`peso` en float32).
+- Los vecinos de cada nodo se guardan ordenados por `peso` descendente.
+- Atributos de nodos, del grafo y de aristas (salvo `peso`) van en bloques JSON que solo se leen si se piden.
+- El archivo se abre con `mmap`: cargarlo no lee ni reconstruye el grafo.
+"""
+
+import bisect
+import json
+import mmap
+import struct
+
+import networkx as nx
+import numpy as np
+
+MAGIC = b"CRBG"
+VERSION = 1
+EXTENSION = ".crbg"
+FLAG_DIRIGIDO = 1
+
+SECCIONES = (
+    "name_offsets",  # uint64[n + 1]
+    "names",  # bytes UTF-8 concatenados
+    "name_order",  # uint32[n], ids ordenados por nombre
+    "row_offsets",  # uint64[n + 1]
+    "neighbors",  # uint32[m]
+    "weights",  # float32[m]
+    "node_attrs",  # JSON: lista de dicts en orden de id
+    "graph_attrs",  # JSON: dict
+    "edge_attrs",  # JSON: lista de [i, j, attrs] con atributos distintos de `peso`
+)
+
+_HEADER = struct.Struct("<4sIIIQQ")  # magic, versión, flags, nº secciones, nº nodos, nº entradas CSR
+_SECCION = struct.Struct("<QQ")  # offset, longitud
+_ALINEACION = 8
+
+
+def es_binario(path):
+    """📌 Indica si una ruta corresponde al formato binario (por extensión)."""
+    return str(path).endswith(EXTENSION)
+
+
+def codificar_grafo(graph, graph_attrs=None):
+    """
+    📌 Serializa un grafo de NetworkX al formato binario y devuelve los bytes.
+    - `graph_attrs` sustituye a `graph.graph` si se indica.
+    - Las aristas sin `peso` se guardan con peso 1.0.
+    """
+    if graph.is_multigraph():
+        raise ValueError("❌ El formato binario no admite multigrafos.")
+
+    nodos = list(graph.nodes)
+    if any(not isinstance(nodo, str) for nodo in nodos):
+        raise ValueError("❌ El formato binario solo admite nodos de tipo texto.")
+    n = len(nodos)
+    idx = {nodo: i for i, nodo in enumerate(nodos)}
+    dirigido = graph.is_directed()
+
+    # 🔤 Tabla de cadenas
+    nombres = [nodo.encode("utf-8") for nodo in nodos]
+    name_offsets = np.zeros(n + 1, dtype=np.uint64)
+    np.cumsum(np.fromiter((len(b) for b in nombres), dtype=np.uint64, count=n), out=name_offsets[1:])
+    name_order = np.array(sorted(range(n), key=nombres.__getitem__), dtype=np.uint32)
+
+    # 🔗 Aristas en ambas direcciones si el grafo no es dirigido
+    origen, destino, pesos, extra = [], [], [], []
+    for u, v, datos in graph.edges(data=True):
+        i, j = idx[u], idx[v]
+        peso = float(datos.get("peso", 1.0))
+        origen.append(i)
+        destino.append(j)
+        pesos.append(peso)
+        if not dirigido and i != j:
+            origen.append(j)
+            destino.append(i)
+            pesos.append(peso)
+        otros = {k: valor for k, valor in datos.items() if k != "peso"}
+        if otros:
+            extra.append([i, j, otros])
+
+    origen = np.array(origen, dtype=np.int64)
+    destino = np.array(destino, dtype=np.uint32)
+    pesos = np.array(pesos, dtype=np.float32)
+    orden = np.lexsort((-pesos, origen))  # Por nodo de origen y, dentro de él, por peso descendente
+    row_offsets = np.zeros(n + 1, dtype=np.uint64)
+    np.cumsum(np.bincount(origen, minlength=n), out=row_offsets[1:])
+
+    atributos = [dict(datos) for _, datos in graph.nodes(data=True)]
+    secciones = {
+        "name_offsets": name_offsets.tobytes(),
+        "names": b"".join(nombres),
+        "name_order": name_order.tobytes(),
+        "row_offsets": row_offsets.tobytes(),
+        "neighbors": destino[orden].tobytes(),
+        "weights": pesos[orden].tobytes(),
+        "node_attrs": json.dumps(atributos, ensure_ascii=False).encode("utf-8"),
+        "graph_attrs": json.dumps(graph.graph if graph_attrs is None else graph_attrs, ensure_ascii=False).encode("utf-8"),
+        "edge_attrs": json.dumps(extra, ensure_ascii=False).encode("utf-8"),
+    }
+
+    cabecera = bytearray(_HEADER.size + _SECCION.size * len(SECCIONES))
+    _HEADER.pack_into(cabecera, 0, MAGIC, VERSION, FLAG_DIRIGIDO if dirigido else 0, len(SECCIONES), n, len(destino))
+    cuerpo = bytearray()
+    offset = len(cabecera)
+    for k, nombre in enumerate(SECCIONES):
+        relleno = -offset % _ALINEACION
+        cuerpo += b"\0" * relleno
+        offset += relleno
+        contenido = secciones[nombre]
+        _SECCION.pack_into(cabecera, _HEADER.size + k * _SECCION.size, offset, len(contenido))
+        cuerpo += contenido
+        offset += len(contenido)
+    return bytes(cabecera + cuerpo)
+
+
+class BinaryGraph:
+    """
+    📌 Vista de solo lectura sobre un grafo en formato binario, mapeado en memoria.
+    - Las consultas de vecinos no construyen el grafo de NetworkX.
+    - `to_networkx()` lo materializa cuando hace falta mutarlo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"❌ Archivo de grafo binario vacío: {path}")
+
+        magic, version, flags, n_secciones, n_nodos, n_entradas = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"❌ {path} no es un grafo binario de CEREBRO.")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"❌ Versión de grafo binario no soportada: {version} (se esperaba {VERSION}).")
+
+        self.directed = bool(flags & FLAG_DIRIGIDO)
+        self.n_nodes = n_nodos
+        self.n_entries = n_entradas
+        self._secciones = {}
+        for k, nombre in enumerate(SECCIONES[:n_secciones]):
+            self._secciones[nombre] = _SECCION.unpack_from(self._mmap, _HEADER.size + k * _SECCION.size)
+
+        self._name_offsets = self._array("name_offsets", np.uint64)
+        self._name_order = self._array("name_order", np.uint32)
+        self.row_offsets = self._array("row_offsets", np.uint64)
+        self.neighbors_ids = self._array("neighbors", np.uint32)
+        self.weights = self._array("weights", np.float32)
+        self.graph_attrs = json.loads(self._bytes("graph_attrs"))
+        self._ids = {}
+        self._node_attrs = None
+
+    def _array(self, nombre, dtype):
+        """📌 Devuelve una sección como array de NumPy sin copiarla."""
+        offset, longitud = self._secciones[nombre]
+        return np.frombuffer(self._mmap, dtype=dtype, count=longitud // np.dtype(dtype).itemsize, offset=offset)
+
+    def _bytes(self, nombre):
+        """📌 Devuelve los bytes de una sección."""
+        offset, longitud = self._secciones[nombre]
+        return self._mmap[offset:offset + longitud]
+
+    def _nombre_bytes(self, i):
+        """📌 Nombre del nodo `i` en UTF-8."""
+        base = self._secciones["names"][0]
+        return self._mmap[base + int(self._name_offsets[i]):base + int(self._name_offsets[i + 1])]
+
+    def node_name(self, i):
+        """📌 Nombre del nodo con id `i`."""
+        return self._nombre_bytes(i).decode("utf-8")
+
+    def node_id(self, nombre):
+        """📌 Id de un nodo por nombre (búsqueda binaria en la tabla ordenada), o `None`."""
+        if nombre in self._ids:
+            return self._ids[nombre]
+        objetivo = nombre.encode("utf-8")
+        pos = bisect.bisect_left(range(self.n_nodes), objetivo, key=lambda k: self._nombre_bytes(self._name_order[k]))
+        if pos < self.n_nodes and self._nombre_bytes(self._name_order[pos]) == objetivo:
+            self._ids[nombre] = int(self._name_order[pos])  # Solo los aciertos: como mucho `n_nodes` entradas
+            return self._ids[nombre]
+        return None
+
+    def __contains__(self, nombre):
+        return isinstance(nombre, str) and self.node_id(nombre) is not None
+
+    def __len__(self):
+        return self.n_nodes
+
+    def node_names(self):
+        """📌 Lista de todos los nombres de nodo en orden de id."""
+        blob = bytes(self._bytes("names"))
+        offsets = self._name_offsets.tolist()
+        return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.n_nodes)]
+
+    def node_attrs(self, nombre=None):
+        """📌 Atributos de un nodo (o de todos, en orden de id, si `nombre` es `None`)."""
+        if self._node_attrs is None:
+            self._node_attrs = json.loads(self._bytes("node_attrs"))
+        if nombre is None:
+            return self._node_attrs
+        nid = self.node_id(nombre)
+        return None if nid is None else self._node_attrs[nid]
+
+    def row(self, nombre):
+        """📌 Ids de vecinos y pesos (ordenados por peso descendente) de un nodo, sin copiar."""
+        nid = self.node_id(nombre)
+        if nid is None:
+            return self.neighbors_ids[:0], self.weights[:0]
+        inicio, fin = int(self.row_offsets[nid]), int(self.row_offsets[nid + 1])
+        return self.neighbors_ids[inicio:fin], self.weights[inicio:fin]
+
+    def related(self, nombre, threshold=0.5, top_k=None):
+        """
+        📌 Vecinos con `peso >= threshold`, ordenados por peso descendente (como mucho `top_k`).
+        - Como la fila ya está ordenada, basta una búsqueda binaria y un corte.
+        - El umbral se redondea a float32 como los pesos: `0.7` se guarda como `0.69999999` y debe seguir pasando `0.7`.
+        """
+        vecinos, pesos = self.row(nombre)
+        corte = bisect.bisect_right(pesos, -float(np.float32(threshold)), key=lambda p: -float(p))
+        if top_k is not None:
+            corte = min(corte, top_k)
+        return [(self.node_name(j), p) for j, p in zip(vecinos[:corte].tolist(), pesos[:corte].tolist())]
+
+    def sample(self, nombre, k, rng):
+        """📌 Hasta `k` vecinos `(nombre, peso)` elegidos al azar sin reemplazo; solo se decodifican los elegidos."""
+        vecinos, pesos = self.row(nombre)
+        posiciones = range(len(vecinos)) if len(vecinos) <= k else rng.choice(len(vecinos), k, replace=False).tolist()
+        return [(self.node_name(int(vecinos[i])), float(pesos[i])) for i in posiciones]
+
+    def to_networkx(self):
+        """📌 Materializa el grafo completo en NetworkX."""
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+        graph.graph.update(self.graph_attrs)
+        nombres = self.node_names()
+        graph.add_nodes_from(zip(nombres, self.node_attrs()))
+
+        origen = np.repeat(np.arange(self.n_nodes, dtype=np.int64), np.diff(self.row_offsets).astype(np.int64))
+        destino = self.neighbors_ids.astype(np.int64)
+        pesos = self.weights
+        if not self.directed:
+            mascara = origen <= destino  # Cada arista no dirigida está guardada en ambos sentidos
+            origen, destino, pesos = origen[mascara], destino[mascara], pesos[mascara]
+        graph.add_edges_from(
+            (nombres[i], nombres[j], {"peso": p})
+            for i, j, p in zip(origen.tolist(), destino.tolist(), pesos.tolist())
+        )
+        for i, j, otros in json.loads(self._bytes("edge_attrs")):
+            graph[nombres[i]][nombres[j]].update(otros)
+        return graph
+
+    def close(self):
+        """📌 Libera el mapeo en memoria."""
+        for nombre in ("_name_offsets", "_name_order", "row_offsets", "neighbors_ids", "weights"):
+            setattr(self, nombre, None)  # Las vistas de NumPy deben soltarse antes de cerrar el mmap
+        if getattr(self, "_mmap", None) is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Aún hay vistas vivas fuera; el mapeo se liberará con ellas
+            self._mmap = None
+        self._file.close()
@@ -0,0 +1,47 @@
+"""
+📌 Conversor de grafos JSON (node-link) al formato binario CSR de CEREBRO.
+Uso: `python -m data.convert_graph data/memory_graph.json [data/memory_graph.crbg]`
+"""
+
+import os
+import sys
+
+from data.atomic_io import escribir_atomico
+from data.binary_graph import EXTENSION, codificar_grafo
+from data.graph_persistence import GraphPersistence
+
+
+def convertir_json_a_binario(json_path, binary_path=None):
+    """
+    📌 Convierte un grafo JSON (con su diario pendiente aplicado) al formato `.crbg`.
+    - El archivo binario empieza con su propio diario vacío.
+    - Devuelve la ruta del archivo generado.
+    """
+    if binary_path is None:
+        binary_path = os.path.splitext(json_path)[0] + EXTENSION
+
+    diario_destino = binary_path + ".wal"
+    if os.path.exists(diario_destino) or os.path.exists(diario_destino + ".1"):
+        raise FileExistsError(f"❌ {binary_path} tiene un diario pendiente; compáctalo o elimínalo antes de convertir.")
+
+    graph = None
+    origen = GraphPersistence(json_path, lambda: graph, interval=0, nombre="grafo JSON")
+    try:
+        graph = origen.load()
+    finally:
+        origen.close()
+    if graph is None:
+        raise FileNotFoundError(f"❌ No se encontró el grafo {json_path}")
+
+    graph_attrs = {k: v for k, v in graph.graph.items() if k != "journal_seq"}
+    contenido = codificar_grafo(graph, graph_attrs)
+    escribir_atomico(binary_path, lambda file: file.write(contenido), binario=True)
+    print(f"✅ {json_path} → {binary_path} ({graph.number_of_nodes()} nodos, {graph.number_of_edges()} aristas, {len(contenido)} bytes)")
+    return binary_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print(__doc__)
+        sys.exit(1)
+    convertir_json_a_binario(*sys.argv[1:])
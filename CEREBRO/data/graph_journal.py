@@ -0,0 +1,156 @@
+import json
+import os
+
+from config.settings import Settings
+
+
+def aplicar_operacion(graph, op, args):
+    """
+    📌 Aplica una operación del diario sobre un grafo de NetworkX.
+    - Es la única definición de cada operación: se usa tanto en vivo como al reproducir el diario.
+    """
+    if op == "add_node":
+        nodo, attrs = args
+        graph.add_node(nodo, **attrs)
+    elif op == "add_edge":
+        nodo1, nodo2, attrs = args
+        graph.add_edge(nodo1, nodo2, **attrs)
+    elif op == "node_set":
+        nodo, attr, valor = args
+        graph.nodes[nodo][attr] = valor
+    elif op == "node_delta":
+        nodo, attr, delta = args
+        datos = graph.nodes[nodo]
+        datos[attr] = datos.get(attr, 0) + delta
+    elif op == "edge_set":
+        nodo1, nodo2, attr, valor = args
+        graph[nodo1][nodo2][attr] = valor
+    elif op == "edge_delta":
+        nodo1, nodo2, attr, delta = args
+        datos = graph[nodo1][nodo2]
+        datos[attr] = datos.get(attr, 0) + delta
+    else:
+        raise ValueError(f"❌ Operación de diario desconocida: {op}")
+
+
+class GraphJournal:
+    """
+    📌 Diario de mutaciones (write-ahead log) de un grafo.
+    - Cada operación es una línea JSON `[seq, op, *args]` añadida al final del archivo: coste O(1).
+    - `fsync` se hace por lotes de `Settings.JOURNAL_BATCH_SIZE` operaciones.
+    - Al compactar, el diario se rota a `<ruta>.1` hasta que la nueva instantánea está escrita.
+    """
+
+    def __init__(self, path, batch_size=None):
+        self.path = path
+        self.batch_size = Settings.JOURNAL_BATCH_SIZE if batch_size is None else batch_size
+        self.seq = 0  # Último número de secuencia emitido o reproducido
+        self._file = None
+        self._pending = 0
+        self._size = os.path.getsize(path) if os.path.exists(path) else 0
+
+    @property
+    def rotated_path(self):
+        """📌 Ruta del diario rotado durante una compactación."""
+        return self.path + ".1"
+
+    @property
+    def size(self):
+        """📌 Tamaño en bytes del diario activo."""
+        return self._size
+
+    @property
+    def pending(self):
+        """📌 Número de operaciones escritas pero aún sin `fsync`."""
+        return self._pending
+
+    def replay(self, graph, desde_seq=0):
+        """
+        📂 Reproduce el diario (rotado y activo) sobre `graph`.
+        - Ignora las operaciones ya incluidas en la instantánea (`seq <= desde_seq`).
+        - Devuelve el número de operaciones aplicadas.
+        """
+        self.seq = max(self.seq, desde_seq)
+        aplicadas = 0
+        for ruta in (self.rotated_path, self.path):
+            if os.path.exists(ruta):
+                aplicadas += self._replay_file(ruta, graph, desde_seq)
+        self._size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return aplicadas
+
+    def _replay_file(self, ruta, graph, desde_seq):
+        """📌 Reproduce un archivo de diario y recorta una posible última línea incompleta."""
+        valido = 0
+        aplicadas = 0
+        with open(ruta, "rb") as file:
+            for linea in file:
+                if not linea.endswith(b"\n"):
+                    break
+                try:
+                    seq, op, *args = json.loads(linea)
+                except ValueError:
+                    break
+                valido += len(linea)
+                self.seq = max(self.seq, seq)
+                if seq <= desde_seq:
+                    continue
+                try:
+                    aplicar_operacion(graph, op, args)
+                    aplicadas += 1
+                except (KeyError, ValueError) as e:
+                    print(f"⚠️ Operación {seq} del diario ignorada ({op}): {e}")
+
+        if valido < os.path.getsize(ruta):
+            print(f"⚠️ Diario {ruta} truncado tras una escritura incompleta.")
+            with open(ruta, "r+b") as file:
+                file.truncate(valido)
+        return aplicadas
+
+    def append(self, op, *args):
+        """📌 Añade una operación al diario y devuelve su número de secuencia."""
+        if self._file is None:
+            self._file = open(self.path, "ab", buffering=0)
+        self.seq += 1
+        linea = (json.dumps([self.seq, op, *args], ensure_ascii=False) + "\n").encode("utf-8")
+        self._file.write(linea)
+        self._size += len(linea)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.sync()
+        return self.seq
+
+    def sync(self):
+        """💾 Fuerza a disco (`fsync`) las operaciones pendientes."""
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def rotate(self):
+        """
+        📌 Aparta el diario activo para compactarlo y empieza uno vacío.
+        - Si quedó un diario rotado de una compactación fallida, se le concatena el activo.
+        """
+        self.sync()
+        self.close()
+        if os.path.exists(self.path):
+            if os.path.exists(self.rotated_path):
+                with open(self.rotated_path, "ab") as destino, open(self.path, "rb") as origen:
+                    destino.write(origen.read())
+                    destino.flush()
+                    os.fsync(destino.fileno())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.rotated_path)
+        self._size = 0
+
+    def discard_rotated(self):
+        """📌 Elimina el diario rotado una vez que la instantánea lo contiene."""
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+
+    def close(self):
+        """📌 Cierra el archivo del diario (tras sincronizarlo)."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
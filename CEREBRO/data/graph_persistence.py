@@ -0,0 +1,164 @@
+import atexit
+import json
+import os
+import threading
+
+import networkx as nx
+
+from config.settings import Settings
+from data.atomic_io import escribir_atomico, escribir_json_atomico
+from data.binary_graph import BinaryGraph, codificar_grafo, es_binario
+from data.graph_journal import GraphJournal, aplicar_operacion
+
+
+class GraphPersistence:
+    """
+    📌 Persistencia de los grafos de CEREBRO: instantánea + diario de mutaciones.
+    - Cada mutación se aplica con `apply()` y se añade al diario (`<ruta>.wal`): coste O(1).
+    - Un hilo en segundo plano hace `fsync` del diario cada `Settings.AUTO_SAVE_INTERVAL` segundos.
+    - Cuando el diario supera `Settings.JOURNAL_COMPACT_BYTES` se compacta en una nueva instantánea.
+    - Al arrancar, `load()` reproduce el diario sobre la última instantánea.
+    - La instantánea es JSON node-link o, si la ruta termina en `.crbg`, el formato binario CSR.
+    """
+
+    def __init__(self, path, get_graph, interval=None, nombre="grafo", compact_bytes=None):
+        """
+        📌 `get_graph` es una función sin argumentos que devuelve el grafo vivo del propietario.
+        - `interval <= 0` desactiva el hilo: solo se sincroniza con `flush()` o al salir.
+        """
+        self.path = path
+        self.get_graph = get_graph
+        self.interval = Settings.AUTO_SAVE_INTERVAL if interval is None else interval
+        self.compact_bytes = Settings.JOURNAL_COMPACT_BYTES if compact_bytes is None else compact_bytes
+        self.nombre = nombre
+        self.binary = es_binario(path)
+        self.journal = GraphJournal(path + ".wal")
+        self.lock = threading.RLock()  # 🔒 Protege el grafo frente al hilo de guardado
+        self._flush_lock = threading.Lock()  # 🔒 Serializa los guardados entre sí
+        self._dirty = False
+        self._closed = False
+        self._stop = threading.Event()
+        self._thread = None
+
+        if self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name=f"write-behind-{nombre}", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def load(self, materialize=True):
+        """
+        📂 Carga la última instantánea y le aplica el diario pendiente.
+        - Con `materialize=False` y una instantánea binaria sin diario pendiente, devuelve el
+          `BinaryGraph` mapeado en memoria en lugar de construir el grafo de NetworkX.
+        - Devuelve `None` si no existe ni instantánea ni diario.
+        """
+        seq = 0
+        graph = None
+        hay_diario = os.path.exists(self.journal.path) or os.path.exists(self.journal.rotated_path)
+        if os.path.exists(self.path):
+            if self.binary:
+                vista = BinaryGraph(self.path)
+                seq = vista.graph_attrs.pop("journal_seq", 0)
+                if not materialize and not hay_diario:
+                    self.journal.seq = seq
+                    return vista
+                graph = vista.to_networkx()
+                vista.close()
+            else:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                seq = data.get("graph", {}).pop("journal_seq", 0)
+                graph = nx.node_link_graph(data)
+
+        if hay_diario:
+            graph = nx.Graph() if graph is None else graph
+            aplicadas = self.journal.replay(graph, desde_seq=seq)
+            if aplicadas:
+                print(f"🔁 {aplicadas} operaciones del diario aplicadas sobre el {self.nombre}.")
+        else:
+            self.journal.seq = seq
+        return graph
+
+    @property
+    def dirty(self):
+        """📌 Indica si hay cambios sin asegurar en disco."""
+        return self._dirty or self.journal.pending > 0
+
+    def mark_dirty(self):
+        """📌 Fuerza una instantánea completa en el próximo `flush()` (cambios no registrados en el diario)."""
+        self._dirty = True
+
+    def apply(self, op, *args):
+        """
+        📌 Aplica una operación al grafo vivo y la registra en el diario.
+        - Operaciones: `add_node`, `add_edge`, `node_set`, `node_delta`, `edge_set`, `edge_delta`.
+        """
+        with self.lock:
+            aplicar_operacion(self.get_graph(), op, args)
+            self.journal.append(op, *args)
+
+    def flush(self):
+        """
+        💾 Asegura en disco los cambios pendientes.
+        - Sincroniza el diario y compacta si superó el umbral.
+        - Devuelve `True` si se escribió algo.
+        """
+        with self._flush_lock:
+            with self.lock:
+                escrito = self.journal.pending > 0
+                self.journal.sync()
+            if self._dirty or self.journal.size >= self.compact_bytes:
+                self._compact()
+                escrito = True
+        return escrito
+
+    def compact(self):
+        """💾 Pliega el diario en una nueva instantánea, sin esperar al umbral."""
+        with self._flush_lock:
+            self._compact()
+
+    def _compact(self):
+        """📌 Escribe la instantánea; el diario rotado solo se borra si la escritura tuvo éxito."""
+        with self.lock:
+            graph = self.get_graph()
+            graph_attrs = dict(graph.graph, journal_seq=self.journal.seq)
+            if self.binary:
+                contenido = codificar_grafo(graph, graph_attrs)
+            else:
+                contenido = nx.node_link_data(graph)
+                contenido["graph"] = graph_attrs
+            self.journal.rotate()
+            self._dirty = False
+        try:
+            if self.binary:
+                escribir_atomico(self.path, lambda file: file.write(contenido), binario=True)
+            else:
+                escribir_json_atomico(self.path, contenido)
+        except Exception:
+            self._dirty = True  # Se reintentará en el siguiente ciclo
+            raise
+        self.journal.discard_rotated()
+
+    def _run(self):
+        """🔄 Bucle del hilo de guardado periódico."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Error en el guardado automático del {self.nombre}: {e}")
+
+    def close(self):
+        """📌 Detiene el hilo de guardado y asegura los cambios pendientes."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"⚠️ Error al guardar el {self.nombre} al cerrar: {e}")
+        with self.lock:
+            self.journal.close()
+        atexit.unregister(self.close)
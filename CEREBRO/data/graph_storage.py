@@ -1,59 +1,80 @@
 import networkx as nx
-import json
-import os
+
+from data.binary_graph import BinaryGraph
+from data.graph_persistence import GraphPersistence
 
 class GraphStorage:
     """
     📌 Módulo de almacenamiento de grafos en CEREBRO.
-    - Guarda y carga grafos en formato JSON.
+    - Guarda y carga grafos en formato JSON o en el formato binario CSR (`.crbg`).
     - Soporta múltiples grafos (conceptos, conciencia).
+    - Con `.crbg` las consultas de conexiones se resuelven sobre el archivo mapeado en memoria.
     """
 
-    def __init__(self, storage_path="data/graph_data.json"):
+    def __init__(self, storage_path="data/graph_data.json", autosave_interval=None):
         self.storage_path = storage_path
-        self.graph = nx.Graph()
+        self._graph = nx.Graph()
+        self._csr = None
+        self.persistence = GraphPersistence(storage_path, lambda: self.graph, interval=autosave_interval, nombre="grafo")
         self.load_graph()
 
+    @property
+    def graph(self):
+        """📌 Grafo de NetworkX; la vista binaria se materializa en el primer acceso."""
+        if self._graph is None:
+            with self.persistence.lock:
+                if self._graph is None:
+                    self._graph = self._csr.to_networkx()
+                    self._csr.close()
+                    self._csr = None
+        return self._graph
+
     def load_graph(self):
-        """📂 Carga el grafo desde un archivo JSON."""
-        if os.path.exists(self.storage_path):
-            try:
-                with open(self.storage_path, "r", encoding="utf-8") as file:
-                    data = json.load(file)
-                    self.graph = nx.node_link_graph(data)
-                print("✅ Grafo cargado con éxito.")
-            except Exception as e:
-                print(f"⚠️ Error al cargar el grafo: {e}")
-        else:
+        """📂 Carga el grafo desde su instantánea (JSON o binaria) y el diario de cambios."""
+        try:
+            graph = self.persistence.load(materialize=False)
+        except Exception as e:
+            print(f"⚠️ Error al cargar el grafo: {e}")
+            return
+
+        if graph is None:
             print("⚠️ No se encontró un archivo de grafo. Se inicia uno nuevo.")
+            return
+        if isinstance(graph, BinaryGraph):
+            self._graph, self._csr = None, graph
+        else:
+            self._graph = graph
+        print("✅ Grafo cargado con éxito.")
 
     def save_graph(self):
-        """💾 Guarda el estado actual del grafo en un archivo JSON."""
+        """💾 Asegura en disco los cambios pendientes del grafo."""
         try:
-            with open(self.storage_path, "w", encoding="utf-8") as file:
-                json.dump(nx.node_link_data(self.graph), file, indent=4)
-            print("✅ Grafo guardado correctamente.")
+            if self.persistence.flush():
+                print("✅ Grafo guardado correctamente.")
         except Exception as e:
             print(f"⚠️ Error al guardar el grafo: {e}")
 
     def add_connection(self, nodo1, nodo2, peso=1.0):
         """📌 Agrega o refuerza una conexión entre dos nodos."""
-        if not self.graph.has_node(nodo1):
-            self.graph.add_node(nodo1, tipo="concepto")
-        if not self.graph.has_node(nodo2):
-            self.graph.add_node(nodo2, tipo="concepto")
+        with self.persistence.lock:
+            if not self.graph.has_node(nodo1):
+                self.persistence.apply("add_node", nodo1, {"tipo": "concepto"})
+            if not self.graph.has_node(nodo2):
+                self.persistence.apply("add_node", nodo2, {"tipo": "concepto"})
 
-        if self.graph.has_edge(nodo1, nodo2):
-            self.graph[nodo1][nodo2]["peso"] += peso
-        else:
-            self.graph.add_edge(nodo1, nodo2, peso=peso)
+            if self.graph.has_edge(nodo1, nodo2):
+                self.persistence.apply("edge_delta", nodo1, nodo2, "peso", peso)
+            else:
+                self.persistence.apply("add_edge", nodo1, nodo2, {"peso": peso})
 
         print(f"🔗 Conexión añadida: {nodo1} ↔ {nodo2} (Peso: {peso})")
-        self.save_graph()
 
     def get_connections(self, nodo):
         """📌 Devuelve todas las conexiones de un nodo."""
-        if nodo in self.graph:
-            return [(n, self.graph[nodo][n]["peso"]) for n in self.graph[nodo]]
-        return []
+        with self.persistence.lock:  # La vista binaria puede cerrarse al materializarse, y el grafo cambiar
+            if self._graph is None:
+                return self._csr.related(nodo, threshold=float("-inf"))
+            if nodo in self._graph:
+                return [(n, datos["peso"]) for n, datos in self._graph[nodo].items()]
+            return []
 
@@ -0,0 +1,206 @@
+import atexit
+import json
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from config.settings import Settings
+from data.atomic_io import escribir_json_atomico
+
+
+def normalizar_clave(texto):
+    """
+    📌 Clave de caché de un texto: Unicode NFC, sin espacios sobrantes.
+    - No cambia mayúsculas ni tildes: spaCy puede dar vectores distintos para ellas.
+    """
+    return " ".join(unicodedata.normalize("NFC", texto).split())
+
+
+class EmbeddingCache:
+    """
+    📌 Caché persistente de embeddings de texto.
+    - Delante, una LRU en memoria de `Settings.EMBEDDING_CACHE_SIZE` entradas.
+    - Detrás, un almacén en disco: matriz float32 mapeada en memoria (`<ruta>.f32`) y un
+      índice de claves en el mismo orden (`<ruta>.keys`, una línea JSON por fila).
+    - Ambos archivos solo crecen por el final; al abrir se recorta una posible fila incompleta.
+    - `<ruta>.meta.json` guarda el modelo y la dimensión: si cambian, la caché se descarta.
+    - El almacén admite un solo proceso escritor. Los demás (p. ej. el de `BackgroundTrainer`) lo abren con
+      `read_only=True`: leen las filas ya escritas, guardan lo nuevo solo en la LRU y nunca recortan ni borran archivos.
+    """
+
+    def __init__(self, path=None, model=Settings.NLP_MODEL, dim=300, capacity=None, read_only=None):
+        self.path = Settings.EMBEDDING_CACHE_PATH if path is None else path
+        self.model = model
+        self.dim = dim
+        self.capacity = Settings.EMBEDDING_CACHE_SIZE if capacity is None else capacity
+        self.read_only = Settings.EMBEDDING_CACHE_READ_ONLY if read_only is None else read_only
+        self.lock = threading.Lock()
+        self._lru = OrderedDict()
+        self._filas = {}  # clave -> fila en el almacén
+        self._mapa = None  # `np.memmap` de solo lectura sobre las filas ya escritas
+        self._datos = None
+        self._claves = None
+        self.hits = 0
+        self.misses = 0
+        self._abrir()
+        atexit.register(self.close)
+
+    @property
+    def data_path(self):
+        return self.path + ".f32"
+
+    @property
+    def keys_path(self):
+        return self.path + ".keys"
+
+    @property
+    def meta_path(self):
+        return self.path + ".meta.json"
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __contains__(self, texto):
+        return normalizar_clave(texto) in self._filas
+
+    def _abrir(self):
+        """📂 Carga el índice de claves y descarta el almacén si es de otro modelo o dimensión."""
+        meta = {"model": self.model, "dim": self.dim}
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as file:
+                actual = json.load(file)
+        except (OSError, ValueError):
+            actual = None
+        if actual != meta:
+            if self.read_only:
+                return  # Almacén de otro modelo: se trabaja solo con la LRU
+            for ruta in (self.data_path, self.keys_path):
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+            escribir_json_atomico(self.meta_path, meta)
+            return
+
+        bytes_fila = 4 * self.dim
+        filas_datos = os.path.getsize(self.data_path) // bytes_fila if os.path.exists(self.data_path) else 0
+        validas = 0
+        bytes_claves = 0
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, "rb") as file:
+                for linea in file:
+                    if validas >= filas_datos or not linea.endswith(b"\n"):
+                        break
+                    try:
+                        clave = json.loads(linea)
+                    except ValueError:
+                        break
+                    self._filas[clave] = validas
+                    validas += 1
+                    bytes_claves += len(linea)
+        if self.read_only:
+            return  # Las filas incompletas pueden ser las que el escritor está añadiendo ahora
+        if os.path.exists(self.keys_path) and os.path.getsize(self.keys_path) != bytes_claves:
+            with open(self.keys_path, "r+b") as file:
+                file.truncate(bytes_claves)  # ✂️ Claves sin fila o línea incompleta
+        if os.path.exists(self.data_path) and os.path.getsize(self.data_path) != validas * bytes_fila:
+            with open(self.data_path, "r+b") as file:
+                file.truncate(validas * bytes_fila)  # ✂️ Filas sin clave de un guardado interrumpido
+        if self._filas:
+            print(f"✅ Caché de embeddings cargada: {len(self._filas)} textos.")
+
+    def _leer_fila(self, fila):
+        """📌 Lee una fila del almacén; vuelve a mapear el archivo si ha crecido."""
+        if self._mapa is None or fila >= self._mapa.shape[0]:
+            if self._datos is not None:
+                self._datos.flush()
+            n = os.path.getsize(self.data_path) // (4 * self.dim)
+            self._mapa = np.memmap(self.data_path, dtype=np.float32, mode="r", shape=(n, self.dim))
+        return np.array(self._mapa[fila])
+
+    def _recordar(self, clave, vector):
+        self._lru[clave] = vector
+        self._lru.move_to_end(clave)
+        if len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    def get(self, texto):
+        """📌 Embedding guardado para `texto`, o `None` si no está en la caché."""
+        clave = normalizar_clave(texto)
+        with self.lock:
+            vector = self._lru.get(clave)
+            if vector is not None:
+                self._lru.move_to_end(clave)
+                self.hits += 1
+                return vector
+            fila = self._filas.get(clave)
+            if fila is None:
+                self.misses += 1
+                return None
+            vector = self._leer_fila(fila)
+            self._recordar(clave, vector)
+            self.hits += 1
+            return vector
+
+    def put(self, texto, vector):
+        """📌 Guarda el embedding de `texto` (en la LRU y al final del almacén)."""
+        clave = normalizar_clave(texto)
+        vector = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        with self.lock:
+            if clave not in self._filas and not self.read_only:
+                if self._datos is None:
+                    self._datos = open(self.data_path, "ab")
+                    self._claves = open(self.keys_path, "ab")
+                self._datos.write(vector.tobytes())
+                self._claves.write((json.dumps(clave, ensure_ascii=False) + "\n").encode("utf-8"))
+                self._filas[clave] = len(self._filas)
+            self._recordar(clave, vector)
+        return vector
+
+    def get_or_compute(self, texto, calcular):
+        """📌 Devuelve el embedding en caché o lo calcula con `calcular(texto)` y lo guarda."""
+        vector = self.get(texto)
+        if vector is None:
+            vector = self.put(texto, calcular(texto))
+        return vector
+
+    def flush(self):
+        """💾 Asegura en disco las filas añadidas."""
+        with self.lock:
+            for file in (self._datos, self._claves):
+                if file is not None:
+                    file.flush()
+                    os.fsync(file.fileno())
+
+    def close(self):
+        """📌 Sincroniza y cierra los archivos del almacén."""
+        self.flush()
+        with self.lock:
+            for file in (self._datos, self._claves):
+                if file is not None:
+                    file.close()
+            self._datos = self._claves = None
+            self._mapa = None
+        atexit.unregister(self.close)
+
+
+_lock = threading.Lock()
+_caches = {}
+
+
+def get_embedding_cache(path=None, model=Settings.NLP_MODEL, dim=300):
+    """
+    📌 Devuelve la `EmbeddingCache` compartida del proceso para `path`, creándola la primera vez.
+    - Así varios `NLPEngine` del mismo proceso no abren cada uno un escritor sobre los mismos archivos.
+    - Si se pide otro modelo o dimensión para esa ruta, la caché devuelta es de solo lectura (solo LRU).
+    """
+    path = Settings.EMBEDDING_CACHE_PATH if path is None else path
+    clave = os.path.abspath(path)
+    with _lock:
+        cache = _caches.get(clave)
+        if cache is None:
+            cache = _caches[clave] = EmbeddingCache(path, model=model, dim=dim)
+        elif (cache.model, cache.dim) != (model, dim):
+            return EmbeddingCache(path, model=model, dim=dim, read_only=True)
+        return cache
@@ -1,24 +1,64 @@
-import spacy
+import time
 import unicodedata
 
+from config.settings import Settings
+from core.lazy_loader import lazy_import, startup_timer
+from externalities.embedding_cache import get_embedding_cache
+
+spacy = lazy_import("spacy")  # 💤 Solo se importa cuando se necesita el modelo
+
+# 🔧 Componentes de spaCy que necesita cada tarea; el resto se desactiva al procesar
+COMPONENTES_EMBEDDING = ()  # `doc.vector` solo usa los vectores del vocabulario
+COMPONENTES_KEYWORDS = ("tok2vec", "tagger", "morphologizer", "attribute_ruler", "lemmatizer")
+COMPONENTES_SENTIMIENTO = ()  # `token.sentiment` es un atributo léxico
+
 class NLPEngine:
     """
     📌 Módulo de Procesamiento de Lenguaje Natural (NLP) para CEREBRO.
     - Normaliza texto.
     - Extrae entidades y conceptos clave.
-    - Genera embeddings de palabras.
+    - Genera embeddings de palabras (con caché persistente: spaCy solo se ejecuta para textos nuevos).
+    - Cada tarea desactiva los componentes del pipeline que no necesita.
+    - spaCy se importa y carga bajo demanda: normalizar texto o leer la caché no lo necesitan.
+    - Las variantes por lotes usan `nlp.pipe` con `Settings.NLP_BATCH_SIZE` y `Settings.NLP_N_PROCESS`.
     """
 
-    def __init__(self, model="es_core_news_md"):
+    def __init__(self, model="es_core_news_md", embedding_cache=None):
         """
-        📌 Inicializa el motor NLP cargando el modelo de spaCy.
+        📌 Inicializa el motor NLP; el modelo de spaCy se carga en su primer uso.
         - `es_core_news_md` es un modelo en español con embeddings de 300 dimensiones.
+        - `embedding_cache` permite inyectar otra `EmbeddingCache` (por defecto, la compartida de `Settings`).
         """
-        try:
-            self.nlp = spacy.load(model)
-            print(f"✅ NLP Engine cargado con el modelo: {model}")
-        except Exception as e:
-            print(f"⚠️ Error al cargar el modelo NLP: {e}")
+        self.model = model
+        self.embedding_cache = embedding_cache if embedding_cache is not None else get_embedding_cache(model=model)
+        self._nlp = None
+
+    @property
+    def nlp(self):
+        """📌 Pipeline de spaCy; se carga la primera vez que una operación lo necesita."""
+        if self._nlp is None:
+            inicio = time.perf_counter()
+            try:
+                self._nlp = spacy.load(self.model)
+                print(f"✅ NLP Engine cargado con el modelo: {self.model}")
+            except Exception as e:
+                print(f"⚠️ Error al cargar el modelo NLP: {e}")
+                raise
+            startup_timer.record(f"modelo spaCy {self.model}", time.perf_counter() - inicio)
+        return self._nlp
+
+    def _desactivar(self, necesarios):
+        """📌 Componentes del pipeline que no están en `necesarios` (se desactivan en la llamada)."""
+        return [nombre for nombre in self.nlp.pipe_names if nombre not in necesarios]
+
+    def _pipe(self, texts, necesarios, batch_size=None, n_process=None):
+        """📌 `nlp.pipe` por lotes con solo los componentes `necesarios` activos."""
+        return self.nlp.pipe(
+            texts,
+            batch_size=batch_size or Settings.NLP_BATCH_SIZE,
+            n_process=n_process or Settings.NLP_N_PROCESS,
+            disable=self._desactivar(necesarios),
+        )
 
     def normalize_text(self, text):
         """
@@ -27,30 +67,67 @@ class NLPEngine:
         text = text.lower().strip()
         return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
 
+    @staticmethod
+    def _keywords(doc):
+        return [token.lemma_ for token in doc if token.pos_ in ["NOUN", "PROPN"]]
+
     def extract_keywords(self, text):
         """
         📌 Extrae palabras clave de un texto.
         - Se enfoca en sustantivos y nombres propios.
         """
-        doc = self.nlp(text)
-        return [token.lemma_ for token in doc if token.pos_ in ["NOUN", "PROPN"]]
+        doc = self.nlp(text, disable=self._desactivar(COMPONENTES_KEYWORDS))
+        return self._keywords(doc)
+
+    def extract_keywords_batch(self, texts, batch_size=None, n_process=None):
+        """📌 `extract_keywords` para muchos textos con `nlp.pipe` (sin parser ni NER)."""
+        return [self._keywords(doc) for doc in self._pipe(texts, COMPONENTES_KEYWORDS, batch_size, n_process)]
+
+    @staticmethod
+    def _vector(doc):
+        return doc.vector if doc.vector_norm > 0 else [0.0] * 300
 
     def get_embedding(self, text):
         """
         📌 Obtiene el embedding de una palabra o texto completo.
         - Si el texto no tiene embedding, devuelve un vector de ceros.
+        - Se consulta primero la caché (LRU + almacén en disco).
         """
-        doc = self.nlp(text)
-        return doc.vector if doc.vector_norm > 0 else [0.0] * 300
+        return self.embedding_cache.get_or_compute(text, self._calcular_embedding)
+
+    def _calcular_embedding(self, text):
+        """📌 Ejecuta spaCy para obtener el embedding (solo en fallos de caché)."""
+        return self._vector(self.nlp(text, disable=self._desactivar(COMPONENTES_EMBEDDING)))
+
+    def get_embeddings(self, texts, batch_size=None, n_process=None):
+        """
+        📌 Embeddings de muchos textos, en el mismo orden.
+        - Solo los textos que no están en caché (sin repetir) pasan por `nlp.pipe`.
+        """
+        texts = list(texts)
+        vectores = [self.embedding_cache.get(text) for text in texts]
+        pendientes = list(dict.fromkeys(text for text, vector in zip(texts, vectores) if vector is None))
+        if pendientes:
+            docs = self._pipe(pendientes, COMPONENTES_EMBEDDING, batch_size, n_process)
+            calculados = {text: self.embedding_cache.put(text, self._vector(doc)) for text, doc in zip(pendientes, docs)}
+            vectores = [calculados[text] if vector is None else vector for text, vector in zip(texts, vectores)]
+        return vectores
+
+    @staticmethod
+    def _sentimiento(doc):
+        score = sum([token.sentiment for token in doc]) / len(doc) if len(doc) > 0 else 0
+        return round(score, 4)
 
     def analyze_sentiment(self, text):
         """
         📌 Evalúa el sentimiento del texto en función de su estructura y palabras clave.
         - Se puede mejorar con modelos preentrenados específicos.
         """
-        doc = self.nlp(text)
-        score = sum([token.sentiment for token in doc]) / len(doc) if len(doc) > 0 else 0
-        return round(score, 4)
+        return self._sentimiento(self.nlp(text, disable=self._desactivar(COMPONENTES_SENTIMIENTO)))
+
+    def analyze_sentiment_batch(self, texts, batch_size=None, n_process=None):
+        """📌 `analyze_sentiment` para muchos textos con `nlp.pipe` (solo tokenización)."""
+        return [self._sentimiento(doc) for doc in self._pipe(texts, COMPONENTES_SENTIMIENTO, batch_size, n_process)]
 
     def process_text(self, text):
         """
@@ -59,3 +136,9 @@ class NLPEngine:
         text = self.normalize_text(text)
         keywords = self.extract_keywords(text)
         return " ".join(keywords) if keywords else text  # Si no hay keywords, usa el texto normalizado.
+
+    def process_texts(self, texts, batch_size=None, n_process=None):
+        """📌 `process_text` para muchos textos: normaliza y extrae palabras clave por lotes."""
+        normalizados = [self.normalize_text(text) for text in texts]
+        keywords = self.extract_keywords_batch(normalizados, batch_size, n_process)
+        return [" ".join(kw) if kw else text for text, kw in zip(normalizados, keywords)]
@@ -1,5 +1,4 @@
-from core.memory_manager import MemoryManager
-from core.consciousness_engine import ConsciousnessEngine
+from core.graph_registry import get_memory_manager, get_consciousness_engine
 
 class KnowledgeUpdater:
     """
@@ -7,9 +6,9 @@ class KnowledgeUpdater:
     Administra la evolución del conocimiento y la conciencia.
     """
 
-    def __init__(self):
-        self.memory = MemoryManager()
-        self.consciousness = ConsciousnessEngine()
+    def __init__(self, memory=None, consciousness=None):
+        self.memory = memory if memory is not None else get_memory_manager()
+        self.consciousness = consciousness if consciousness is not None else get_consciousness_engine()
 
     def update_knowledge(self, concepto1, concepto2, impacto):
         """Actualiza el conocimiento y ajusta la conciencia según el impacto."""
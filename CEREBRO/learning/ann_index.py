@@ -0,0 +1,182 @@
+import numpy as np
+
+from config.hyperparameters import Hyperparameters
+
+
+class IVFIndex:
+    """
+    📌 Índice de vecinos aproximados (IVF) sobre embeddings de nodos, implementado con NumPy.
+    - Agrupa los vectores en `n_lists` celdas con k-means; cada consulta solo revisa las `n_probe` más cercanas.
+    - Por debajo de `min_train_size` vectores no entrena celdas y la búsqueda es exacta.
+    - Admite altas, bajas y actualizaciones sin reconstruir; reentrena al duplicarse el tamaño.
+    - Las distancias son euclídeas. `Predictor` solo las usa para elegir candidatos: la probabilidad de relación
+      la da después el decoder de aristas (`learning.link_prediction.puntuar_pares`).
+    """
+
+    def __init__(self, n_probe=None, min_train_size=None, kmeans_iter=None, seed=0):
+        self.n_probe = n_probe or Hyperparameters.ANN_N_PROBE
+        self.min_train_size = Hyperparameters.ANN_MIN_TRAIN_SIZE if min_train_size is None else min_train_size
+        self.kmeans_iter = kmeans_iter or Hyperparameters.ANN_KMEANS_ITER
+        self._rng = np.random.default_rng(seed)
+        self._vectores = np.zeros((0, 0), dtype=np.float32)  # Filas reservadas; solo las activas cuentan
+        self._claves = []
+        self._clave_a_id = {}
+        self._libres = []  # Filas liberadas por `remove`, reutilizables
+        self._centroides = None
+        self._listas = []  # Celda → lista de ids de fila
+        self._celda = {}  # id de fila → celda
+        self._tamano_entrenado = 0
+
+    def __len__(self):
+        return len(self._clave_a_id)
+
+    def __contains__(self, clave):
+        return clave in self._clave_a_id
+
+    @property
+    def trained(self):
+        """📌 `True` si el índice tiene celdas (búsqueda aproximada); `False` si busca de forma exacta."""
+        return self._centroides is not None
+
+    @property
+    def dim(self):
+        return self._vectores.shape[1]
+
+    def vector(self, clave):
+        """📌 Vector almacenado para una clave."""
+        return self._vectores[self._clave_a_id[clave]]
+
+    def build(self, claves, vectores):
+        """📌 Sustituye el contenido del índice por `claves` / `vectores` y entrena las celdas."""
+        vectores = np.asarray(vectores, dtype=np.float32)
+        claves = list(claves)
+        if len(claves) != len(vectores):
+            raise ValueError("❌ `claves` y `vectores` deben tener la misma longitud.")
+        self._vectores = vectores.reshape(len(claves), -1).copy() if claves else np.zeros((0, 0), dtype=np.float32)
+        self._claves = claves
+        self._clave_a_id = {clave: i for i, clave in enumerate(claves)}
+        self._libres = []
+        self._entrenar()
+
+    def _ids_activos(self):
+        return np.fromiter(self._clave_a_id.values(), dtype=np.int64, count=len(self._clave_a_id))
+
+    def _entrenar(self):
+        """📌 k-means sobre los vectores activos; sin suficientes vectores, desactiva las celdas."""
+        ids = self._ids_activos()
+        self._tamano_entrenado = len(ids)
+        if len(ids) < max(self.min_train_size, 1):
+            self._centroides, self._listas, self._celda = None, [], {}
+            return
+
+        datos = self._vectores[ids]
+        n_lists = max(1, int(np.sqrt(len(ids))))
+        centroides = datos[self._rng.choice(len(ids), n_lists, replace=False)].copy()
+        for _ in range(self.kmeans_iter):
+            asignacion = self._mas_cercano(datos, centroides)
+            sumas = np.zeros_like(centroides)
+            np.add.at(sumas, asignacion, datos)
+            conteos = np.bincount(asignacion, minlength=n_lists)
+            llenas = conteos > 0
+            centroides[llenas] = sumas[llenas] / conteos[llenas, None]
+
+        self._centroides = centroides
+        asignacion = self._mas_cercano(datos, centroides)
+        self._listas = [[] for _ in range(n_lists)]
+        self._celda = {}
+        for i, celda in zip(ids.tolist(), asignacion.tolist()):
+            self._listas[celda].append(i)
+            self._celda[i] = celda
+
+    @staticmethod
+    def _distancias2(consultas, matriz):
+        """📌 Distancias euclídeas al cuadrado entre filas de `consultas` y de `matriz`."""
+        d2 = (np.einsum("ij,ij->i", consultas, consultas)[:, None]
+              + np.einsum("ij,ij->i", matriz, matriz)[None, :]
+              - 2.0 * (consultas @ matriz.T))
+        return np.maximum(d2, 0.0, out=d2)
+
+    def _mas_cercano(self, datos, centroides):
+        return np.argmin(self._distancias2(datos, centroides), axis=1)
+
+    def add(self, clave, vector):
+        """📌 Inserta (o actualiza) el vector de una clave."""
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        if clave in self._clave_a_id:
+            self.remove(clave)
+        if len(self._clave_a_id) == 0 and not self._libres:
+            self._vectores = self._vectores.reshape(self._vectores.shape[0], vector.shape[0])
+        elif vector.shape[0] != self.dim:
+            raise ValueError(f"❌ Dimensión {vector.shape[0]} distinta de la del índice ({self.dim}).")
+
+        if self._libres:
+            i = self._libres.pop()
+            self._claves[i] = clave
+        else:
+            i = len(self._claves)
+            if i == self._vectores.shape[0]:  # Crecimiento geométrico de la reserva
+                reserva = np.zeros((max(16, 2 * i), vector.shape[0]), dtype=np.float32)
+                reserva[:i] = self._vectores
+                self._vectores = reserva
+            self._claves.append(clave)
+        self._vectores[i] = vector
+        self._clave_a_id[clave] = i
+
+        if self.trained:
+            celda = int(self._mas_cercano(vector[None, :], self._centroides)[0])
+            self._listas[celda].append(i)
+            self._celda[i] = celda
+        if len(self._clave_a_id) >= max(2 * self._tamano_entrenado, self.min_train_size, 1):
+            self._entrenar()  # 🔄 Reentreno amortizado
+
+    def remove(self, clave):
+        """📌 Elimina una clave del índice (no hace nada si no existe)."""
+        i = self._clave_a_id.pop(clave, None)
+        if i is None:
+            return
+        celda = self._celda.pop(i, None)
+        if celda is not None:
+            self._listas[celda].remove(i)
+        self._claves[i] = None
+        self._libres.append(i)
+
+    def _candidatos(self, vector):
+        """📌 Ids de fila a revisar: las `n_probe` celdas más cercanas, o todos si no hay celdas."""
+        if not self.trained:
+            return self._ids_activos()
+        d2 = self._distancias2(vector[None, :], self._centroides)[0]
+        n_probe = min(self.n_probe, len(d2))
+        celdas = np.argpartition(d2, n_probe - 1)[:n_probe]
+        ids = [i for celda in celdas.tolist() for i in self._listas[celda]]
+        return np.asarray(ids, dtype=np.int64)
+
+    def query(self, vector, k=10, radius=None, exclude=()):
+        """
+        📌 Vecinos aproximados de `vector`: `[(clave, distancia)]` de menor a mayor distancia.
+        - `k` limita el número de resultados (`None` = sin límite); `radius` descarta los más lejanos.
+        - `exclude` son claves que no deben aparecer (p. ej. el propio nodo consultado).
+        """
+        if not self._clave_a_id:
+            return []
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        ids = self._candidatos(vector)
+        if exclude:
+            excluidos = {self._clave_a_id[c] for c in exclude if c in self._clave_a_id}
+            if excluidos:
+                ids = ids[~np.isin(ids, list(excluidos))]
+        if len(ids) == 0:
+            return []
+
+        d2 = self._distancias2(vector[None, :], self._vectores[ids])[0]
+        if radius is not None:
+            dentro = d2 <= radius * radius
+            ids, d2 = ids[dentro], d2[dentro]
+        if k is not None and len(ids) > k:
+            mejores = np.argpartition(d2, k - 1)[:k]
+            ids, d2 = ids[mejores], d2[mejores]
+        orden = np.argsort(d2, kind="stable")
+        return [(self._claves[i], float(np.sqrt(d2[j]))) for j, i in zip(orden.tolist(), ids[orden].tolist())]
+
+    def query_key(self, clave, k=10, radius=None):
+        """📌 Vecinos aproximados de una clave ya indexada (sin incluirla a ella misma)."""
+        return self.query(self.vector(clave), k=k, radius=radius, exclude=(clave,))
@@ -0,0 +1,201 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from config.settings import Settings
+
+
+class GraphSnapshot:
+    """
+    📌 Copia fija del grafo de memoria que se envía al proceso de entrenamiento.
+    - Expone la parte de lectura de `MemoryManager` que usa el entrenamiento.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def get_graph(self):
+        return self.graph
+
+    def nodes(self):
+        return list(self.graph.nodes)
+
+    def get_related_concepts(self, concepto, threshold=0.5, top_k=None):
+        if concepto not in self.graph:
+            return []
+        vecinos = sorted(((v, d.get("peso", 1.0)) for v, d in self.graph[concepto].items() if d.get("peso", 1.0) >= threshold),
+                         key=lambda par: par[1], reverse=True)
+        return vecinos[:top_k] if top_k is not None else vecinos
+
+
+def _proceso_entrenamiento(graph, model_path, cola, incremental=False, changed_nodes=None):
+    """
+    📌 Cuerpo del proceso de entrenamiento.
+    - Importa TensorFlow aquí, nunca en el proceso principal.
+    - Informa de su estado por `cola`: `("fase", ...)`, `("epoca", n, total, perdida)`, `("listo", ruta)` o `("error", texto)`.
+    """
+    try:
+        cola.put(("fase", "preparando"))
+        Settings.EMBEDDING_CACHE_READ_ONLY = True  # El proceso principal es el único que escribe en la caché de embeddings
+        import tensorflow as tf
+        from learning.train_gnn import generate_model
+
+        class _Progreso(tf.keras.callbacks.Callback):
+            def on_epoch_end(self, epoch, logs=None):
+                perdida = (logs or {}).get("loss")
+                cola.put(("epoca", epoch + 1, self.params.get("epochs"), None if perdida is None else float(perdida)))
+
+        cola.put(("fase", "entrenando"))
+        generate_model(GraphSnapshot(graph), model_path, callbacks=[_Progreso()],
+                       incremental=incremental, changed_nodes=changed_nodes)
+        cola.put(("listo", model_path))
+    except Exception as e:
+        cola.put(("error", f"{type(e).__name__}: {e}"))
+
+
+class BackgroundTrainer:
+    """
+    📌 Entrenamiento de la GNN en un proceso aparte, sin bloquear la consola.
+    - El proceso recibe una copia del grafo de memoria: no comparte archivos de diario con el principal.
+    - Abre la caché de embeddings en solo lectura: el único que escribe en ella es el proceso principal.
+    - Un hilo del proceso principal recoge el progreso; `status()` lo devuelve en cualquier momento.
+    - Al terminar, los pesos ya están escritos y se llama a `on_ready(ruta)` para cargarlos en caliente.
+    - Con un `GraphChangeTracker`, `retrain_if_stale()` lanza un ajuste fino incremental cuando el modelo se queda atrás.
+    """
+
+    def __init__(self, memory, model_path=None, on_ready=None, tracker=None):
+        self.memory = memory
+        self.model_path = model_path or Settings.GNN_MODEL_PATH
+        self.on_ready = on_ready
+        self.tracker = tracker
+        self._lock = threading.Lock()
+        self._listo = threading.Event()
+        self._estado = {"estado": "sin iniciar", "epoca": 0, "epocas": None, "perdida": None, "error": None}
+        self._inicio = None
+        self._proceso = None
+        self._monitor = None
+
+    def _actualizar(self, **cambios):
+        with self._lock:
+            self._estado.update(cambios)
+
+    @property
+    def running(self):
+        """📌 `True` mientras hay un proceso de entrenamiento en marcha."""
+        return self._proceso is not None and self._proceso.is_alive()
+
+    def start(self, incremental=False):
+        """
+        📌 Lanza el entrenamiento si no existen los pesos (o un ajuste fino si `incremental`).
+        - Devuelve `True` si se inició un proceso nuevo.
+        """
+        existe = os.path.exists(self.model_path)
+        if existe and not incremental:
+            self._actualizar(estado="listo")
+            self._listo.set()
+            return False
+        if self.running:
+            return False
+
+        with self.memory.persistence.lock:
+            graph = self.memory.snapshot()  # 📸 Instantánea coherente del grafo (sin materializar un `.crbg`)
+            cambiados = self.tracker.begin() if self.tracker is not None else None
+        incremental = incremental and existe
+        contexto = multiprocessing.get_context("spawn")  # TensorFlow no tolera `fork`
+        cola = contexto.Queue()
+        self._proceso = contexto.Process(
+            target=_proceso_entrenamiento,
+            args=(graph, self.model_path, cola, incremental, cambiados),
+            name="gnn-trainer",
+            daemon=True,
+        )
+        self._inicio = time.time()
+        self._actualizar(estado="iniciando", epoca=0, epocas=None, perdida=None, error=None)
+        self._proceso.start()
+        self._monitor = threading.Thread(target=self._vigilar, args=(cola,), name="gnn-trainer-monitor", daemon=True)
+        self._monitor.start()
+        print(f"🏋️ {'Ajuste fino incremental' if incremental else 'Entrenamiento'} de la GNN iniciado en segundo plano.")
+        return True
+
+    def retrain_if_stale(self):
+        """📌 Lanza un reentrenamiento incremental si el registro de cambios supera el umbral de obsolescencia."""
+        if self.tracker is None or self.running or not self.tracker.is_stale():
+            return False
+        return self.start(incremental=True)
+
+    def _vigilar(self, cola):
+        """🔄 Recoge los mensajes del proceso hasta que termina."""
+        while True:
+            try:
+                mensaje = cola.get(timeout=0.5)
+            except queue.Empty:
+                if not self._proceso.is_alive():
+                    if self.status()["estado"] not in ("listo", "error", "cancelado"):
+                        self._actualizar(estado="error", error=f"el proceso terminó con código {self._proceso.exitcode}")
+                        self._rollback()
+                    return
+                continue
+
+            tipo = mensaje[0]
+            if tipo == "fase":
+                self._actualizar(estado=mensaje[1])
+            elif tipo == "epoca":
+                _, epoca, epocas, perdida = mensaje
+                self._actualizar(estado="entrenando", epoca=epoca, epocas=epocas, perdida=perdida)
+            elif tipo == "error":
+                self._actualizar(estado="error", error=mensaje[1])
+                self._rollback()
+                print(f"❌ Error en el entrenamiento de la GNN: {mensaje[1]}")
+            elif tipo == "listo":
+                self._actualizar(estado="listo")
+                if self.tracker is not None:
+                    self.tracker.commit()
+                print(f"✅ GNN entrenada en segundo plano ({time.time() - self._inicio:.1f} s).")
+                if self.on_ready is not None:
+                    try:
+                        self.on_ready(mensaje[1])
+                    except Exception as e:
+                        print(f"⚠️ No se pudieron cargar los pesos nuevos: {e}")
+                self._listo.set()
+
+    def _rollback(self):
+        if self.tracker is not None:
+            self.tracker.rollback()
+
+    @property
+    def ready(self):
+        """📌 `True` cuando los pesos de la GNN están disponibles."""
+        return self._listo.is_set()
+
+    def wait(self, timeout=None):
+        """📌 Espera a que termine el entrenamiento; devuelve `ready`."""
+        return self._listo.wait(timeout)
+
+    def status(self):
+        """📌 Estado actual: `estado`, `epoca`, `epocas`, `perdida`, `error` y `segundos` transcurridos."""
+        with self._lock:
+            estado = dict(self._estado)
+        estado["segundos"] = None if self._inicio is None else round(time.time() - self._inicio, 1)
+        return estado
+
+    def describe(self):
+        """📌 Resumen legible del estado del entrenamiento."""
+        estado = self.status()
+        if estado["estado"] == "entrenando" and estado["epocas"]:
+            perdida = "" if estado["perdida"] is None else f", pérdida {estado['perdida']:.4f}"
+            return f"🏋️ Entrenando la GNN: época {estado['epoca']}/{estado['epocas']}{perdida} ({estado['segundos']} s)"
+        if estado["estado"] == "error":
+            return f"❌ Entrenamiento fallido: {estado['error']}"
+        if estado["estado"] == "listo":
+            return "✅ Modelo GNN listo."
+        return f"⏳ Entrenamiento de la GNN: {estado['estado']}"
+
+    def stop(self):
+        """📌 Cancela el entrenamiento en curso."""
+        if self._proceso is not None and self._proceso.is_alive():
+            self._proceso.terminate()
+            self._proceso.join()
+            self._actualizar(estado="cancelado")
+            self._rollback()
@@ -0,0 +1,123 @@
+import atexit
+import json
+import os
+import threading
+from collections import deque
+
+from config.hyperparameters import Hyperparameters
+from config.settings import Settings
+from data.atomic_io import escribir_json_atomico
+
+
+def k_hop_nodes(graph, semillas, k):
+    """📌 Nodos a `k` saltos o menos de cualquiera de las `semillas` (BFS multi-origen)."""
+    distancia = {nodo: 0 for nodo in semillas if nodo in graph}
+    cola = deque(distancia)
+    while cola:
+        nodo = cola.popleft()
+        if distancia[nodo] == k:
+            continue
+        for vecino in graph.neighbors(nodo):
+            if vecino not in distancia:
+                distancia[vecino] = distancia[nodo] + 1
+                cola.append(vecino)
+    return set(distancia)
+
+
+def k_hop_subgraph(graph, semillas, k):
+    """📌 Subgrafo inducido por el vecindario de `k` saltos de las `semillas` (copia independiente)."""
+    return graph.subgraph(k_hop_nodes(graph, semillas, k)).copy()
+
+
+class GraphChangeTracker:
+    """
+    📌 Registro de los cambios del grafo de memoria desde el último checkpoint de la GNN.
+    - Escucha las mutaciones de `MemoryManager` y anota los nodos afectados (una arista marca sus dos extremos).
+    - Se guarda junto a los pesos (`<modelo>.changes.json`) para sobrevivir a reinicios.
+    - `is_stale()` compara los nodos cambiados con el tamaño del grafo en el checkpoint
+      (`Hyperparameters.GNN_STALENESS_THRESHOLD`).
+    - `begin()` / `commit()` / `rollback()` protegen los cambios que llegan durante un reentrenamiento.
+    """
+
+    def __init__(self, memory, model_path=None):
+        self.memory = memory
+        self.path = (model_path or Settings.GNN_MODEL_PATH) + ".changes.json"
+        self._lock = threading.Lock()
+        self._cambiados = set()
+        self._en_curso = set()  # Nodos enviados al reentrenamiento en marcha
+        self.nodos_checkpoint = 0
+        self._cargar()
+        memory.add_listener(self._on_memory_change)
+        atexit.register(self.close)
+
+    def _cargar(self):
+        """📂 Recupera los cambios pendientes del último arranque."""
+        if not os.path.exists(self.path):
+            self.nodos_checkpoint = self.memory.number_of_nodes()
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self._cambiados = set(data.get("cambiados", []))
+            self.nodos_checkpoint = data.get("nodos_checkpoint", 0)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Registro de cambios de la GNN ilegible ({e}); se reentrenará el grafo completo.")
+            self._cambiados = set(self.memory.nodes())
+            self.nodos_checkpoint = 0
+
+    def save(self):
+        """💾 Guarda los cambios pendientes (incluidos los de un reentrenamiento sin confirmar)."""
+        with self._lock:
+            data = {"nodos_checkpoint": self.nodos_checkpoint, "cambiados": sorted(self._cambiados | self._en_curso, key=str)}
+        escribir_json_atomico(self.path, data)
+
+    def close(self):
+        """📌 Deja de escuchar al grafo y guarda los cambios pendientes."""
+        self.memory.remove_listener(self._on_memory_change)
+        self.save()
+        atexit.unregister(self.close)
+
+    def _on_memory_change(self, op, args):
+        """📌 Listener de `MemoryManager`: anota los nodos tocados por cada mutación."""
+        with self._lock:
+            if op in ("add_edge", "edge_set", "edge_delta"):
+                self._cambiados.update(args[:2])
+            else:
+                self._cambiados.add(args[0])
+
+    @property
+    def changed_nodes(self):
+        """📌 Nodos cambiados desde el último checkpoint (incluye los que se están reentrenando)."""
+        with self._lock:
+            return set(self._cambiados | self._en_curso)
+
+    def staleness(self):
+        """📌 Fracción de nodos cambiados respecto al tamaño del grafo en el último checkpoint."""
+        with self._lock:
+            cambiados = len(self._cambiados)
+        return cambiados / max(self.nodos_checkpoint, 1)
+
+    def is_stale(self, threshold=None):
+        """📌 `True` si el modelo debe reentrenarse de forma incremental."""
+        threshold = Hyperparameters.GNN_STALENESS_THRESHOLD if threshold is None else threshold
+        return self.staleness() >= threshold
+
+    def begin(self):
+        """📌 Toma los nodos cambiados para un reentrenamiento; los nuevos cambios se acumulan aparte."""
+        with self._lock:
+            self._en_curso |= self._cambiados
+            self._cambiados = set()
+            return set(self._en_curso)
+
+    def commit(self):
+        """📌 El reentrenamiento terminó: esos cambios ya están en los pesos."""
+        with self._lock:
+            self._en_curso = set()
+            self.nodos_checkpoint = self.memory.number_of_nodes()
+        self.save()
+
+    def rollback(self):
+        """📌 El reentrenamiento falló: los cambios vuelven a quedar pendientes."""
+        with self._lock:
+            self._cambiados |= self._en_curso
+            self._en_curso = set()
@@ -0,0 +1,267 @@
+import atexit
+import json
+import os
+import threading
+
+import numpy as np
+
+from config.settings import Settings
+from data.atomic_io import escribir_atomico, escribir_json_atomico
+
+
+def firma_pesos(model_path):
+    """📌 Identifica una versión concreta de los pesos (tamaño y fecha de modificación), o `None` si no existen."""
+    try:
+        stat = os.stat(model_path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class FilasCrecientes:
+    """
+    📌 Matriz float32 que crece por el final: la capacidad se dobla al llenarse (añadir es O(1) amortizado).
+    - `view()` devuelve las filas ocupadas sin copiarlas.
+    """
+
+    def __init__(self, matriz=None):
+        vacia = matriz is None or not len(matriz)
+        self._datos = None if vacia else np.asarray(matriz, dtype=np.float32)  # Sin copia: al crecer se realoja
+        self._n = 0 if vacia else len(self._datos)
+
+    def __len__(self):
+        return self._n
+
+    def extend(self, matriz):
+        matriz = np.asarray(matriz, dtype=np.float32)
+        if not len(matriz):
+            return
+        if self._datos is None:
+            self._datos = np.empty((max(len(matriz), 16), matriz.shape[1]), dtype=np.float32)
+        elif self._n + len(matriz) > len(self._datos):
+            nuevos = np.empty((max(2 * len(self._datos), self._n + len(matriz)), self._datos.shape[1]), dtype=np.float32)
+            nuevos[:self._n] = self._datos[:self._n]
+            self._datos = nuevos
+        self._datos[self._n:self._n + len(matriz)] = matriz
+        self._n += len(matriz)
+
+    def view(self):
+        if self._datos is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self._datos[:self._n]
+
+
+class EmbeddingTable:
+    """
+    📌 Tabla precalculada `nodo → embedding de la GNN`, exportada junto a los pesos.
+    - `<modelo>.emb.npy`: matriz float32 que se abre mapeada en memoria (`mmap_mode="r"`).
+    - `<modelo>.emb.index.json`: nodos en el orden de las filas y firma de los pesos que la generaron.
+    - Solo es válida para esos pesos: si cambian, `load()` la descarta.
+    - Los nodos nuevos (`append`) se añaden al final de un registro aparte, sin reescribir la tabla:
+      `<modelo>.emb.extra.f32` (filas float32) y `<modelo>.emb.extra.keys` (cabecera con la firma y un nodo por línea).
+      `close()` (también al salir) los compacta en la tabla principal de forma atómica.
+    """
+
+    def __init__(self, model_path=None):
+        self.model_path = model_path or Settings.GNN_MODEL_PATH
+        base = os.path.splitext(self.model_path)[0] + ".emb"
+        self.data_path = base + ".npy"
+        self.index_path = base + ".index.json"
+        self.extra_data_path = base + ".extra.f32"
+        self.extra_keys_path = base + ".extra.keys"
+        self.lock = threading.Lock()
+        self._archivos = None  # (filas, claves) abiertos para añadir
+        self._reiniciar()
+        atexit.register(self.close)
+
+    def _reiniciar(self):
+        self._cerrar_registro()
+        self._base = None  # Matriz mapeada del archivo
+        self._extra = FilasCrecientes()  # Filas añadidas desde la última compactación
+        self._filas = {}  # nodo -> fila
+        self._firma = None  # Firma de los pesos con los que se calcularon las filas
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __contains__(self, nodo):
+        return nodo in self._filas
+
+    @property
+    def loaded(self):
+        return self._base is not None
+
+    @property
+    def nodes(self):
+        return list(self._filas)
+
+    def load(self):
+        """
+        📂 Abre la tabla si existe y corresponde a los pesos actuales, con las filas añadidas después.
+        - Devuelve `True` si quedó cargada.
+        """
+        with self.lock:
+            self._reiniciar()
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as file:
+                    indice = json.load(file)
+                base = np.load(self.data_path, mmap_mode="r")
+            except (OSError, ValueError):
+                return False
+            firma = firma_pesos(self.model_path)
+            if firma is None or indice.get("firma") != firma or base.shape[0] != len(indice.get("nodos", [])):
+                return False  # 🕰️ Tabla de otros pesos o a medio escribir
+            self._base, self._firma = base, firma
+            self._filas = {nodo: fila for fila, nodo in enumerate(indice["nodos"])}
+            self._leer_registro()
+        print(f"✅ Tabla de embeddings cargada: {len(self._filas)} nodos.")
+        return True
+
+    def _leer_registro(self):
+        """📂 Añade las filas del registro que correspondan a esta tabla; recorta una fila incompleta."""
+        try:
+            with open(self.extra_keys_path, "rb") as file:
+                lineas = file.read().split(b"\n")
+        except OSError:
+            return
+        try:
+            cabecera = json.loads(lineas[0])
+        except ValueError:
+            cabecera = None
+        if cabecera != {"firma": self._firma, "filas": len(self._base)}:
+            self._borrar_registro()  # De otra tabla u otros pesos
+            return
+        dim = self._base.shape[1]
+        datos = np.fromfile(self.extra_data_path, dtype=np.float32) if os.path.exists(self.extra_data_path) else np.zeros(0, np.float32)
+        nodos = []
+        for linea in lineas[1:-1]:  # La última está vacía o incompleta
+            if len(nodos) >= len(datos) // dim:
+                break
+            try:
+                nodos.append(json.loads(linea))
+            except ValueError:
+                break
+        self._extra.extend(datos[:len(nodos) * dim].reshape(-1, dim))
+        for i, nodo in enumerate(nodos):
+            self._filas.setdefault(nodo, len(self._base) + i)
+        bytes_claves = sum(len(linea) + 1 for linea in lineas[:len(nodos) + 1])
+        with open(self.extra_keys_path, "r+b") as file:
+            file.truncate(bytes_claves)  # ✂️ Una línea o una fila a medio escribir
+        if os.path.exists(self.extra_data_path):
+            with open(self.extra_data_path, "r+b") as file:
+                file.truncate(len(nodos) * dim * 4)
+
+    def _borrar_registro(self):
+        self._cerrar_registro()
+        for ruta in (self.extra_data_path, self.extra_keys_path):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    def _cerrar_registro(self):
+        if self._archivos is not None:
+            for file in self._archivos:
+                file.close()
+            self._archivos = None
+
+    def write(self, nodos, matriz, firma=None):
+        """💾 Sustituye la tabla por `matriz` (una fila por nodo de `nodos`), firmada con `firma` o con los pesos actuales."""
+        matriz = np.ascontiguousarray(matriz, dtype=np.float32)
+        nodos = list(nodos)
+        if matriz.shape[0] != len(nodos):
+            raise ValueError(f"❌ {matriz.shape[0]} filas para {len(nodos)} nodos.")
+        firma = firma or firma_pesos(self.model_path)
+        with self.lock:
+            escribir_atomico(self.data_path, lambda file: np.save(file, matriz), binario=True)
+            escribir_json_atomico(self.index_path, {"firma": firma, "nodos": nodos})
+            self._reiniciar()
+            self._borrar_registro()
+            self._base, self._firma = np.load(self.data_path, mmap_mode="r"), firma
+            self._filas = {nodo: fila for fila, nodo in enumerate(nodos)}
+
+    def append(self, nodos, matriz):
+        """
+        📌 Añade filas para nodos que no estaban en la tabla (los ya presentes se ignoran).
+        - Se escriben al final del registro (coste proporcional a las filas nuevas, no a la tabla),
+          salvo que los pesos hayan cambiado: esas filas ya no sirven.
+        """
+        matriz = np.asarray(matriz, dtype=np.float32)
+        with self.lock:
+            nuevos, filas = [], []
+            siguiente = (0 if self._base is None else len(self._base)) + len(self._extra)
+            for nodo, vector in zip(nodos, matriz):
+                if nodo not in self._filas:
+                    self._filas[nodo] = siguiente + len(nuevos)
+                    nuevos.append(nodo)
+                    filas.append(vector)
+            if not nuevos:
+                return
+            filas = np.stack(filas)
+            self._extra.extend(filas)
+            if self._base is not None and self._firma == firma_pesos(self.model_path):
+                self._escribir_registro(nuevos, filas)
+
+    def _escribir_registro(self, nodos, filas):
+        if self._archivos is None:
+            nuevo = not os.path.exists(self.extra_keys_path)
+            self._archivos = (open(self.extra_data_path, "ab"), open(self.extra_keys_path, "ab"))
+            if nuevo:
+                cabecera = {"firma": self._firma, "filas": len(self._base)}
+                self._archivos[1].write((json.dumps(cabecera) + "\n").encode("utf-8"))
+        datos, claves = self._archivos
+        datos.write(filas.tobytes())
+        claves.write("".join(json.dumps(nodo, ensure_ascii=False) + "\n" for nodo in nodos).encode("utf-8"))
+        datos.flush()  # Las filas antes que sus claves: una clave nunca apunta a una fila que no existe
+        claves.flush()
+
+    def matrix(self):
+        """📌 Matriz completa `(n_nodos, dim)`, en el orden de `nodes` (copia si hay filas añadidas)."""
+        with self.lock:
+            if not len(self._extra):
+                return self._base
+            if self._base is None:
+                return self._extra.view()
+            return np.concatenate([self._base, self._extra.view()])
+
+    def get(self, nodo):
+        """📌 Embedding de `nodo`, o `None` si no está en la tabla."""
+        fila = self._filas.get(nodo)
+        return None if fila is None else self.get_many([nodo])[0]
+
+    def get_many(self, nodos):
+        """📌 Embeddings de `nodos` (todos deben estar en la tabla), en el mismo orden; sin concatenar la tabla."""
+        with self.lock:
+            filas = np.array([self._filas[nodo] for nodo in nodos], dtype=np.int64)
+            n_base = 0 if self._base is None else len(self._base)
+            extra = self._extra.view()
+            dim = self._base.shape[1] if self._base is not None else extra.shape[1]
+            resultado = np.empty((len(filas), dim), dtype=np.float32)
+            en_base = filas < n_base
+            if en_base.any():
+                resultado[en_base] = self._base[filas[en_base]]
+            if not en_base.all():
+                resultado[~en_base] = extra[filas[~en_base] - n_base]
+            return resultado
+
+    def save(self):
+        """💾 Asegura en disco las filas añadidas (el registro ya está escrito; solo falta `fsync`)."""
+        with self.lock:
+            if self._archivos is not None:
+                for file in self._archivos:
+                    file.flush()
+                    os.fsync(file.fileno())
+
+    def compact(self):
+        """
+        💾 Integra el registro de filas añadidas en la tabla principal (la reescribe de forma atómica).
+        - No hace nada si entretanto cambiaron los pesos: esas filas ya no sirven.
+        """
+        if len(self._extra) and self._base is not None and self._firma == firma_pesos(self.model_path):
+            nodos = self.nodes
+            self.write(nodos, self.get_many(nodos), self._firma)
+
+    def close(self):
+        """📌 Compacta las filas pendientes, cierra el registro y deja de actuar al salir."""
+        self.compact()
+        with self.lock:
+            self._cerrar_registro()
+        atexit.unregister(self.close)
@@ -1,19 +1,21 @@
 import tensorflow as tf
 from tensorflow.keras.models import Model
-from tensorflow.keras.layers import Dense, Dropout
-from spektral.layers import GCNConv, GlobalSumPool
+from tensorflow.keras.layers import Dense, Layer
+from spektral.layers import GCNConv
 from spektral.data import Graph, Dataset
-from spektral.data.loaders import DisjointLoader
 import networkx as nx
 import numpy as np
 from scipy.sparse import coo_matrix
 
+from config.hyperparameters import Hyperparameters
+from learning.link_prediction import DECODERS, aristas_positivas, pares_de_entrenamiento
+from learning.sampling import NeighborSampler
+from learning.sparse_graph import grafo_a_coo
+
 
 # 📌 Configuración de la GNN
 N_HIDDEN = 32
-N_LABELS = 1
 LEARNING_RATE = 0.01
-BATCH_SIZE = 1
 EPOCHS = 50
 
 
@@ -29,34 +31,126 @@ class CustomGCNConv(GCNConv):
         return feature_shape  # 🔥 La salida tiene la misma forma que la entrada
 
 
-def construir_modelo(input_dim):
+class EdgeDecoder(Layer):
     """
-    📌 Construye y devuelve una instancia del modelo GNN.
+    📌 Decoder de aristas: `[Z, pares] → probabilidad de arista` para cada par `(i, j)`.
+    - `dot`: `σ(z_i · z_j)`, sin pesos propios.
+    - `mlp`: capa oculta sobre `z_i ⊙ z_j` (simétrico en los dos nodos).
+    - `learning.link_prediction.puntuar_pares` hace el mismo cálculo en NumPy para la inferencia.
+    """
+    def __init__(self, decoder="dot", hidden=N_HIDDEN, **kwargs):
+        super().__init__(**kwargs)
+        if decoder not in DECODERS:
+            raise ValueError(f"❌ Decoder desconocido: {decoder!r} (opciones: {', '.join(DECODERS)})")
+        self.decoder = decoder
+        self.hidden = hidden
+        if decoder == "mlp":
+            self.oculta = Dense(hidden, activation="relu")
+            self.salida = Dense(1)
+
+    def call(self, inputs):
+        Z, pares = inputs
+        z1 = tf.gather(Z, pares[:, 0])
+        z2 = tf.gather(Z, pares[:, 1])
+        if self.decoder == "dot":
+            logits = tf.reduce_sum(z1 * z2, axis=-1)
+        else:
+            logits = tf.squeeze(self.salida(self.oculta(z1 * z2)), axis=-1)
+        return tf.sigmoid(logits)
+
+    def get_config(self):
+        return {**super().get_config(), "decoder": self.decoder, "hidden": self.hidden}
+
+
+def construir_modelo(input_dim, decoder=None):
+    """
+    📌 Construye y devuelve una instancia del modelo GNN de predicción de enlaces.
+    - Entradas: `[X, A, pares]`; salida: probabilidad de arista para cada par.
+    - El codificador son dos `CustomGCNConv`; la segunda capa (`embeddings`) da el embedding de cada nodo.
     """
     inputs_x = tf.keras.Input(shape=(input_dim,))
     inputs_a = tf.keras.Input(shape=(None, None), sparse=True)
-    inputs_i = tf.keras.Input(shape=(None,), dtype=tf.int64)
+    inputs_pares = tf.keras.Input(shape=(2,), dtype=tf.int64)
 
     x = CustomGCNConv(N_HIDDEN, activation="relu")([inputs_x, inputs_a])
-    x = CustomGCNConv(N_HIDDEN, activation="relu")([x, inputs_a])
-    x = GlobalSumPool()([x, inputs_i])
-    x = Dropout(0.5)(x)
-    outputs = Dense(N_LABELS, activation="sigmoid")(x)
-
-    model = Model(inputs=[inputs_x, inputs_a, inputs_i], outputs=outputs)
-    model.compile(optimizer=tf.keras.optimizers.Adam(LEARNING_RATE),
-                  loss="binary_crossentropy", metrics=["accuracy"])
+    x = CustomGCNConv(N_HIDDEN, name="embeddings")([x, inputs_a])
+    outputs = EdgeDecoder(decoder or Hyperparameters.GNN_DECODER, name="decoder")([x, inputs_pares])
+
+    model = Model(inputs=[inputs_x, inputs_a, inputs_pares], outputs=outputs)
+    model.compile(optimizer=tf.keras.optimizers.Adam(LEARNING_RATE), loss="binary_crossentropy")
     return model
 
 
+def modelo_de_embeddings(model):
+    """
+    📌 Devuelve un sub-modelo `[X, A] → embeddings de nodo` que comparte pesos con `model`.
+    - Permite calcular los embeddings de todos los nodos en una sola pasada.
+    """
+    return Model(inputs=model.inputs[:2], outputs=model.get_layer("embeddings").output)
+
+
+def calcular_embeddings(embedding_model, grafo, get_embedding, get_embeddings=None):
+    """
+    📌 Embeddings de todos los nodos de `grafo` con una única pasada de la GNN.
+    - Devuelve `(nodos, matriz)` con una fila por nodo.
+    """
+    nodos = list(grafo.nodes)
+    if not nodos:
+        return nodos, np.zeros((0, N_HIDDEN), dtype=np.float32)
+    dataset_graph = grafo_para_gnn(grafo, get_embedding, get_embeddings)
+    X = tf.convert_to_tensor(dataset_graph.x, dtype=tf.float32)
+    A = a_sparse_tensor(dataset_graph.a)
+    return nodos, np.asarray(embedding_model([X, A], training=False), dtype=np.float32)
+
+
+def inferir_embeddings(embedding_model, memory_manager, get_embeddings, nodos, batch_size=None, fanouts=None):
+    """
+    📌 Embeddings de algunos nodos, por micro-lotes de vecindarios muestreados (sin recorrer el grafo completo).
+    - Cada micro-lote pasa por la GNN una vez; se toman las filas de sus semillas.
+    """
+    nodos = list(nodos)
+    sampler = NeighborSampler(memory_manager, get_embeddings, batch_size=batch_size, fanouts=fanouts, shuffle=False)
+    bloques = []
+    for inicio in range(0, len(nodos), sampler.batch_size):
+        lote = sampler.sample(nodos[inicio:inicio + sampler.batch_size])
+        Z = embedding_model([tf.convert_to_tensor(lote.x), a_sparse_tensor(lote.a)], training=False)
+        bloques.append(np.asarray(Z, dtype=np.float32)[:lote.n_semillas])
+    return np.concatenate(bloques) if bloques else np.zeros((0, N_HIDDEN), dtype=np.float32)
+
+
+def pesos_decoder(model):
+    """📌 `(decoder, pesos)` del `EdgeDecoder` de `model`, como arrays de NumPy para `puntuar_pares`."""
+    capa = model.get_layer("decoder")
+    return capa.decoder, [np.asarray(w) for w in capa.get_weights()]
+
+
+def a_sparse_tensor(A):
+    """
+    📌 Convierte una matriz de adyacencia (densa o dispersa de SciPy) en un `tf.SparseTensor` ordenado.
+    """
+    if isinstance(A, tf.SparseTensor):
+        return tf.sparse.reorder(A)
+    if isinstance(A, np.ndarray):
+        A = coo_matrix(A)  # Convertir `A` en matriz dispersa
+    A = A.tocoo()
+    A = tf.sparse.SparseTensor(
+        indices=np.array([A.row, A.col]).T,
+        values=A.data.astype(np.float32),
+        dense_shape=A.shape
+    )
+    return tf.sparse.reorder(A)  # 🔥 IMPORTANTE: Reordenar `SparseTensor`
+
+
 class CEREBRODataset(Dataset):
     """
     📌 Dataset personalizado para Spektral.
     Convierte el grafo de CEREBRO en un formato compatible con Spektral.
+    - `get_embeddings` (opcional) calcula los embeddings de todos los nodos en lote.
     """
-    def __init__(self, memory_manager, get_embedding, **kwargs):
+    def __init__(self, memory_manager, get_embedding, get_embeddings=None, **kwargs):
         self.memory_manager = memory_manager  # ✅ Ahora es un `MemoryManager`
         self.get_embedding = get_embedding
+        self.get_embeddings = get_embeddings
         super().__init__(**kwargs)
 
     def read(self):
@@ -68,58 +162,103 @@ class CEREBRODataset(Dataset):
         """
         📌 Convierte un grafo de NetworkX a un formato compatible con Spektral.
         """
-        nodos = list(grafo.nodes)
-        if not nodos:
-            raise ValueError("❌ Error: El grafo está vacío, no se puede convertir.")
+        return grafo_para_gnn(grafo, self.get_embedding, self.get_embeddings)
+
+
+def grafo_para_gnn(grafo, get_embedding, get_embeddings=None):
+    """
+    📌 `Graph` de Spektral con las features (`x`) y la adyacencia dispersa (`a`) de `grafo`.
+    - No necesita un `Dataset`: sirve también para inferencia.
+    """
+    nodos = list(grafo.nodes)
+    if not nodos:
+        raise ValueError("❌ Error: El grafo está vacío, no se puede convertir.")
 
-        nodo_a_idx = {nodo: idx for idx, nodo in enumerate(nodos)}
-        X = np.array([self.get_embedding(nodo) for nodo in nodos])
+    if get_embeddings is not None:
+        X = np.array(get_embeddings(nodos))  # 🔥 Un único `nlp.pipe` para todos los nodos
+    else:
+        X = np.array([get_embedding(nodo) for nodo in nodos])
 
-        # 🔥 Convertimos a matriz dispersa en formato COO
-        A = nx.to_numpy_array(grafo, nodelist=nodos, dtype=np.float32)
-        A_sparse = coo_matrix(A)
+    # 🔥 Matriz dispersa COO directamente desde las aristas (con su `peso`), sin pasar por la densa
+    A_sparse = grafo_a_coo(grafo, nodos)
 
-        return Graph(x=X, a=A_sparse)
+    return Graph(x=X, a=A_sparse)
 
 
+def _paso_enlaces(model, X, A, rng):
+    """
+    📌 Un paso de entrenamiento de predicción de enlaces sobre un grafo (completo o muestreado).
+    - Positivos: las aristas de `A`; negativos: `Hyperparameters.GNN_NEGATIVE_RATIO` pares sin arista por cada una.
+    - Devuelve la pérdida (entropía cruzada binaria) o `None` si el grafo no tiene aristas.
+    """
+    positivos = aristas_positivas(A)
+    if len(positivos) == 0:
+        return None
+    pares, etiquetas = pares_de_entrenamiento(A.shape[0], positivos, Hyperparameters.GNN_NEGATIVE_RATIO, rng)
+    X = tf.convert_to_tensor(X, dtype=tf.float32)
+    A = a_sparse_tensor(A)
+    with tf.GradientTape() as tape:
+        probabilidades = model([X, A, tf.convert_to_tensor(pares)], training=True)
+        perdida = tf.reduce_mean(tf.keras.losses.binary_crossentropy(etiquetas[:, None], probabilidades[:, None]))
+    gradientes = tape.gradient(perdida, model.trainable_variables)
+    model.optimizer.apply_gradients(zip(gradientes, model.trainable_variables))
+    return float(perdida)
 
 
-def entrenar_gnn(memory_manager, get_embedding):
+def _entrenar_enlaces(model, lotes, epochs, callbacks, pasos):
     """
-    📌 Entrena la GNN asegurando la conversión correcta de los grafos.
+    📌 Bucle de épocas común a los dos modos de entrenamiento.
+    - `lotes()` genera los `(X, A)` de una época; `callbacks` reciben los eventos como con `model.fit`.
     """
-    dataset = CEREBRODataset(memory_manager, get_embedding)  # ✅ Pasamos `MemoryManager`
-    
-    sample_graph = dataset.read()[0]  # ✅ Tomamos un grafo convertido
-    model = construir_modelo(sample_graph.x.shape[1])  # 📌 Usa la dimensión correcta
+    rng = np.random.default_rng()
+    lista_callbacks = tf.keras.callbacks.CallbackList(callbacks, model=model, epochs=epochs, steps=pasos)
+    lista_callbacks.on_train_begin()
+    for epoca in range(epochs):
+        lista_callbacks.on_epoch_begin(epoca)
+        perdidas = []
+        for paso, (X, A) in enumerate(lotes()):
+            lista_callbacks.on_train_batch_begin(paso)
+            perdida = _paso_enlaces(model, X, A, rng)
+            if perdida is not None:
+                perdidas.append(perdida)
+            lista_callbacks.on_train_batch_end(paso, {"loss": perdida})
+        lista_callbacks.on_epoch_end(epoca, {"loss": float(np.mean(perdidas)) if perdidas else None})
+    lista_callbacks.on_train_end()
+    return model
 
-    loader = DisjointLoader(dataset, batch_size=BATCH_SIZE, shuffle=True)
-    
-    print(f"🏋️ Iniciando entrenamiento...")
 
-    for batch in loader:
-        if not isinstance(batch, (tuple, list)) or len(batch) != 3:
-            raise ValueError(f"❌ Error: Formato de batch inesperado, recibió {type(batch)}")
-        
-        X, A, I = batch
+def entrenar_gnn(memory_manager, get_embedding, get_embeddings=None, callbacks=None, model=None, epochs=EPOCHS):
+    """
+    📌 Entrena la GNN para predecir enlaces sobre el grafo completo.
+    - Cada época vuelve a muestrear los negativos.
+    - `callbacks` reciben los eventos de época (p. ej. para informar del progreso).
+    - Con `model` se parte de un modelo ya entrenado (ajuste fino) en lugar de uno nuevo.
+    """
+    grafo = CEREBRODataset(memory_manager, get_embedding, get_embeddings)[0]  # ✅ Pasamos `MemoryManager` (se convierte una vez)
+    if model is None:
+        model = construir_modelo(grafo.x.shape[1])  # 📌 Usa la dimensión correcta
 
-        # 🔥 🔥 **Aquí convertimos `A` a `SparseTensor` correctamente**
-        if isinstance(A, np.ndarray):
-            A = coo_matrix(A)  # Convertir `A` en matriz dispersa
+    print(f"🏋️ Iniciando entrenamiento: {grafo.x.shape[0]} nodos, {len(aristas_positivas(grafo.a))} aristas")
+    _entrenar_enlaces(model, lambda: [(grafo.x, grafo.a)], epochs, callbacks, pasos=1)
 
-        if not isinstance(A, tf.SparseTensor):
-            A = tf.sparse.SparseTensor(
-                indices=np.array([A.row, A.col]).T,
-                values=A.data.astype(np.float32),
-                dense_shape=A.shape
-            )
+    print("✅ GNN entrenada con éxito")
+    return model
 
-        A = tf.sparse.reorder(A)  # 🔥 IMPORTANTE: Reordenar `SparseTensor`
 
-        # 🔥 Debug antes de entrenar
-        print(f"📌 Debug - Batch: X.shape={X.shape}, A.shape={A.dense_shape}, I.shape={I.shape}")
+def entrenar_gnn_por_lotes(memory_manager, get_embeddings, callbacks=None, model=None, epochs=EPOCHS,
+                           batch_size=None, fanouts=None):
+    """
+    📌 Entrena la misma GNN (`CustomGCNConv`) con mini-lotes de vecindarios muestreados.
+    - La memoria usada depende de `batch_size` y `fanouts`, no del tamaño del grafo.
+    - Los positivos son las aristas muestreadas del lote y los negativos se sortean entre sus nodos.
+    - `callbacks` reciben los eventos de época como con `model.fit`.
+    """
+    sampler = NeighborSampler(memory_manager, get_embeddings, batch_size=batch_size, fanouts=fanouts)
+    if model is None:
+        model = construir_modelo(Hyperparameters.GNN_INPUT_DIM)
 
-        model.fit([X, A, I], epochs=EPOCHS, steps_per_epoch=loader.steps_per_epoch)
+    print(f"🏋️ Entrenamiento por mini-lotes: {len(sampler)} lotes/época, ≤ {sampler.max_batch_nodes} nodos por lote")
+    _entrenar_enlaces(model, lambda: iter(sampler), epochs, callbacks, pasos=len(sampler))
 
-    print("✅ GNN entrenada con éxito")
+    print("✅ GNN entrenada con éxito (mini-lotes)")
     return model
@@ -0,0 +1,111 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from config.settings import Settings
+
+_CERRAR = object()  # Marca de fin para el hilo de trabajo
+
+
+class InferenceBatcher:
+    """
+    📌 Agrupa peticiones concurrentes al `Predictor` en lotes.
+    - Las peticiones (`embedding` o `prediccion`) se encolan y devuelven un `Future` al momento.
+    - Un único hilo espera como mucho `Settings.INFERENCE_MAX_WAIT_MS` ms o `Settings.INFERENCE_MAX_BATCH`
+      peticiones y las resuelve con una llamada por tipo (`get_embeddings` / `predict_relationships`).
+    - Ese hilo es el único que toca el `Predictor`: no hace falta que el modelo sea seguro entre hilos.
+    - Desde hilos: `predict_relationship(...)` bloquea; desde asyncio: `await apredict_relationship(...)`.
+    """
+
+    def __init__(self, predictor, max_batch=None, max_wait_ms=None):
+        self.predictor = predictor
+        self.max_batch = max_batch or Settings.INFERENCE_MAX_BATCH
+        self.max_wait = (Settings.INFERENCE_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000.0
+        self._cola = queue.Queue()
+        self._cerrado = False
+        self._lock = threading.Lock()  # Comprobar `_cerrado` y encolar van juntos: nada entra tras `_CERRAR`
+        self.lotes = 0  # Lotes resueltos (para métricas)
+        self.peticiones = 0
+        self._hilo = threading.Thread(target=self._trabajar, name="inference-batcher", daemon=True)
+        self._hilo.start()
+
+    def _encolar(self, tipo, args):
+        futuro = Future()
+        with self._lock:
+            if self._cerrado:
+                raise RuntimeError("❌ El agrupador de inferencia está cerrado.")
+            self._cola.put((tipo, args, futuro))
+        return futuro
+
+    def submit_embedding(self, nodo):
+        """📌 Pide el embedding de `nodo`; devuelve un `Future` con el vector (o `None` si el nodo no existe)."""
+        return self._encolar("embedding", nodo)
+
+    def submit_prediction(self, nodo1, nodo2):
+        """📌 Pide la probabilidad de relación entre dos nodos; devuelve un `Future`."""
+        return self._encolar("prediccion", (nodo1, nodo2))
+
+    def get_embedding(self, nodo, timeout=None):
+        return self.submit_embedding(nodo).result(timeout)
+
+    def predict_relationship(self, nodo1, nodo2, timeout=None):
+        return self.submit_prediction(nodo1, nodo2).result(timeout)
+
+    async def aget_embedding(self, nodo):
+        return await asyncio.wrap_future(self.submit_embedding(nodo))
+
+    async def apredict_relationship(self, nodo1, nodo2):
+        return await asyncio.wrap_future(self.submit_prediction(nodo1, nodo2))
+
+    def _recoger(self, primera):
+        """📌 Junta peticiones hasta llenar el lote o agotar la espera desde la primera."""
+        lote = [primera]
+        limite = time.monotonic() + self.max_wait
+        while len(lote) < self.max_batch:
+            restante = limite - time.monotonic()
+            try:
+                peticion = self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait()
+            except queue.Empty:
+                break
+            if peticion is _CERRAR:
+                self._cola.put(_CERRAR)  # Se atiende tras resolver este lote
+                break
+            lote.append(peticion)
+        return lote
+
+    def _trabajar(self):
+        """🔄 Bucle del hilo de trabajo."""
+        while True:
+            peticion = self._cola.get()
+            if peticion is _CERRAR:
+                return
+            lote = self._recoger(peticion)
+            self.lotes += 1
+            self.peticiones += len(lote)
+            self._resolver([p for p in lote if p[0] == "embedding"], self.predictor.get_embeddings)
+            self._resolver([p for p in lote if p[0] == "prediccion"], self.predictor.predict_relationships)
+
+    @staticmethod
+    def _resolver(peticiones, calcular):
+        """📌 Una llamada a `calcular` para todo el grupo; un error falla solo los futuros de ese grupo."""
+        peticiones = [p for p in peticiones if p[2].set_running_or_notify_cancel()]
+        if not peticiones:
+            return
+        try:
+            resultados = calcular([args for _, args, _ in peticiones])
+        except Exception as e:
+            for _, _, futuro in peticiones:
+                futuro.set_exception(e)
+            return
+        for (_, _, futuro), resultado in zip(peticiones, resultados):
+            futuro.set_result(resultado)
+
+    def close(self, timeout=None):
+        """📌 Resuelve las peticiones pendientes y detiene el hilo de trabajo."""
+        with self._lock:
+            if not self._cerrado:
+                self._cerrado = True
+                self._cola.put(_CERRAR)
+        self._hilo.join(timeout)
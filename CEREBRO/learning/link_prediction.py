@@ -0,0 +1,97 @@
+import numpy as np
+
+DECODERS = ("dot", "mlp")
+
+
+def aristas_positivas(A):
+    """
+    📌 Aristas del grafo como pares de índices `(i, j)` con `i < j` (sin bucles ni duplicados).
+    - `A` es la matriz de adyacencia dispersa (simétrica) de `grafo_a_coo` o de un `Lote` muestreado.
+    """
+    A = A.tocoo()
+    mascara = A.row < A.col
+    pares = np.stack([A.row[mascara], A.col[mascara]], axis=1).astype(np.int64)
+    return np.unique(pares, axis=0) if len(pares) else pares.reshape(0, 2)
+
+
+def muestrear_negativos(n_nodos, positivos, n_muestras, rng=None, max_intentos=10):
+    """
+    📌 Muestreo vectorizado de pares de nodos que NO son aristas.
+    - Se sortean pares en bloque y se descartan bucles y aristas existentes con `np.isin`
+      sobre claves `i·n + j` ordenadas (no hay bucle de Python por par).
+    - Devuelve hasta `n_muestras` pares `(i, j)` con `i < j`; menos si el grafo es casi completo.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if n_nodos < 2 or n_muestras <= 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    positivos = np.asarray(positivos, dtype=np.int64).reshape(-1, 2)
+    existentes = np.unique(np.minimum(positivos[:, 0], positivos[:, 1]) * n_nodos + np.maximum(positivos[:, 0], positivos[:, 1]))
+
+    elegidos = np.zeros(0, dtype=np.int64)
+    for _ in range(max_intentos):
+        faltan = n_muestras - len(elegidos)
+        if faltan <= 0:
+            break
+        a = rng.integers(0, n_nodos, size=2 * faltan)
+        b = rng.integers(0, n_nodos, size=2 * faltan)
+        claves = np.minimum(a, b) * n_nodos + np.maximum(a, b)
+        claves = np.concatenate([elegidos, claves[(a != b) & ~np.isin(claves, existentes)]])
+        _, primeras = np.unique(claves, return_index=True)
+        elegidos = claves[np.sort(primeras)]  # Sin repetidos, en orden de sorteo (no sesgado hacia índices bajos)
+    elegidos = elegidos[:n_muestras]
+    return np.stack([elegidos // n_nodos, elegidos % n_nodos], axis=1)
+
+
+def pares_de_entrenamiento(n_nodos, positivos, ratio=1, rng=None):
+    """
+    📌 Pares y etiquetas para una época: todas las aristas (1) y `ratio` negativos por arista (0).
+    """
+    negativos = muestrear_negativos(n_nodos, positivos, int(len(positivos) * ratio), rng)
+    pares = np.concatenate([positivos, negativos]).astype(np.int64)
+    etiquetas = np.concatenate([np.ones(len(positivos), dtype=np.float32), np.zeros(len(negativos), dtype=np.float32)])
+    return pares, etiquetas
+
+
+def sigmoide(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def puntuar_pares(Z1, Z2, decoder="dot", pesos=None):
+    """
+    📌 Probabilidad de arista entre filas de `Z1` y `Z2` (embeddings de nodo), en NumPy.
+    - `dot`: `σ(z1 · z2)`.
+    - `mlp`: `σ(W2 · relu(W1 · (z1 ⊙ z2) + b1) + b2)` con `pesos = [W1, b1, W2, b2]` (simétrico en los dos nodos).
+    - Es el mismo cálculo que la capa `EdgeDecoder` del modelo, sin pasar por TensorFlow.
+    """
+    Z1 = np.atleast_2d(np.asarray(Z1, dtype=np.float32))
+    Z2 = np.atleast_2d(np.asarray(Z2, dtype=np.float32))
+    if decoder == "dot":
+        return sigmoide(np.einsum("ij,ij->i", Z1, Z2))
+    if decoder == "mlp":
+        W1, b1, W2, b2 = pesos
+        oculta = np.maximum((Z1 * Z2) @ W1 + b1, 0.0)
+        return sigmoide(oculta @ W2 + b2)[:, 0]
+    raise ValueError(f"❌ Decoder desconocido: {decoder!r} (opciones: {', '.join(DECODERS)})")
+
+
+def puntuar_bloque(Z1, Z2, decoder="dot", pesos=None, max_elementos=1 << 24):
+    """
+    📌 Matriz `(len(Z1), len(Z2))` con la probabilidad de arista de cada fila de `Z1` con cada fila de `Z2`.
+    - `dot`: una multiplicación de matrices.
+    - `mlp`: se recorre `Z2` por trozos para no crear más de `max_elementos` valores de `z1 ⊙ z2` a la vez.
+    - Da lo mismo que `puntuar_pares` sobre todos los pares.
+    """
+    Z1 = np.atleast_2d(np.asarray(Z1, dtype=np.float32))
+    Z2 = np.atleast_2d(np.asarray(Z2, dtype=np.float32))
+    if decoder == "dot":
+        return sigmoide(Z1 @ Z2.T)
+    if decoder == "mlp":
+        W1, b1, W2, b2 = pesos
+        paso = max(1, max_elementos // max(1, len(Z1) * Z1.shape[1]))
+        resultado = np.empty((len(Z1), len(Z2)), dtype=np.float32)
+        for inicio in range(0, len(Z2), paso):
+            producto = Z1[:, None, :] * Z2[None, inicio:inicio + paso, :]
+            oculta = np.maximum(producto @ W1 + b1, 0.0)
+            resultado[:, inicio:inicio + paso] = sigmoide(oculta @ W2 + b2)[..., 0]
+        return resultado
+    raise ValueError(f"❌ Decoder desconocido: {decoder!r} (opciones: {', '.join(DECODERS)})")
@@ -1,66 +1,269 @@
 import numpy as np
-from learning.gnn_model import entrenar_gnn
-import tensorflow as tf
+from learning.ann_index import IVFIndex
+from learning.embedding_table import EmbeddingTable, FilasCrecientes
+from learning.gnn_model import calcular_embeddings, construir_modelo, inferir_embeddings, modelo_de_embeddings, pesos_decoder
+from learning.link_prediction import puntuar_bloque, puntuar_pares
 
+from config.hyperparameters import Hyperparameters
+from config.settings import Settings
 from core.memory_manager import MemoryManager
 from core.consciousness_engine import ConsciousnessEngine
+from core.graph_registry import get_memory_manager, get_consciousness_engine
 
-MODEL_PATH = "models/gnn_model.h5"
+MODEL_PATH = Settings.GNN_MODEL_PATH
 
 class Predictor:
     """
     📌 Predictor de nuevas relaciones en los grafos de CEREBRO.
     Usa Graph Neural Networks (GNNs) para inferir conexiones no existentes.
+    - Los embeddings de los nodos se leen de la tabla exportada tras el entrenamiento (`EmbeddingTable`);
+      sin tabla, se calculan en una sola pasada y se exportan.
+    - Los nodos que no están en la tabla se infieren por micro-lotes de vecindarios y se añaden a ella.
+    - Un índice IVF sobre esos embeddings resuelve las consultas de vecinos en tiempo sublineal.
+    - Los nodos nuevos añadidos con `MemoryManager.add_memory` se incorporan al índice en la siguiente consulta.
+    - `predict_relationship` aplica el decoder de aristas entrenado a los embeddings en caché (NumPy, sin pasar por la GNN).
+      Todas las probabilidades (`related_by_embedding`, `suggest_new_connections`) salen de ese mismo decoder.
     """
 
-    def __init__(self, memory_manager: MemoryManager, consciousness_engine: ConsciousnessEngine):
-        self.memory_manager = memory_manager
-        self.consciousness_engine = consciousness_engine
+    def __init__(self, memory_manager: MemoryManager = None, consciousness_engine: ConsciousnessEngine = None, get_features=None):
+        self.memory_manager = memory_manager if memory_manager is not None else get_memory_manager()
+        self.consciousness_engine = consciousness_engine if consciousness_engine is not None else get_consciousness_engine()
+        self.get_features = get_features  # texto → vector de entrada de la GNN (por defecto, spaCy)
+        self._get_features_batch = None  # Variante por lotes, si la función por defecto la ofrece
+        self.model_path = MODEL_PATH
         self.model = self.load_model()  # 🔥 Cargar modelo al inicializar
+        self.embedding_model = modelo_de_embeddings(self.model)
+        self.decoder, self.decoder_pesos = pesos_decoder(self.model)
+        self.tabla = EmbeddingTable(self.model_path)
+        self._embeddings = None  # Matriz (n_nodos, dim) calculada en lote
+        self._filas_emb = None  # `FilasCrecientes` que respalda `_embeddings`
+        self._nodo_a_idx = {}
+        self.ann = IVFIndex()
+        self._pendientes = []  # Nodos añadidos a la memoria que aún no están en `ann`
+        self.memory_manager.add_listener(self._on_memory_change)
 
-    def load_model(self):
+    def load_model(self, path=None):
         """
-        📌 Carga el modelo GNN entrenado desde el servicio.
+        📌 Carga el modelo GNN entrenado desde `MODEL_PATH`.
         """
-        model = entrenar_gnn(load_only=True)  # 🔥 Cargar sin reentrenar
-        model.load_weights(MODEL_PATH)
+        model = construir_modelo(Hyperparameters.GNN_INPUT_DIM)  # 🔥 Misma arquitectura, sin reentrenar
+        model.load_weights(path or MODEL_PATH)
         return model
 
+    def reload_weights(self, path=None):
+        """
+        📌 Sustituye en caliente el modelo por unos pesos recién entrenados.
+        - El modelo nuevo se carga aparte y se intercambia de una vez; los embeddings se recalculan.
+        """
+        model = self.load_model(path)
+        self.model, self.embedding_model = model, modelo_de_embeddings(model)
+        self.decoder, self.decoder_pesos = pesos_decoder(model)
+        self.model_path = path or MODEL_PATH
+        self.tabla.close()  # Guarda lo pendiente (solo si sigue valiendo para los pesos) y retira su guardado al salir
+        self.tabla = EmbeddingTable(self.model_path)
+        self.invalidate_embeddings()
+        print(f"🔄 Predictor actualizado con los pesos de {path or MODEL_PATH}.")
+
+    def _features(self):
+        """📌 Función de features de nodo; carga el motor NLP solo si no se inyectó otra."""
+        if self.get_features is None:
+            from externalities.nlp_engine import NLPEngine
+            nlp = NLPEngine()
+            self.get_features, self._get_features_batch = nlp.get_embedding, nlp.get_embeddings
+        return self.get_features
+
+    def _features_batch(self, nodos):
+        """📌 Features de varios nodos (en lote si la función de features lo permite)."""
+        get_features = self._features()
+        if self._get_features_batch is not None:
+            return self._get_features_batch(nodos)
+        return [get_features(nodo) for nodo in nodos]
+
+    def _inferir(self, nodos):
+        """📌 Embeddings de nodos que no están en la tabla, por micro-lotes de vecindarios muestreados."""
+        return inferir_embeddings(self.embedding_model, self.memory_manager, self._features_batch, nodos)
+
+    def _calcular_embeddings(self):
+        """
+        📌 Carga los embeddings de todos los nodos.
+        - Con una tabla válida para los pesos actuales, solo se infieren los nodos que falten.
+        - Si no, una única pasada de la GNN sobre el grafo completo, que se exporta como tabla.
+        """
+        if self.tabla.loaded or self.tabla.load():
+            nodos = self.memory_manager.nodes()
+            faltan = [nodo for nodo in nodos if nodo not in self.tabla]
+            if faltan:
+                self.tabla.append(faltan, self._inferir(faltan))
+                print(f"🔮 {len(faltan)} nodos nuevos inferidos y añadidos a la tabla de embeddings.")
+            self._embeddings = self.tabla.get_many(nodos) if nodos else np.zeros((0, 0), dtype=np.float32)
+        else:
+            nodos, self._embeddings = calcular_embeddings(self.embedding_model, self.memory_manager.get_graph(),
+                                                          self._features(), self._get_features_batch)
+            if nodos:
+                self.tabla.write(nodos, self._embeddings)
+            print(f"🔮 Embeddings calculados en lote para {len(nodos)} nodos.")
+        self._filas_emb = FilasCrecientes(self._embeddings)  # Los nodos nuevos se añaden sin copiar la matriz
+        self._embeddings = self._filas_emb.view()
+        self._nodo_a_idx = {nodo: idx for idx, nodo in enumerate(nodos)}
+        return nodos
+
+    def compute_embeddings(self):
+        """📌 Recalcula los embeddings de todos los nodos y reconstruye el índice de vecinos."""
+        nodos = self._calcular_embeddings()
+        self.ann.build(nodos, self._embeddings)
+        self._pendientes = []
+        return self._embeddings
+
+    def invalidate_embeddings(self):
+        """📌 Descarta la caché de embeddings (p. ej. tras cambiar el grafo o los pesos)."""
+        self._embeddings, self._filas_emb, self._nodo_a_idx = None, None, {}
+        self.ann = IVFIndex()
+        self._pendientes = []
+
+    def _on_memory_change(self, op, args):
+        """📌 Listener de `MemoryManager`: encola los nodos nuevos para el índice de vecinos."""
+        if op == "add_node" and self._embeddings is not None:
+            self._pendientes.append(args[0])
+
+    def _sincronizar_indice(self):
+        """
+        📌 Incorpora al índice los nodos pendientes.
+        - Solo se infieren los nodos nuevos (micro-lotes) y se añaden a la tabla; el resto del índice no se reconstruye.
+        """
+        if self._embeddings is None:
+            self.compute_embeddings()
+            return
+        if not self._pendientes:
+            return
+        pendientes, self._pendientes = self._pendientes, []
+        nuevos = [nodo for nodo in dict.fromkeys(pendientes) if nodo not in self._nodo_a_idx]
+        if not nuevos:
+            return
+        vectores = self._inferir(nuevos)
+        self.tabla.append(nuevos, vectores)  # 💾 Al final del registro de la tabla, sin reescribirla
+        self._filas_emb.extend(vectores)
+        self._embeddings = self._filas_emb.view()
+        for nodo, vector in zip(nuevos, vectores):
+            self._nodo_a_idx[nodo] = len(self._nodo_a_idx)
+            self.ann.add(nodo, vector)
+
+    def related_by_embedding(self, nodo, k=10, threshold=None):
+        """
+        📌 Conceptos que probablemente estén relacionados con `nodo`.
+        - Los `k` candidatos salen del índice de vecinos y se puntúan con el decoder de aristas (como `predict_relationship`).
+        - Devuelve `[(concepto, probabilidad)]` con `probabilidad >= threshold`, de mayor a menor probabilidad.
+        """
+        self._sincronizar_indice()
+        if nodo not in self.ann:
+            return []
+        vecinos = [vecino for vecino, _ in self.ann.query_key(nodo, k=k)]
+        if not vecinos:
+            return []
+        E = self._embeddings
+        probabilidades = puntuar_bloque(E[self._nodo_a_idx[nodo]], E[[self._nodo_a_idx[v] for v in vecinos]],
+                                        self.decoder, self.decoder_pesos)[0]
+        relacionados = [(vecino, round(float(p), 4)) for vecino, p in zip(vecinos, probabilidades)
+                        if threshold is None or p >= threshold]
+        return sorted(relacionados, key=lambda x: x[1], reverse=True)
+
     def predict_relationship(self, nodo1, nodo2):
         """
         📌 Predice la probabilidad de que exista una relación entre dos nodos.
+        - Una sola llamada al decoder de aristas sobre los embeddings en caché.
         """
-        if nodo1 not in self.memory_manager.graph or nodo2 not in self.memory_manager.graph:
+        if not self.memory_manager.has_node(nodo1) or not self.memory_manager.has_node(nodo2):
             return 0.0  # No hay datos para hacer la predicción
 
         emb1 = self.get_embedding(nodo1)
         emb2 = self.get_embedding(nodo2)
+        probabilidad = puntuar_pares(emb1, emb2, self.decoder, self.decoder_pesos)[0]
 
-        distancia = np.linalg.norm(emb1 - emb2)
-        probabilidad = 1 / (1 + distancia)  # Inversa de la distancia como probabilidad
+        return round(float(probabilidad), 4)
 
-        return round(probabilidad, 4)
+    def predict_relationships(self, pares):
+        """📌 `predict_relationship` para muchos pares `(nodo1, nodo2)` con una única llamada vectorizada al decoder."""
+        pares = list(pares)
+        if not pares:
+            return []
+        self._sincronizar_indice()
+        conocidos = [self._nodo_a_idx.get(a) is not None and self._nodo_a_idx.get(b) is not None for a, b in pares]
+        validos = [par for par, ok in zip(pares, conocidos) if ok]
+        probabilidades = iter([])
+        if validos:
+            i = np.array([self._nodo_a_idx[a] for a, _ in validos])
+            j = np.array([self._nodo_a_idx[b] for _, b in validos])
+            probabilidades = iter(puntuar_pares(self._embeddings[i], self._embeddings[j], self.decoder, self.decoder_pesos).tolist())
+        return [round(next(probabilidades), 4) if ok else 0.0 for ok in conocidos]
 
     def get_embedding(self, nodo):
         """
-        📌 Obtiene el embedding de un nodo en la GNN.
+        📌 Obtiene el embedding de un nodo en la GNN (desde la caché calculada en lote).
         """
-        features = np.array([self.memory_manager.get_node_features(nodo)])
-        emb = self.model.predict(features)[0]
-        return emb
+        if self._embeddings is None or nodo not in self._nodo_a_idx:
+            self._sincronizar_indice()
+        if nodo not in self._nodo_a_idx:
+            self.compute_embeddings()  # Nodo añadido sin pasar por `MemoryManager`
+        return self._embeddings[self._nodo_a_idx[nodo]]
+
+    def get_embeddings(self, nodos):
+        """📌 Embeddings de varios nodos con una sola sincronización del índice (`None` para los que no existen)."""
+        nodos = list(nodos)
+        self._sincronizar_indice()
+        if any(nodo not in self._nodo_a_idx and self.memory_manager.has_node(nodo) for nodo in nodos):
+            self.compute_embeddings()  # Nodos añadidos sin pasar por `MemoryManager`
+        return [self._embeddings[self._nodo_a_idx[nodo]] if nodo in self._nodo_a_idx else None for nodo in nodos]
+
+    def suggest_new_connections(self, threshold=0.75, block_size=None, exact=None):
+        """
+        📌 Busca pares de nodos con alta probabilidad de conexión y los sugiere: `[(nodo1, nodo2, probabilidad)]`.
+        - La probabilidad es la del decoder de aristas, la misma que da `predict_relationship`.
+        - Con el índice IVF entrenado (grafos grandes) solo se puntúan, para cada nodo, sus
+          `Hyperparameters.ANN_SUGGEST_K` vecinos aproximados.
+        - `exact=True` fuerza el barrido exacto de todos los pares por bloques.
+        """
+        if threshold <= 0:
+            raise ValueError("❌ `threshold` debe ser positivo.")
+        self._sincronizar_indice()
+        if exact is None:
+            exact = not self.ann.trained
+        if exact:
+            return self._suggest_exact(threshold, block_size)
+
+        candidatos = set()
+        for nodo, i in self._nodo_a_idx.items():
+            for vecino, _ in self.ann.query_key(nodo, k=Hyperparameters.ANN_SUGGEST_K):
+                j = self._nodo_a_idx.get(vecino)
+                if j is not None:
+                    candidatos.add((min(i, j), max(i, j)))  # Cada par una sola vez
+        if not candidatos:
+            return []
+        pares = np.array(sorted(candidatos))
+        E = self._embeddings
+        probabilidades = puntuar_pares(E[pares[:, 0]], E[pares[:, 1]], self.decoder, self.decoder_pesos)
+        nodos = list(self._nodo_a_idx)
+        nuevas_conexiones = [(nodos[i], nodos[j], round(p, 4))
+                             for (i, j), p in zip(pares.tolist(), probabilidades.tolist()) if p >= threshold]
+        return sorted(nuevas_conexiones, key=lambda x: x[2], reverse=True)
 
-    def suggest_new_connections(self, threshold=0.75):
+    def _suggest_exact(self, threshold, block_size=None):
         """
-        📌 Busca pares de nodos con alta probabilidad de conexión y los sugiere.
+        📌 Barrido exacto de todos los pares por bloques de filas, puntuados con el decoder de aristas en NumPy.
+        - Cada bloque solo se compara con las columnas desde su primera fila (cada par una sola vez).
         """
-        nodos = list(self.memory_manager.graph.nodes)
+        nodos = list(self._nodo_a_idx)
+        E = self._embeddings
+        n = len(nodos)
+        block_size = block_size or Hyperparameters.GNN_PREDICT_BLOCK_SIZE
         nuevas_conexiones = []
 
-        for i, nodo1 in enumerate(nodos):
-            for nodo2 in nodos[i+1:]:
-                prob = self.predict_relationship(nodo1, nodo2)
-                if prob >= threshold:
-                    nuevas_conexiones.append((nodo1, nodo2, prob))
+        for inicio in range(0, n, block_size):
+            fin = min(inicio + block_size, n)
+            probabilidades = puntuar_bloque(E[inicio:fin], E[inicio:], self.decoder, self.decoder_pesos)
+            filas = np.arange(fin - inicio)[:, None]
+            columnas = np.arange(n - inicio)[None, :]
+            ii, jj = np.nonzero((probabilidades >= threshold) & (columnas > filas))
+            for i, j, prob in zip((ii + inicio).tolist(), (jj + inicio).tolist(), probabilidades[ii, jj].tolist()):
+                nuevas_conexiones.append((nodos[i], nodos[j], round(prob, 4)))
 
         return sorted(nuevas_conexiones, key=lambda x: x[2], reverse=True)
 
@@ -70,7 +273,7 @@ class Predictor:
         - Si `feedback` es positivo, refuerza la relación.
         - Si `feedback` es negativo, debilita la relación.
         """
-        if nodo1 not in self.memory_manager.graph or nodo2 not in self.memory_manager.graph:
+        if not self.memory_manager.has_node(nodo1) or not self.memory_manager.has_node(nodo2):
             return "⚠️ No se pueden reforzar relaciones que no existen en la memoria."
 
         ajuste = 0.1 if feedback == "positivo" else -0.1
@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+
+from config.hyperparameters import Hyperparameters
+
+Lote = namedtuple("Lote", ["nodos", "x", "a", "n_semillas"])
+
+
+class NeighborSampler:
+    """
+    📌 Cargador de mini-lotes por muestreo de vecinos (estilo GraphSAGE) sobre `MemoryManager`.
+    - Cada lote parte de `batch_size` nodos semilla y toma como mucho `fanouts[l]` vecinos por nodo en el salto `l`.
+    - El tamaño de un lote está acotado por `batch_size · (1 + f1 + f1·f2 + ...)`, sea cual sea el grafo.
+    - Los vecinos se eligen con `sample_neighbors`: con un grafo `.crbg` no se materializa ni se decodifican los descartados.
+    - Las features solo se calculan para los nodos del lote (`get_embeddings`, con caché).
+    """
+
+    def __init__(self, memory_manager, get_embeddings, batch_size=None, fanouts=None, shuffle=True, seed=None):
+        self.memory_manager = memory_manager
+        self.get_embeddings = get_embeddings
+        self.batch_size = batch_size or Hyperparameters.GNN_BATCH_SIZE
+        self.fanouts = tuple(Hyperparameters.GNN_SAMPLE_FANOUTS if fanouts is None else fanouts)
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.nodos = memory_manager.nodes()
+
+    def __len__(self):
+        """📌 Número de lotes por época."""
+        return -(-len(self.nodos) // self.batch_size)
+
+    @property
+    def max_batch_nodes(self):
+        """📌 Cota superior de nodos por lote."""
+        total, capa = 1, 1
+        for fanout in self.fanouts:
+            capa *= fanout
+            total += capa
+        return self.batch_size * total
+
+    def _vecinos(self, nodo, fanout):
+        """📌 Hasta `fanout` vecinos de `nodo`, elegidos al azar sin reemplazo."""
+        return self.memory_manager.sample_neighbors(nodo, fanout, self.rng)
+
+    def sample(self, semillas):
+        """
+        📌 Muestrea el vecindario de `semillas` y devuelve un `Lote`.
+        - Las semillas ocupan las primeras `n_semillas` filas de `x` y `a`.
+        - `a` es una matriz COO simétrica con los `peso` de las aristas muestreadas.
+        """
+        idx = {}
+        for nodo in semillas:
+            idx.setdefault(nodo, len(idx))
+        n_semillas = len(idx)
+        aristas = {}
+        capa = list(idx)
+        for fanout in self.fanouts:
+            siguiente = []
+            for nodo in capa:
+                for vecino, peso in self._vecinos(nodo, fanout):
+                    if vecino not in idx:
+                        idx[vecino] = len(idx)
+                        siguiente.append(vecino)
+                    i, j = idx[nodo], idx[vecino]
+                    aristas[(min(i, j), max(i, j))] = peso  # Una arista muestreada desde ambos lados cuenta una vez
+            capa = siguiente
+
+        nodos = list(idx)
+        n = len(nodos)
+        pares = np.array(list(aristas), dtype=np.int64).reshape(-1, 2)
+        pesos = np.fromiter(aristas.values(), dtype=np.float32, count=len(aristas))
+        reflejo = pares[:, 0] != pares[:, 1]
+        filas = np.concatenate([pares[:, 0], pares[reflejo, 1]])
+        columnas = np.concatenate([pares[:, 1], pares[reflejo, 0]])
+        a = coo_matrix((np.concatenate([pesos, pesos[reflejo]]), (filas, columnas)), shape=(n, n), dtype=np.float32)
+        x = np.asarray(self.get_embeddings(nodos), dtype=np.float32)
+        return Lote(nodos, x, a, n_semillas)
+
+    def batches(self):
+        """📌 Genera los `Lote` de una época (todas las semillas una vez)."""
+        orden = self.rng.permutation(len(self.nodos)) if self.shuffle else np.arange(len(self.nodos))
+        for inicio in range(0, len(orden), self.batch_size):
+            yield self.sample([self.nodos[i] for i in orden[inicio:inicio + self.batch_size].tolist()])
+
+    def __iter__(self):
+        """📌 Lotes de una época como `(X, A)`."""
+        for lote in self.batches():
+            yield lote.x, lote.a
@@ -0,0 +1,27 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+
+
+def grafo_a_coo(grafo, nodos=None, attr="peso", dtype=np.float32):
+    """
+    📌 Matriz de adyacencia dispersa (COO) construida directamente desde la lista de aristas.
+    - Nunca reserva la matriz densa N×N: la memoria es O(N + aristas).
+    - Conserva el atributo `attr` como valor de cada arista (1.0 si la arista no lo tiene).
+    - En grafos no dirigidos cada arista aparece en ambos sentidos, como en `nx.to_numpy_array`.
+    """
+    nodos = list(grafo.nodes) if nodos is None else list(nodos)
+    nodo_a_idx = {nodo: idx for idx, nodo in enumerate(nodos)}
+    n = len(nodos)
+
+    aristas = [(nodo_a_idx[u], nodo_a_idx[v], p) for u, v, p in grafo.edges(data=attr, default=1.0)
+               if u in nodo_a_idx and v in nodo_a_idx]
+    filas = np.fromiter((u for u, _, _ in aristas), dtype=np.int64, count=len(aristas))
+    columnas = np.fromiter((v for _, v, _ in aristas), dtype=np.int64, count=len(aristas))
+    pesos = np.fromiter((p for _, _, p in aristas), dtype=dtype, count=len(aristas))
+
+    if not grafo.is_directed():
+        reflejo = filas != columnas  # Los bucles (u, u) solo se cuentan una vez
+        filas, columnas = np.concatenate([filas, columnas[reflejo]]), np.concatenate([columnas, filas[reflejo]])
+        pesos = np.concatenate([pesos, pesos[reflejo]])
+
+    return coo_matrix((pesos, (filas, columnas)), shape=(n, n), dtype=dtype)
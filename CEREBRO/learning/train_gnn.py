@@ -1,29 +1,83 @@
 import os
 import networkx as nx
 import numpy as np
-from learning.gnn_model import entrenar_gnn
+from learning.embedding_table import EmbeddingTable
+from learning.gnn_model import (calcular_embeddings, construir_modelo, entrenar_gnn, entrenar_gnn_por_lotes,
+                                inferir_embeddings, modelo_de_embeddings)
 import tensorflow as tf
-from core.memory_manager import MemoryManager
+from config.hyperparameters import Hyperparameters
+from config.settings import Settings
+from core.graph_registry import get_memory_manager
 from externalities.nlp_engine import NLPEngine
+from learning.background_trainer import GraphSnapshot
+from learning.change_tracker import k_hop_subgraph
  # 🔥 Importamos el servicio sin clases
 
-def generate_model():
-    MODEL_PATH = "models/gnn_model.h5"
-    os.makedirs("models", exist_ok=True)
+def generate_model(memory=None, model_path=None, callbacks=None, incremental=False, changed_nodes=None):
+    """
+    📌 Entrena la GNN y guarda sus pesos.
+    - `memory` es un `MemoryManager` o cualquier objeto con `get_graph()`, `nodes()` y `get_related_concepts()`.
+    - Si el grafo supera `Hyperparameters.GNN_FULL_GRAPH_MAX_NODES`, se entrena por mini-lotes muestreados.
+    - Sin `incremental`, no hace nada si los pesos ya existen.
+    - Con `incremental`, parte de los pesos guardados y ajusta solo el vecindario de
+      `Hyperparameters.GNN_FINETUNE_HOPS` saltos de `changed_nodes`.
+    - Los pesos se escriben en un temporal y se renombran: nunca queda un archivo a medias.
+    - Después se exporta la tabla de embeddings de todos los nodos para esos pesos.
+    """
+    MODEL_PATH = model_path or Settings.GNN_MODEL_PATH
+    os.makedirs(os.path.dirname(MODEL_PATH) or ".", exist_ok=True)
 
-    if os.path.exists(MODEL_PATH):
+    existe = os.path.exists(MODEL_PATH)
+    if existe and not incremental:
         print(f"✅ Modelo GNN encontrado en {MODEL_PATH}, no es necesario regenerarlo.")
         return
-    
-    print("⚙️ Iniciando la generación del modelo GNN...")
 
     # 📚 Cargar memoria y NLP
-    memory = MemoryManager()  # ✅ Pasamos el objeto MemoryManager, no `graphs`
+    if memory is None:
+        memory = get_memory_manager()  # ✅ Grafo compartido del proceso, no una copia privada
     nlp = NLPEngine()
 
-    print("🏋️ Entrenando la GNN con los datos convertidos...")
-    model = entrenar_gnn(memory, nlp.get_embedding)  # ✅ Pasamos `memory`, no `graphs`
+    if existe:
+        grafo = memory.get_graph()
+        subgrafo = k_hop_subgraph(grafo, changed_nodes or (), Hyperparameters.GNN_FINETUNE_HOPS)
+        if subgrafo.number_of_nodes() == 0:
+            print("✅ Sin cambios en el grafo: el modelo GNN está al día.")
+            return
+        print(f"🔁 Ajuste fino de la GNN sobre {subgrafo.number_of_nodes()} de {grafo.number_of_nodes()} nodos...")
+        model = construir_modelo(Hyperparameters.GNN_INPUT_DIM)
+        model.load_weights(MODEL_PATH)  # 🔥 Arranque en caliente desde el último checkpoint
+        model = entrenar_gnn(GraphSnapshot(subgrafo), nlp.get_embedding, nlp.get_embeddings,
+                             callbacks=callbacks, model=model, epochs=Hyperparameters.GNN_FINETUNE_EPOCHS)
+    elif len(memory.nodes()) > Hyperparameters.GNN_FULL_GRAPH_MAX_NODES:
+        print("⚙️ Grafo demasiado grande para entrenarlo completo: se usan mini-lotes muestreados...")
+        model = entrenar_gnn_por_lotes(memory, nlp.get_embeddings, callbacks=callbacks)
+    else:
+        print("⚙️ Iniciando la generación del modelo GNN...")
+        print("🏋️ Entrenando la GNN con los datos convertidos...")
+        model = entrenar_gnn(memory, nlp.get_embedding, nlp.get_embeddings, callbacks=callbacks)  # ✅ Pasamos `memory`, no `graphs`
 
     # 📌 Guardar el modelo entrenado
-    model.save_weights(MODEL_PATH)
+    tmp_path = MODEL_PATH + ".tmp.h5"
+    model.save_weights(tmp_path)
+    os.replace(tmp_path, MODEL_PATH)
     print(f"✅ Modelo GNN guardado en {MODEL_PATH}")
+
+    exportar_tabla_embeddings(model, memory, nlp, MODEL_PATH)
+    nlp.embedding_cache.flush()
+
+
+def exportar_tabla_embeddings(model, memory, nlp, model_path):
+    """
+    💾 Exporta la tabla `nodo → embedding` de los pesos recién guardados (ver `EmbeddingTable`).
+    - El `Predictor` la lee en lugar de pasar el grafo por la GNN al arrancar.
+    """
+    embedding_model = modelo_de_embeddings(model)
+    if len(memory.nodes()) > Hyperparameters.GNN_FULL_GRAPH_MAX_NODES:
+        nodos = memory.nodes()
+        matriz = inferir_embeddings(embedding_model, memory, nlp.get_embeddings, nodos)
+    else:
+        nodos, matriz = calcular_embeddings(embedding_model, memory.get_graph(), nlp.get_embedding, nlp.get_embeddings)
+    tabla = EmbeddingTable(model_path)
+    tabla.write(nodos, matriz)
+    tabla.close()
+    print(f"✅ Tabla de embeddings exportada: {len(nodos)} nodos.")
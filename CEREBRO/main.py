@@ -1,14 +1,22 @@
 import os
 import time
-from core.memory_manager import MemoryManager
-from core.consciousness_engine import ConsciousnessEngine
+from core.lazy_loader import LazyObject, startup_timer
+from core.graph_registry import get_memory_manager, get_consciousness_engine
 from core.reasoning import ReasoningEngine
 from learning.reinforcement_learning import ReinforcementLearning
-from learning.predictor import Predictor
 from externalities.nlp_engine import NLPEngine
 from core.feedback_loop import FeedbackLoop
 from config.settings import Settings
-from learning.train_gnn import generate_model  # 🔥 Importamos la función de entrenamiento de GNN
+from learning.background_trainer import BackgroundTrainer
+from learning.change_tracker import GraphChangeTracker
+# 💤 `learning.predictor` y `learning.train_gnn` (TensorFlow + Spektral) se importan solo al usarse
+
+
+def _crear_predictor(memory, consciousness):
+    """📌 Importa TensorFlow y crea el `Predictor` la primera vez que se necesita."""
+    from learning.predictor import Predictor
+    return Predictor(memory, consciousness)
+
 
 def main():
     """
@@ -16,29 +24,39 @@ def main():
     - Carga la memoria y conciencia.
     - Inicia el motor de razonamiento y el predictor de relaciones.
     - Procesa las consultas del usuario utilizando memoria, conciencia y NLP.
+    - TensorFlow, Spektral y spaCy se cargan bajo demanda; al arrancar se muestran los tiempos.
+    - Si falta el modelo GNN, se entrena en otro proceso sin bloquear las consultas.
     """
     print("🧠 CEREBRO: Sistema de Razonamiento y Conciencia")
-
-    # 📂 Verificar y entrenar el modelo GNN si no existe
-    MODEL_PATH = "models/gnn_model.h5"
-    if not os.path.exists(MODEL_PATH):
-        print("⚙️ No se encontró el modelo GNN. Generando uno nuevo...")
-        generate_model()  # 🔥 Entrenamos la GNN si no está guardada
-    else:
-        print(f"✅ Modelo GNN encontrado en {MODEL_PATH}.")
+    startup_timer.mark("importaciones")
 
     # 🔹 Cargar módulos principales con manejo de errores
     try:
         print("📂 Cargando memoria y conciencia...")
-        memory = MemoryManager()
-        consciousness = ConsciousnessEngine()
-        reasoning = ReasoningEngine()
+        memory = get_memory_manager()  # 🔗 Una sola copia de cada grafo para todo el proceso
+        consciousness = get_consciousness_engine()
+        reasoning = ReasoningEngine(memory, consciousness)
         learning_agent = ReinforcementLearning()
-        predictor = Predictor(memory, consciousness)
-        feedback_loop = FeedbackLoop()
-        nlp = NLPEngine()
+        predictor = LazyObject(lambda: _crear_predictor(memory, consciousness), "Predictor (TensorFlow)")
+        feedback_loop = FeedbackLoop(memory=memory, consciousness=consciousness)
+        nlp = NLPEngine()  # El modelo de spaCy se carga en su primer uso
 
         print("✅ Memoria y conciencia listas.")
+        startup_timer.mark("memoria, conciencia y módulos")
+
+        # 📂 Verificar el modelo GNN; si no existe, se entrena en segundo plano
+        tracker = GraphChangeTracker(memory)  # 🔁 Cambios desde el último checkpoint de la GNN
+        trainer = BackgroundTrainer(
+            memory,
+            on_ready=lambda ruta: predictor.reload_weights(ruta) if predictor.loaded else None,
+            tracker=tracker,
+        )
+        if trainer.start():
+            print("⚙️ No se encontró el modelo GNN. Mientras se entrena, las respuestas usan solo el grafo.")
+            print("   Escribe 'estado' para ver el progreso del entrenamiento.")
+        else:
+            print(f"✅ Modelo GNN encontrado en {Settings.GNN_MODEL_PATH}.")
+        startup_timer.mark("comprobación del modelo GNN")
     except Exception as e:
         print(f"❌ Error al cargar los módulos principales: {e}")
         return  # Detener ejecución en caso de fallo crítico
@@ -47,13 +65,22 @@ def main():
     if "identidad" not in consciousness.graph:
         consciousness.add_identity_attribute("identidad", "CEREBRO - IA basada en conciencia y razonamiento")
 
+    startup_timer.ready()
+    startup_timer.report()
+
     num_interacciones = 0
 
     while True:
         try:
             query = input("\n🔍 Ingresa una pregunta (o 'salir' para terminar): ").strip()
+            if query.lower() == "estado":
+                print(trainer.describe())
+                continue
             if query.lower() == "salir":
                 print("👋 Saliendo del sistema...")
+                startup_timer.report()  # Incluye las cargas diferidas que hayan ocurrido
+                trainer.stop()
+                reasoning.close()
                 memory.save_memory()
                 consciousness.save_consciousness()
                 feedback_loop.save_feedback()
@@ -100,6 +127,9 @@ def main():
                 print("🔄 Reflexionando sobre experiencias pasadas...")
                 reasoning.reflexionar()
 
+            # 🔹 11. Reentrenar la GNN de forma incremental si el grafo ha cambiado demasiado
+            trainer.retrain_if_stale()
+
             time.sleep(1)
 
         except Exception as e:
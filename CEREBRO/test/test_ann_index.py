@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+from learning.ann_index import IVFIndex
+
+
+class TestIVFIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.claves = [f"nodo_{i}" for i in range(400)]
+        self.vectores = rng.normal(size=(400, 8)).astype(np.float32)
+
+    def exacto(self, vector, k):
+        d = np.linalg.norm(self.vectores - vector, axis=1)
+        return [self.claves[i] for i in np.argsort(d)[:k]]
+
+    def test_exact_below_train_size(self):
+        index = IVFIndex(min_train_size=1000)
+        index.build(self.claves, self.vectores)
+        self.assertFalse(index.trained)
+        resultado = index.query(self.vectores[3], k=5)
+        self.assertEqual([c for c, _ in resultado], self.exacto(self.vectores[3], 5))
+        self.assertEqual(resultado[0], ("nodo_3", 0.0))
+
+    def test_approximate_recall(self):
+        index = IVFIndex(min_train_size=100, n_probe=6)
+        index.build(self.claves, self.vectores)
+        self.assertTrue(index.trained)
+        aciertos = 0
+        for i in range(0, 400, 20):
+            esperados = set(self.exacto(self.vectores[i], 10))
+            aciertos += len(esperados & {c for c, _ in index.query(self.vectores[i], k=10)})
+        self.assertGreater(aciertos / (20 * 10), 0.8)
+
+    def test_add_remove_and_radius(self):
+        index = IVFIndex(min_train_size=100)
+        index.build(self.claves, self.vectores)
+        index.add("nuevo", self.vectores[0] + 0.01)
+        self.assertEqual(index.query_key("nodo_0", k=1)[0][0], "nuevo")
+        index.remove("nuevo")
+        self.assertNotIn("nuevo", index)
+        self.assertNotIn("nuevo", [c for c, _ in index.query(self.vectores[0], k=5)])
+        dentro = index.query(self.vectores[0], k=None, radius=1.5)
+        self.assertTrue(all(d <= 1.5 for _, d in dentro))
+
+    def test_incremental_growth_retrains(self):
+        index = IVFIndex(min_train_size=50)
+        for clave, vector in zip(self.claves, self.vectores):
+            index.add(clave, vector)
+        self.assertEqual(len(index), 400)
+        self.assertTrue(index.trained)
+        self.assertEqual(index.query(self.vectores[123], k=1)[0][0], "nodo_123")
+
+
+if __name__ == "__main__":
+    unittest.main()
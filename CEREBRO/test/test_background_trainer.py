@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+from core.memory_manager import MemoryManager
+from learning.background_trainer import BackgroundTrainer
+
+
+class TestBackgroundTrainer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory = MemoryManager(os.path.join(self.tmpdir.name, "memory_graph.json"), autosave_interval=0)
+
+    def tearDown(self):
+        self.memory.close()
+        self.tmpdir.cleanup()
+
+    def test_existing_weights_are_ready_without_process(self):
+        model_path = os.path.join(self.tmpdir.name, "gnn_model.h5")
+        open(model_path, "wb").close()
+        trainer = BackgroundTrainer(self.memory, model_path=model_path)
+        self.assertFalse(trainer.start())
+        self.assertTrue(trainer.ready)
+        self.assertEqual(trainer.status()["estado"], "listo")
+        self.assertEqual(trainer.describe(), "✅ Modelo GNN listo.")
+
+    def test_status_before_start(self):
+        trainer = BackgroundTrainer(self.memory, model_path=os.path.join(self.tmpdir.name, "no_existe.h5"))
+        self.assertFalse(trainer.ready)
+        self.assertEqual(trainer.status()["estado"], "sin iniciar")
+        self.assertIsNone(trainer.status()["segundos"])
+
+
+if __name__ == "__main__":
+    unittest.main()
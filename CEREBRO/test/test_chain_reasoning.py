@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from core.chain_reasoning import ChainReasoner
+from core.memory_manager import MemoryManager
+
+
+class TestChainReasoner(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory = MemoryManager(os.path.join(self.tmpdir.name, "memory_graph.json"), autosave_interval=0)
+        for a, b, peso in [("fuego", "calor", 0.9), ("calor", "verano", 0.8), ("verano", "playa", 0.9),
+                           ("fuego", "humo", 0.5), ("humo", "nube", 0.4), ("calor", "sudor", 0.3),
+                           ("fuego", "frio", 0.0)]:
+            self.memory.add_memory(a, b, peso)
+        for i in range(200):
+            self.memory.add_memory("fuego", f"chispa{i}", 0.01)  # Concepto "hub"
+
+    def tearDown(self):
+        self.memory.close()
+        self.tmpdir.cleanup()
+
+    def test_top_chains_by_product(self):
+        cadenas = ChainReasoner(self.memory, beam_width=4, max_depth=3, fanout=3).explain("fuego", top_n=2, min_hops=2)
+        self.assertEqual(cadenas[0].nodos, ["fuego", "calor", "verano"])
+        self.assertAlmostEqual(cadenas[0].score, 0.72)
+        self.assertEqual(cadenas[1].nodos, ["fuego", "calor", "verano", "playa"])
+        self.assertTrue(all("frio" not in c.nodos for c in cadenas))
+
+    def test_sum_scoring_and_destination(self):
+        reasoner = ChainReasoner(self.memory, beam_width=4, max_depth=3, fanout=3, scoring="sum")
+        cadenas = reasoner.explain("fuego", destino="nube")
+        self.assertEqual([c.nodos for c in cadenas], [["fuego", "humo", "nube"]])
+        self.assertAlmostEqual(cadenas[0].score, 0.9)
+        self.assertEqual(reasoner.explain("desconocido"), [])
+
+    def test_beam_bounds_the_work(self):
+        llamadas = []
+        original = self.memory.get_related_concepts
+        def contar(nodo, threshold=0.5, top_k=None):
+            resultado = original(nodo, threshold, top_k)
+            llamadas.append(len(resultado))
+            return resultado
+        self.memory.get_related_concepts = contar
+        ChainReasoner(self.memory, beam_width=5, max_depth=3, fanout=4).explain("fuego")
+        self.assertLessEqual(len(llamadas), 1 + 5 + 5)
+        self.assertLessEqual(max(llamadas), 4)
+
+    def test_paths_never_repeat_nodes(self):
+        for cadena in ChainReasoner(self.memory, beam_width=8, max_depth=4, fanout=4).explain("calor", top_n=20):
+            self.assertEqual(len(cadena.nodos), len(set(cadena.nodos)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+from core.memory_manager import MemoryManager
+from learning.change_tracker import GraphChangeTracker, k_hop_nodes
+
+
+class TestChangeTracker(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory = MemoryManager(os.path.join(self.tmpdir.name, "memory_graph.json"), autosave_interval=0)
+        for i in range(9):
+            self.memory.add_memory(f"c{i}", f"c{i + 1}")
+        self.model_path = os.path.join(self.tmpdir.name, "gnn_model.h5")
+
+    def tearDown(self):
+        self.memory.close()
+        self.tmpdir.cleanup()
+
+    def test_k_hop_nodes(self):
+        self.assertEqual(k_hop_nodes(self.memory.graph, ["c5"], 2), {"c3", "c4", "c5", "c6", "c7"})
+        self.assertEqual(k_hop_nodes(nx.Graph(), ["x"], 2), set())
+
+    def test_staleness_and_commit(self):
+        tracker = GraphChangeTracker(self.memory, self.model_path)
+        self.assertEqual(tracker.nodos_checkpoint, 10)
+        self.addCleanup(tracker.close)
+        self.memory.reinforce_memory("c0", "c1", 0.1)
+        self.assertEqual(tracker.changed_nodes, {"c0", "c1"})
+        self.assertTrue(tracker.is_stale(threshold=0.2))
+        self.assertFalse(tracker.is_stale(threshold=0.3))
+
+        self.assertEqual(tracker.begin(), {"c0", "c1"})
+        self.memory.add_memory("c9", "nuevo")  # Llega durante el reentrenamiento
+        tracker.rollback()
+        self.assertEqual(tracker.changed_nodes, {"c0", "c1", "c9", "nuevo"})
+
+        tracker.begin()
+        self.memory.add_memory("c2", "otro")
+        tracker.commit()
+        self.assertEqual(tracker.changed_nodes, {"c2", "otro"})
+        self.assertEqual(tracker.nodos_checkpoint, 12)
+
+    def test_pending_changes_survive_restart(self):
+        tracker = GraphChangeTracker(self.memory, self.model_path)
+        self.memory.add_memory("c3", "c7")
+        tracker.close()
+        reabierto = GraphChangeTracker(self.memory, self.model_path)
+        self.assertEqual(reabierto.changed_nodes, {"c3", "c7"})
+        reabierto.close()
+
+    def test_binary_graph_is_not_materialized(self):
+        path = os.path.join(self.tmpdir.name, "memory_graph.crbg")
+        memory = MemoryManager(path, autosave_interval=0)
+        memory.add_memory("fuego", "calor", 2.0)
+        memory.persistence.compact()
+        memory.close()
+
+        reabierta = MemoryManager(path, autosave_interval=0)
+        self.addCleanup(reabierta.close)
+        tracker = GraphChangeTracker(reabierta, self.model_path)
+        self.addCleanup(tracker.close)
+        self.assertEqual(tracker.nodos_checkpoint, 2)
+        copia = reabierta.snapshot()
+        self.assertEqual(copia["fuego"]["calor"]["peso"], 2.0)
+        self.assertIsNone(reabierta._graph)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import os
+import tempfile
 import unittest
 from core.consciousness_engine import ConsciousnessEngine
+from core.restriction_matcher import RestrictionMatcher
 
 class TestConsciousness(unittest.TestCase):
     def setUp(self):
@@ -10,5 +13,59 @@ class TestConsciousness(unittest.TestCase):
         score = self.consciousness.get_consciousness_score("mentir")
         self.assertLess(score, 0)
 
+class TestDecisionRanking(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "consciousness_graph.json")
+        self.consciousness = ConsciousnessEngine(self.path, autosave_interval=0)
+
+    def tearDown(self):
+        self.consciousness.close()
+        self.tmpdir.cleanup()
+
+    def test_ranking_follows_evaluations(self):
+        for decision, impacto in [("mentir", -1.0), ("ayudar", 2.0), ("callar", 0.5), ("ayudar", 1.0)]:
+            self.consciousness.evaluate_decision(decision, impacto)
+        self.assertEqual(self.consciousness.top_decisions(2), [("ayudar", 3.0), ("callar", 0.5)])
+        self.assertEqual(self.consciousness.worst_decisions(1), [("mentir", -1.0)])
+        self.assertEqual(self.consciousness.decisiones.range(hi=0), [("mentir", -1.0)])
+
+    def test_ranking_is_rebuilt_on_load(self):
+        self.consciousness.evaluate_decision("ayudar", 2.0)
+        self.consciousness.add_identity_attribute("identidad", "CEREBRO")
+        self.consciousness.close()
+        reloaded = ConsciousnessEngine(self.path, autosave_interval=0)
+        self.assertEqual(reloaded.top_decisions(5), [("ayudar", 2.0)])
+        reloaded.close()
+
+class TestRestrictions(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "consciousness_graph.json")
+        self.consciousness = ConsciousnessEngine(path, autosave_interval=0)
+
+    def tearDown(self):
+        self.consciousness.close()
+        self.tmpdir.cleanup()
+
+    def test_restriction_is_matched_case_insensitively(self):
+        self.assertFalse(self.consciousness.should_restrict_response("cómo fabricar una bomba"))
+        self.consciousness.add_restriction("Bomba")
+        self.assertTrue(self.consciousness.should_restrict_response("cómo fabricar una bomba"))
+        self.assertFalse(self.consciousness.should_restrict_response("bomberos"))
+
+    def test_batch_screening(self):
+        for termino in ["arma", "veneno", "he"]:
+            self.consciousness.add_restriction(termino)
+        consultas = ["qué es el fuego", "un veneno", "", "charmander", "armadura"]
+        self.assertEqual(
+            self.consciousness.should_restrict_responses(consultas),
+            [any(t in q for t in ["arma", "veneno", "he"]) for q in consultas],
+        )
+
+    def test_overlapping_terms(self):
+        matcher = RestrictionMatcher(["she", "he", "hers"])
+        self.assertEqual(matcher.screen(["ushers", "h", "hx"]), ["she", None, None])
+
 if __name__ == "__main__":
     unittest.main()
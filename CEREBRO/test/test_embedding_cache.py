@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from externalities.embedding_cache import EmbeddingCache, get_embedding_cache
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "embedding_cache")
+        self.llamadas = []
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def calcular(self, texto):
+        self.llamadas.append(texto)
+        return np.full(4, len(texto), dtype=np.float32)
+
+    def test_shared_per_path_in_process(self):
+        cache = get_embedding_cache(self.path, model="prueba", dim=4)
+        self.assertIs(get_embedding_cache(os.path.relpath(self.path), model="prueba", dim=4), cache)
+        otro_modelo = get_embedding_cache(self.path, model="otro", dim=4)
+        self.assertIsNot(otro_modelo, cache)
+        self.assertTrue(otro_modelo.read_only)
+        cache.put("uno", np.ones(4))
+        otro_modelo.put("uno", np.zeros(4))  # No toca el almacén del escritor
+        cache.close()
+        np.testing.assert_array_equal(EmbeddingCache(self.path, model="prueba", dim=4).get("uno"), np.ones(4))
+
+    def test_persists_between_instances(self):
+        cache = EmbeddingCache(self.path, model="prueba", dim=4, capacity=2)
+        for texto in ["perro", "gato", "  perro ", "casa"]:
+            cache.get_or_compute(texto, self.calcular)
+        self.assertEqual(self.llamadas, ["perro", "gato", "casa"])
+        cache.close()
+
+        reabierta = EmbeddingCache(self.path, model="prueba", dim=4, capacity=2)
+        for texto in ["perro", "gato", "casa"]:
+            reabierta.get_or_compute(texto, self.calcular)
+        self.assertEqual(len(self.llamadas), 3)  # 🔥 Ninguna llamada nueva al modelo
+        np.testing.assert_array_equal(reabierta.get("gato"), np.full(4, 4, dtype=np.float32))
+        reabierta.close()
+
+    def test_read_only_never_writes(self):
+        escritor = EmbeddingCache(self.path, model="prueba", dim=4)
+        escritor.put("uno", np.ones(4))
+        escritor.flush()
+        with open(escritor.data_path, "ab") as file:
+            file.write(b"\x00" * 6)  # Fila a medio escribir por el escritor
+        tamanos = [os.path.getsize(ruta) for ruta in (escritor.data_path, escritor.keys_path)]
+
+        lector = EmbeddingCache(self.path, model="prueba", dim=4, read_only=True)
+        np.testing.assert_array_equal(lector.get("uno"), np.ones(4, dtype=np.float32))
+        lector.get_or_compute("nuevo", self.calcular)
+        lector.get_or_compute("nuevo", self.calcular)
+        self.assertEqual(self.llamadas, ["nuevo"])  # Se recuerda en la LRU
+        lector.close()
+        self.assertEqual([os.path.getsize(ruta) for ruta in (escritor.data_path, escritor.keys_path)], tamanos)
+        self.assertIsNone(EmbeddingCache(self.path, model="otro", dim=4, read_only=True).get("uno"))
+        self.assertTrue(os.path.exists(escritor.data_path))  # Otro modelo: no se descarta el almacén ajeno
+        escritor.close()
+
+    def test_truncated_store_and_model_change(self):
+        cache = EmbeddingCache(self.path, model="prueba", dim=4)
+        cache.put("uno", np.ones(4))
+        cache.put("dos", np.zeros(4))
+        cache.close()
+        with open(cache.data_path, "r+b") as file:
+            file.truncate(4 * 4 + 3)  # Segunda fila a medio escribir
+
+        reabierta = EmbeddingCache(self.path, model="prueba", dim=4)
+        self.assertIn("uno", reabierta)
+        self.assertNotIn("dos", reabierta)
+        reabierta.close()
+
+        otro_modelo = EmbeddingCache(self.path, model="otro", dim=4)
+        self.assertEqual(len(otro_modelo), 0)
+        otro_modelo.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from learning.embedding_table import EmbeddingTable
+
+
+class TestEmbeddingTable(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmpdir.name, "gnn_link_model.h5")
+        self.escribir_pesos(b"pesos v1")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def escribir_pesos(self, contenido):
+        with open(self.model_path, "wb") as file:
+            file.write(contenido)
+
+    def test_roundtrip_is_memory_mapped(self):
+        matriz = np.arange(6, dtype=np.float32).reshape(3, 2)
+        EmbeddingTable(self.model_path).write(["a", "b", "c"], matriz)
+
+        tabla = EmbeddingTable(self.model_path)
+        self.assertTrue(tabla.load())
+        self.assertIsInstance(tabla.matrix(), np.memmap)
+        np.testing.assert_array_equal(tabla.get("b"), [2.0, 3.0])
+        np.testing.assert_array_equal(tabla.get_many(["c", "a"]), [[4.0, 5.0], [0.0, 1.0]])
+        self.assertIsNone(tabla.get("z"))
+
+    def test_append_and_save(self):
+        tabla = EmbeddingTable(self.model_path)
+        tabla.write(["a"], np.ones((1, 2)))
+        tabla.append(["a", "b"], np.full((2, 2), 7.0))
+        self.assertEqual(tabla.nodes, ["a", "b"])
+        np.testing.assert_array_equal(tabla.get("a"), [1.0, 1.0])  # Los nodos presentes no se sobrescriben
+        tabla.save()
+
+        reabierta = EmbeddingTable(self.model_path)
+        self.assertTrue(reabierta.load())
+        np.testing.assert_array_equal(reabierta.get("b"), [7.0, 7.0])
+
+    def test_close_saves_pending_rows(self):
+        tabla = EmbeddingTable(self.model_path)
+        tabla.write(["a"], np.ones((1, 2)))
+        tabla.append(["b"], np.full((1, 2), 3.0))
+        tabla.close()
+
+        reabierta = EmbeddingTable(self.model_path)
+        self.assertTrue(reabierta.load())
+        self.assertEqual(reabierta.nodes, ["a", "b"])
+        reabierta.close()
+
+    def test_append_goes_to_log_and_close_compacts(self):
+        tabla = EmbeddingTable(self.model_path)
+        tabla.write(["a"], np.ones((1, 2)))
+        antes = os.stat(tabla.data_path).st_mtime_ns
+        tabla.append(["b"], np.full((1, 2), 3.0))
+        tabla.append(["c"], np.full((1, 2), 4.0))
+        self.assertEqual(os.stat(tabla.data_path).st_mtime_ns, antes)  # La tabla no se reescribe
+        self.assertTrue(os.path.exists(tabla.extra_keys_path))
+
+        reabierta = EmbeddingTable(self.model_path)  # Como tras un cierre inesperado
+        self.assertTrue(reabierta.load())
+        self.assertEqual(reabierta.nodes, ["a", "b", "c"])
+        np.testing.assert_array_equal(reabierta.get_many(["c", "a"]), [[4.0, 4.0], [1.0, 1.0]])
+        reabierta.close()
+        tabla.close()
+
+        self.assertFalse(os.path.exists(tabla.extra_keys_path))
+        compactada = EmbeddingTable(self.model_path)
+        self.assertTrue(compactada.load())
+        self.assertIsInstance(compactada.matrix(), np.memmap)
+        self.assertEqual(compactada.nodes, ["a", "b", "c"])
+
+    def test_partial_row_at_end_of_log_is_dropped(self):
+        tabla = EmbeddingTable(self.model_path)
+        tabla.write(["a"], np.ones((1, 2)))
+        tabla.append(["b", "c"], np.full((2, 2), 5.0))
+        tabla.save()
+        with open(tabla.extra_data_path, "r+b") as file:
+            file.truncate(12)  # "c" a medio escribir
+
+        reabierta = EmbeddingTable(self.model_path)
+        self.assertTrue(reabierta.load())
+        self.assertEqual(reabierta.nodes, ["a", "b"])
+        reabierta.append(["c"], np.full((1, 2), 6.0))
+        reabierta.save()
+
+        otra = EmbeddingTable(self.model_path)
+        self.assertTrue(otra.load())
+        np.testing.assert_array_equal(otra.get("c"), [6.0, 6.0])
+
+    def test_log_of_other_table_is_ignored(self):
+        tabla = EmbeddingTable(self.model_path)
+        tabla.write(["a"], np.ones((1, 2)))
+        tabla.append(["b"], np.ones((1, 2)))
+        tabla.save()
+        with open(tabla.extra_data_path, "rb") as file:
+            filas = file.read()
+        with open(tabla.extra_keys_path, "rb") as file:
+            claves = file.read()
+        tabla.write(["x", "y"], np.zeros((2, 2)))
+        with open(tabla.extra_data_path, "wb") as file:
+            file.write(filas)
+        with open(tabla.extra_keys_path, "wb") as file:
+            file.write(claves)
+
+        reabierta = EmbeddingTable(self.model_path)
+        self.assertTrue(reabierta.load())
+        self.assertEqual(reabierta.nodes, ["x", "y"])
+        self.assertFalse(os.path.exists(reabierta.extra_keys_path))
+
+    def test_table_of_other_weights_is_ignored(self):
+        tabla = EmbeddingTable(self.model_path)
+        tabla.write(["a"], np.ones((1, 2)))
+        tabla.append(["b"], np.ones((1, 2)))
+        self.escribir_pesos(b"pesos v2, reentrenados")
+
+        tabla.save()  # Filas de los pesos anteriores: no se escriben
+        self.assertFalse(EmbeddingTable(self.model_path).load())
+
+
+if __name__ == "__main__":
+    unittest.main()
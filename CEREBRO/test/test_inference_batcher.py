@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import unittest
+
+from learning.inference_batcher import InferenceBatcher
+
+
+class PredictorDePrueba:
+    """Registra cada llamada por lotes para comprobar que las peticiones se agrupan."""
+
+    def __init__(self):
+        self.llamadas = []
+        self.lock = threading.Lock()
+
+    def get_embeddings(self, nodos):
+        with self.lock:
+            self.llamadas.append(("embedding", list(nodos)))
+        return [len(nodo) for nodo in nodos]
+
+    def predict_relationships(self, pares):
+        with self.lock:
+            self.llamadas.append(("prediccion", list(pares)))
+        if ("x", "x") in pares:
+            raise ValueError("par inválido")
+        return [0.5 if a < b else 0.25 for a, b in pares]
+
+
+class TestInferenceBatcher(unittest.TestCase):
+    def setUp(self):
+        self.predictor = PredictorDePrueba()
+        self.batcher = InferenceBatcher(self.predictor, max_batch=100, max_wait_ms=50)
+
+    def tearDown(self):
+        self.batcher.close()
+
+    def test_concurrent_requests_share_one_call(self):
+        futuros = [self.batcher.submit_prediction("a", "b") for _ in range(10)]
+        futuros += [self.batcher.submit_embedding("perro") for _ in range(5)]
+        self.assertEqual([f.result(1) for f in futuros], [0.5] * 10 + [5] * 5)
+        self.assertEqual(self.batcher.lotes, 1)
+        self.assertEqual(sorted(tipo for tipo, _ in self.predictor.llamadas), ["embedding", "prediccion"])
+
+    def test_threads_and_max_batch(self):
+        batcher = InferenceBatcher(self.predictor, max_batch=4, max_wait_ms=50)
+        resultados = [None] * 12
+        def pedir(i):
+            resultados[i] = batcher.predict_relationship("b", "a", timeout=1)
+        hilos = [threading.Thread(target=pedir, args=(i,)) for i in range(12)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        batcher.close()
+        self.assertEqual(resultados, [0.25] * 12)
+        self.assertTrue(all(len(pares) <= 4 for _, pares in self.predictor.llamadas))
+        self.assertGreaterEqual(batcher.lotes, 3)
+
+    def test_asyncio_front_end(self):
+        async def consultar():
+            return await asyncio.gather(self.batcher.apredict_relationship("a", "b"), self.batcher.aget_embedding("gato"))
+        self.assertEqual(asyncio.run(consultar()), [0.5, 4])
+
+    def test_errors_fail_only_their_group(self):
+        malo = self.batcher.submit_prediction("x", "x")
+        bueno = self.batcher.submit_embedding("casa")
+        with self.assertRaises(ValueError):
+            malo.result(1)
+        self.assertEqual(bueno.result(1), 4)
+
+    def test_closed_batcher_rejects_requests(self):
+        self.batcher.close()
+        with self.assertRaises(RuntimeError):
+            self.batcher.submit_embedding("a")
+
+    def test_close_during_submit_does_not_strand_the_request(self):
+        poner = self.batcher._cola.put
+        cierre = []
+        def poner_y_cerrar(peticion, *args, **kwargs):
+            if isinstance(peticion, tuple) and not cierre:  # Se cierra justo entre la comprobación y la cola
+                cierre.append(threading.Thread(target=self.batcher.close))
+                cierre[0].start()
+                cierre[0].join(0.1)
+            poner(peticion, *args, **kwargs)
+        self.batcher._cola.put = poner_y_cerrar
+        futuro = self.batcher.submit_embedding("perro")
+        self.assertEqual(futuro.result(1), 5)
+        cierre[0].join(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import random
+import tempfile
+import unittest
+
+import networkx as nx
+from core.landmarks import LandmarkIndex
+from core.memory_manager import MemoryManager
+from core.path_search import PathSearch
+
+
+def costo(u, v, datos):
+    return 1.0 / datos["peso"]
+
+
+class TestLandmarkIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory = MemoryManager(os.path.join(self.tmpdir.name, "memory_graph.json"), autosave_interval=0)
+        rng = random.Random(3)
+        for _ in range(250):
+            a, b = rng.randrange(60), rng.randrange(60)
+            if a != b:
+                self.memory.add_memory(f"n{a}", f"n{b}", rng.uniform(0.2, 3.0))
+        self.memory.add_memory("isla", "islote", 1.0)  # Otra componente
+        self.index = LandmarkIndex(self.memory, n_landmarks=8, rebuild_every=5)
+        self.index.build()
+
+    def tearDown(self):
+        self.index.close()
+        self.memory.close()
+        self.tmpdir.cleanup()
+
+    def test_bounds_enclose_true_distance(self):
+        self.assertEqual(len(self.index.landmarks), 8)
+        grafo = self.memory.graph
+        nodos = sorted(n for n in grafo if n.startswith("n"))
+        for a in nodos[:10]:
+            distancias = nx.single_source_dijkstra_path_length(grafo, a, weight=costo)
+            for b in nodos[-10:]:
+                inferior, superior = self.index.bounds(a, b)
+                self.assertLessEqual(inferior, distancias[b] + 1e-4)
+                self.assertGreaterEqual(superior, distancias[b] - 1e-4)
+
+    def test_other_component_is_unreachable(self):
+        self.assertEqual(self.index.bounds("n1", "isla"), (float("inf"), float("inf")))
+        self.assertIsNone(self.index.bounds("n1", "desconocido"))
+
+    def test_astar_matches_dijkstra(self):
+        paths = PathSearch(self.memory, max_hops=100, max_cost=1e9, landmarks=self.index)
+        paths_sin = PathSearch(self.memory, max_hops=100, max_cost=1e9)
+        grafo = self.memory.graph
+        for a, b in [("n1", "n50"), ("n7", "n33"), ("n12", "n2")]:
+            esperado = nx.dijkstra_path_length(grafo, a, b, weight=costo)
+            self.assertAlmostEqual(paths.find_path(a, b).costo, esperado, places=5)
+            self.assertAlmostEqual(paths_sin.find_path(a, b).costo, esperado, places=5)
+        self.assertIsNone(paths.find_path("n1", "isla"))
+
+    def test_edge_changes_mark_index_stale(self):
+        self.assertTrue(self.index.exact)
+        self.memory.add_memory("n1", "isla", 1.0)  # Une las dos componentes
+        self.assertFalse(self.index.exact)
+        self.assertEqual(self.index.bounds("n1", "isla")[0], 0.0)  # Ya no se afirma que no haya camino
+        paths = PathSearch(self.memory, landmarks=self.index)
+        self.assertEqual(paths.find_path("n1", "islote").nodos, ["n1", "isla", "islote"])
+        for i in range(5):
+            self.memory.add_memory("isla", f"playa{i}", 1.0)
+        self.assertTrue(self.index.stale)
+        self.index.refresh()
+        self.assertTrue(self.index.wait(5))
+        self.assertTrue(self.index.exact)
+        self.assertLess(self.index.bounds("n1", "islote")[1], float("inf"))
+
+    def test_reinforced_edge_is_found_before_rebuild(self):
+        memory = MemoryManager(os.path.join(self.tmpdir.name, "cadena.json"), autosave_interval=0)
+        for u, v in ["ab", "bc", "cd", "de"]:
+            memory.add_memory(u, v, 1.0)
+        memory.add_memory("a", "d", 0.05)
+        index = LandmarkIndex(memory, n_landmarks=2, rebuild_every=1000)
+        index.build()
+        paths = PathSearch(memory, max_cost=2.0, landmarks=index)
+        self.assertIsNone(paths.find_path("a", "d"))  # Coste 3 por b-c y 20 directo: fuera de presupuesto
+        memory.reinforce_memory("a", "d", 10)
+        self.assertFalse(index.exact)
+        self.assertEqual(index.bounds("a", "d")[0], 0.0)
+        ruta = paths.find_path("a", "d")
+        self.assertEqual(ruta.nodos, ["a", "d"])
+        self.assertAlmostEqual(ruta.costo, 1 / 10.05, places=5)
+        index.close()
+        memory.close()
+
+
+
+if __name__ == "__main__":
+    unittest.main()
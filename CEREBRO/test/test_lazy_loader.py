@@ -0,0 +1,33 @@
+import sys
+import unittest
+
+from core.lazy_loader import LazyObject, lazy_import, startup_timer
+
+
+class TestLazyLoader(unittest.TestCase):
+    def test_module_imported_on_first_access(self):
+        sys.modules.pop("colorsys", None)
+        modulo = lazy_import("colorsys")
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertFalse(modulo.loaded)
+        self.assertEqual(modulo.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertTrue(modulo.loaded)
+        self.assertIn("colorsys", [nombre for nombre, _ in startup_timer.cargas])
+
+    def test_object_built_once_on_first_use(self):
+        creados = []
+
+        def crear():
+            creados.append(1)
+            return {"listo": True}
+
+        proxy = LazyObject(crear, "prueba")
+        self.assertFalse(proxy.loaded)
+        self.assertEqual(list(proxy.keys()), ["listo"])
+        self.assertTrue(proxy.loaded)
+        self.assertEqual(proxy.get(), {"listo": True})
+        self.assertEqual(len(creados), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
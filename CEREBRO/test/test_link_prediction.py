@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from learning.link_prediction import aristas_positivas, muestrear_negativos, pares_de_entrenamiento, puntuar_bloque, puntuar_pares
+
+
+class TestLinkPrediction(unittest.TestCase):
+    def setUp(self):
+        filas = [0, 1, 1, 2, 2, 3]
+        columnas = [1, 0, 2, 1, 3, 2]
+        self.A = coo_matrix((np.ones(6, dtype=np.float32), (filas, columnas)), shape=(5, 5))
+
+    def test_positive_edges_are_unique_upper_pairs(self):
+        np.testing.assert_array_equal(aristas_positivas(self.A), [[0, 1], [1, 2], [2, 3]])
+
+    def test_negatives_avoid_edges_self_loops_and_duplicates(self):
+        positivos = aristas_positivas(self.A)
+        negativos = muestrear_negativos(5, positivos, 7, rng=np.random.default_rng(0))
+        self.assertEqual(len(negativos), 7)  # 10 pares posibles - 3 aristas
+        claves = {tuple(par) for par in negativos.tolist()}
+        self.assertEqual(len(claves), 7)
+        self.assertTrue(all(i < j for i, j in claves))
+        self.assertFalse(claves & {tuple(par) for par in positivos.tolist()})
+
+    def test_negatives_stop_when_graph_is_complete(self):
+        completo = np.array([(i, j) for i in range(4) for j in range(i + 1, 4)])
+        self.assertEqual(len(muestrear_negativos(4, completo, 5, rng=np.random.default_rng(0))), 0)
+
+    def test_training_pairs_are_labelled(self):
+        pares, etiquetas = pares_de_entrenamiento(5, aristas_positivas(self.A), ratio=2, rng=np.random.default_rng(1))
+        self.assertEqual(len(pares), 9)
+        np.testing.assert_array_equal(etiquetas, [1, 1, 1] + [0] * 6)
+
+    def test_decoders(self):
+        Z1 = np.array([[1.0, 2.0], [0.0, 0.0]])
+        Z2 = np.array([[3.0, -1.0], [5.0, 5.0]])
+        np.testing.assert_allclose(puntuar_pares(Z1, Z2), [1 / (1 + np.exp(-1.0)), 0.5])
+        pesos = [np.eye(2), np.zeros(2), np.ones((2, 1)), np.zeros(1)]
+        np.testing.assert_allclose(puntuar_pares(Z1, Z2, "mlp", pesos), [1 / (1 + np.exp(-3.0)), 0.5])
+        np.testing.assert_allclose(puntuar_pares(Z1, Z2, "mlp", pesos), puntuar_pares(Z2, Z1, "mlp", pesos))
+        with self.assertRaises(ValueError):
+            puntuar_pares(Z1, Z2, "coseno")
+
+    def test_block_scores_match_pairs(self):
+        rng = np.random.default_rng(0)
+        Z1, Z2 = rng.normal(size=(4, 3)), rng.normal(size=(5, 3))
+        pesos = [rng.normal(size=(3, 6)), rng.normal(size=6), rng.normal(size=(6, 1)), rng.normal(size=1)]
+        i, j = np.meshgrid(np.arange(4), np.arange(5), indexing="ij")
+        for decoder, p in [("dot", None), ("mlp", pesos)]:
+            esperado = puntuar_pares(Z1[i.ravel()], Z2[j.ravel()], decoder, p).reshape(4, 5)
+            np.testing.assert_allclose(puntuar_bloque(Z1, Z2, decoder, p, max_elementos=7), esperado, rtol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
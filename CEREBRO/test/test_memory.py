@@ -1,8 +1,13 @@
+import os
+import tempfile
 import unittest
 
 import networkx as nx
 import numpy as np
+from core.adjacency_index import AdjacencyIndex
 from core.memory_manager import MemoryManager
+from core.node_index import NodeIndex
+from learning.sparse_graph import grafo_a_coo
 from scipy.sparse import coo_matrix
 
 class TestMemory(unittest.TestCase):
@@ -18,5 +23,80 @@ class TestMemory(unittest.TestCase):
         # 🚀 Cargar el grafo desde MemoryManager
 
 
+class TestAdjacencyIndex(unittest.TestCase):
+    def setUp(self):
+        self.graph = nx.Graph()
+        for vecino, peso in [("calor", 2.0), ("humo", 0.75), ("agua", 0.25), ("luz", 0.75)]:
+            self.graph.add_edge("fuego", vecino, peso=peso)
+        self.index = AdjacencyIndex(lambda: self.graph)
+
+    def test_threshold_and_top_k(self):
+        self.assertEqual(self.index.related("fuego"), [("calor", 2.0), ("humo", 0.75), ("luz", 0.75)])
+        self.assertEqual(self.index.top_k("fuego", 2), [("calor", 2.0), ("humo", 0.75)])
+        self.assertEqual(self.index.related("nieve"), [])
+
+    def test_incremental_update(self):
+        self.index.related("fuego")  # Construye la fila
+        self.graph["fuego"]["agua"]["peso"] = 3.0
+        self.index.update_edge("fuego", "agua", 3.0)
+        self.graph.add_edge("fuego", "ceniza", peso=1.0)
+        self.index.update_edge("fuego", "ceniza", 1.0)
+        self.assertEqual(
+            [n for n, _ in self.index.related("fuego")],
+            ["agua", "calor", "ceniza", "humo", "luz"],
+        )
+        self.assertEqual(self.index.related("agua"), [("fuego", 3.0)])
+
+
+class TestNodeIndex(unittest.TestCase):
+    def setUp(self):
+        self.graph = nx.Graph()
+        self.graph.add_node("fuego", tipo="concepto")
+        self.graph.add_node("no tocar", tipo="restricción")
+        self.graph.add_node("mentir", tipo="decisión", impacto=-2.0)
+        self.graph.add_node("ayudar", tipo="decisión", impacto=3.0)
+        self.index = NodeIndex(lambda: self.graph.nodes(data=True), numeric_attrs=("impacto",))
+
+    def test_type_and_range_queries(self):
+        self.assertEqual(self.index.nodes_of_type("restricción"), {"no tocar"})
+        self.assertEqual(self.index.range("decisión", "impacto", hi=0), [("mentir", -2.0)])
+        self.assertEqual(self.index.types(), {"concepto": 1, "restricción": 1, "decisión": 2})
+
+    def test_update_moves_node_between_types(self):
+        self.index.nodes_of_type("concepto")  # Construye el índice
+        self.graph.nodes["fuego"]["tipo"] = "restricción"
+        self.assertEqual(self.index.update_node("fuego", self.graph.nodes["fuego"]), ("concepto", "restricción"))
+        self.assertEqual(self.index.nodes_of_type("restricción"), {"no tocar", "fuego"})
+        self.assertEqual(self.index.count("concepto"), 0)
+
+
+class TestSparseGraph(unittest.TestCase):
+    def test_coo_matches_dense_with_weights(self):
+        graph = nx.Graph()
+        graph.add_edge("a", "b", peso=0.5)
+        graph.add_edge("b", "c", peso=2.0)
+        graph.add_edge("c", "c", peso=1.5)
+        graph.add_edge("a", "d")  # Sin `peso`: cuenta como 1.0
+        nodos = ["d", "c", "b", "a"]
+        A = grafo_a_coo(graph, nodos)
+        self.assertIsInstance(A, coo_matrix)
+        self.assertEqual(A.dtype, np.float32)
+        esperado = nx.to_numpy_array(graph, nodelist=nodos, weight="peso", dtype=np.float32)
+        np.testing.assert_array_equal(A.toarray(), esperado)
+
+
+class TestMemoryListeners(unittest.TestCase):
+    def test_listener_sees_new_nodes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            memory = MemoryManager(os.path.join(tmpdir, "memory_graph.json"), autosave_interval=0)
+            eventos = []
+            memory.add_listener(lambda op, args: eventos.append((op, args[0])))
+            memory.add_memory("sol", "luz", 1.0)
+            memory.add_memory("sol", "luz", 0.5)
+            self.assertEqual([n for op, n in eventos if op == "add_node"], ["sol", "luz"])
+            self.assertEqual(eventos[-1], ("edge_delta", "sol"))
+            memory.close()
+
+
 if __name__ == "__main__":
     unittest.main()
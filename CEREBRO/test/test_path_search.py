@@ -0,0 +1,86 @@
+import os
+import random
+import tempfile
+import unittest
+
+import networkx as nx
+from core.memory_manager import MemoryManager
+from core.path_search import PathSearch
+
+
+class TestPathSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory = MemoryManager(os.path.join(self.tmpdir.name, "memory_graph.json"), autosave_interval=0)
+        # Camino corto débil (fuego → humo → cielo) frente a uno largo fuerte (fuego → calor → sol → cielo)
+        for a, b, peso in [("fuego", "humo", 0.2), ("humo", "cielo", 0.2),
+                           ("fuego", "calor", 2.0), ("calor", "sol", 2.0), ("sol", "cielo", 2.0),
+                           ("fuego", "agua", 0.0), ("agua", "cielo", 5.0)]:
+            self.memory.add_memory(a, b, peso)
+        self.paths = PathSearch(self.memory)
+
+    def tearDown(self):
+        self.memory.close()
+        self.tmpdir.cleanup()
+
+    def test_prefers_strong_associations_and_skips_non_positive_weights(self):
+        ruta = self.paths.find_path("fuego", "cielo")
+        self.assertEqual(ruta.nodos, ["fuego", "calor", "sol", "cielo"])
+        self.assertAlmostEqual(ruta.costo, 1.5)
+        self.assertTrue(ruta.exacta)
+
+    def test_hop_and_cost_budgets(self):
+        self.assertEqual(self.paths.find_path("fuego", "cielo", max_hops=2).nodos, ["fuego", "humo", "cielo"])
+        self.assertIsNone(self.paths.find_path("fuego", "cielo", max_hops=1))
+        self.assertIsNone(self.paths.find_path("fuego", "cielo", max_cost=1.0))
+        self.assertIsNone(self.paths.find_path("fuego", "desconocido"))
+
+    def test_hop_budget_keeps_nodes_and_cost_consistent(self):
+        for a, b, peso in [("a", "b", 10.0), ("b", "c", 10.0), ("a", "c", 0.5), ("c", "d", 1.0)]:
+            self.memory.add_memory(a, b, peso)
+        ruta = PathSearch(self.memory, max_hops=2).find_path("a", "d")
+        self.assertEqual(ruta.nodos, ["a", "c", "d"])
+        self.assertAlmostEqual(ruta.costo, 3.0)
+        self.assertFalse(ruta.exacta)  # El límite de saltos descartó a → b → c → d, más barato
+        self.assertEqual(PathSearch(self.memory).find_path("a", "d").nodos, ["a", "b", "c", "d"])
+
+    def test_cache_is_invalidated_by_graph_version(self):
+        self.paths.find_path("fuego", "cielo")
+        self.paths.find_path("fuego", "cielo")
+        self.assertEqual((self.paths.hits, self.paths.misses), (1, 1))
+        self.memory.add_memory("fuego", "cielo", 10.0)
+        self.assertEqual(self.paths.find_path("fuego", "cielo").nodos, ["fuego", "cielo"])
+        self.assertEqual(self.paths.misses, 2)
+
+    def test_matches_dijkstra_on_random_graph(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            a, b = rng.randrange(80), rng.randrange(80)
+            if a != b:
+                self.memory.add_memory(f"n{a}", f"n{b}", rng.uniform(0.1, 3.0))
+        grafo = self.memory.graph
+        for _ in range(30):
+            a, b = f"n{rng.randrange(80)}", f"n{rng.randrange(80)}"
+            if a not in grafo or b not in grafo:
+                continue
+            try:
+                esperado = nx.dijkstra_path_length(grafo, a, b, weight=lambda u, v, d: 1.0 / d["peso"])
+            except nx.NetworkXNoPath:
+                esperado = None
+            ruta = self.paths.find_path(a, b, max_hops=100, max_cost=1e9)
+            if esperado is None:
+                self.assertIsNone(ruta)
+            else:
+                self.assertAlmostEqual(ruta.costo, esperado, places=5)
+
+    def test_expansion_budget_returns_early_answer(self):
+        for i in range(50):
+            self.memory.add_memory("fuego", f"chispa{i}", 1.0)
+        ruta = self.paths.find_path("fuego", "cielo", max_expansions=1)
+        self.assertIsNone(ruta)  # Sin encuentro todavía
+        ruta = self.paths.find_path("fuego", "sol", max_expansions=2)
+        self.assertIsNotNone(ruta)
+
+
+if __name__ == "__main__":
+    unittest.main()
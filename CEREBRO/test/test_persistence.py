@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+from core.memory_manager import MemoryManager
+from data.binary_graph import BinaryGraph, codificar_grafo
+from data.graph_persistence import GraphPersistence
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "memory_graph.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_flush_only_when_dirty(self):
+        graph = nx.Graph()
+        persistence = GraphPersistence(self.path, lambda: graph, interval=0)
+        self.assertFalse(persistence.flush())
+        persistence.apply("add_edge", "fuego", "calor", {"peso": 1.0})
+        self.assertTrue(persistence.flush())
+        self.assertFalse(os.path.exists(self.path))  # Solo se escribió el diario
+        persistence.compact()
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["graph"]["journal_seq"], 1)
+        self.assertEqual(persistence.journal.size, 0)
+        persistence.close()
+
+    def test_memory_is_written_behind(self):
+        memory = MemoryManager(self.path, autosave_interval=0)
+        memory.add_memory("perro", "animal", 1.5)
+        self.assertFalse(os.path.exists(self.path))
+        memory.flush()
+        memory.close()
+
+        reloaded = MemoryManager(self.path, autosave_interval=0)
+        self.assertEqual(reloaded.get_related_concepts("perro"), [("animal", 1.5)])
+        reloaded.close()
+
+    def test_journal_replays_on_top_of_snapshot(self):
+        memory = MemoryManager(self.path, autosave_interval=0)
+        memory.add_memory("perro", "animal", 1.0)
+        memory.persistence.compact()
+        memory.reinforce_memory("perro", "animal", 0.5)
+        memory.close()
+
+        reloaded = MemoryManager(self.path, autosave_interval=0)
+        self.assertEqual(reloaded.get_related_concepts("perro"), [("animal", 1.5)])
+        reloaded.close()
+
+    def test_truncated_journal_tail_is_ignored(self):
+        memory = MemoryManager(self.path, autosave_interval=0)
+        memory.add_memory("perro", "animal", 1.0)
+        memory.close()
+        with open(self.path + ".wal", "ab") as file:
+            file.write(b'[99, "edge_delta", "perro"')
+
+        reloaded = MemoryManager(self.path, autosave_interval=0)
+        self.assertEqual(reloaded.get_related_concepts("perro"), [("animal", 1.0)])
+        reloaded.close()
+
+    def test_binary_snapshot_answers_without_materializing(self):
+        path = os.path.join(self.tmpdir.name, "memory_graph.crbg")
+        memory = MemoryManager(path, autosave_interval=0)
+        memory.add_memory("fuego", "calor", 2.0)
+        memory.add_memory("fuego", "humo", 0.75)
+        memory.add_memory("fuego", "agua", 0.25)
+        memory.persistence.compact()
+        memory.close()
+
+        reloaded = MemoryManager(path, autosave_interval=0)
+        self.assertIsNone(reloaded._graph)
+        self.assertEqual(reloaded.get_related_concepts("fuego"), [("calor", 2.0), ("humo", 0.75)])
+        self.assertEqual(reloaded.get_related_concepts("nieve"), [])
+        self.assertTrue(reloaded.has_node("agua"))
+        nodos, filas, columnas, pesos = reloaded.edge_arrays()
+        self.assertIsNone(reloaded._graph)
+        aristas = sorted((nodos[i], nodos[j], p) for i, j, p in zip(filas.tolist(), columnas.tolist(), pesos.tolist()))
+        self.assertEqual(reloaded.graph.nodes["agua"]["tipo"], "concepto")
+        esperadas = [(u, v, d["peso"]) for u, v, d in reloaded.graph.edges(data=True)]
+        self.assertEqual(aristas, sorted(esperadas + [(v, u, p) for u, v, p in esperadas]))
+        reloaded.close()
+
+    def test_binary_format_round_trip(self):
+        graph = nx.Graph(nombre="prueba")
+        graph.add_node("á", tipo="concepto")
+        graph.add_edge("á", "b", peso=1.5, fuente="usuario")
+        graph.add_edge("b", "c", peso=0.5)
+        graph.add_edge("c", "d", peso=0.7)
+        path = os.path.join(self.tmpdir.name, "grafo.crbg")
+        with open(path, "wb") as file:
+            file.write(codificar_grafo(graph))
+
+        vista = BinaryGraph(path)
+        restored = vista.to_networkx()
+        self.assertEqual(restored.graph, {"nombre": "prueba"})
+        self.assertEqual(dict(restored.nodes(data=True)), dict(graph.nodes(data=True)))
+        self.assertEqual(restored["á"]["b"], {"peso": 1.5, "fuente": "usuario"})
+        self.assertEqual(vista.related("b", threshold=0.0), [("á", 1.5), ("c", 0.5)])
+        self.assertEqual([n for n, _ in vista.related("c", threshold=0.7)], ["d"])  # 0.7 en float32 es 0.69999999
+        for i in range(100):
+            self.assertNotIn(f"consulta {i}", vista)
+        self.assertNotIn("consulta 0", vista._ids)  # Los fallos no se guardan: la caché no crece sin límite
+        vista.close()
+
+if __name__ == "__main__":
+    unittest.main()
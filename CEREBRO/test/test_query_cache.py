@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+import unittest
+
+from core.consciousness_engine import ConsciousnessEngine
+from core.memory_manager import MemoryManager
+from core.node_versions import NodeVersions
+from core.query_cache import QueryCache
+from core.reasoning import ReasoningEngine
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.versiones = NodeVersions()
+        self.cache = QueryCache(capacity=2, ttl=0)
+        self.cache.watch("g", self.versiones)
+
+    def leer(self, *nodos):
+        def calcular():
+            for nodo in nodos:
+                self.versiones.note(nodo)
+            return "+".join(nodos)
+        return calcular
+
+    def test_lru_and_metrics(self):
+        self.assertEqual(self.cache.get_or_compute("q1", self.leer("a")), "a")
+        self.assertEqual(self.cache.get_or_compute("q1", self.leer("otro")), "a")
+        self.cache.get_or_compute("q2", self.leer("b"))
+        self.cache.get_or_compute("q3", self.leer("c"))
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual((self.cache.hits, self.cache.misses, self.cache.evictions), (1, 3, 1))
+        self.assertEqual(self.cache.get_or_compute("q1", self.leer("z")), "z")  # Expulsada por LRU
+
+    def test_ttl(self):
+        cache = QueryCache(capacity=8, ttl=0.01)
+        cache.get_or_compute("q", lambda: 1)
+        time.sleep(0.02)
+        self.assertEqual(cache.get_or_compute("q", lambda: 2), 2)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_mutation_during_compute_is_not_stored(self):
+        def calcular():
+            self.versiones.note("a")
+            self.versiones.bump(["a"])
+            return "viejo"
+        self.cache.get_or_compute("q", calcular)
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestReasoningCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory = MemoryManager(os.path.join(self.tmpdir.name, "memory_graph.json"), autosave_interval=0)
+        self.consciousness = ConsciousnessEngine(os.path.join(self.tmpdir.name, "consciousness_graph.json"), autosave_interval=0)
+        for a, b in [("fuego", "calor"), ("calor", "sol"), ("agua", "lluvia")]:
+            self.memory.add_memory(a, b, 1.0)
+        self.engine = ReasoningEngine(self.memory, self.consciousness)
+        self.cache = self.engine.cache
+
+    def tearDown(self):
+        self.engine.close()
+        self.memory.close()
+        self.consciousness.close()
+        self.tmpdir.cleanup()
+
+    def test_normalized_queries_share_entry(self):
+        respuesta = self.engine.process_query("  Fuego ")
+        self.assertEqual(self.engine.process_query("fuego"), respuesta)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_mutation_only_evicts_answers_that_touched_node(self):
+        self.engine.process_query("fuego")
+        self.engine.process_query("agua")
+        self.memory.add_memory("agua", "río", 1.0)
+        self.assertEqual(self.cache.invalidations, 1)
+        self.engine.process_query("fuego")
+        self.assertEqual(self.cache.hits, 1)
+        self.assertIn("río", self.engine.process_query("agua"))
+
+    def test_consciousness_mutation_evicts(self):
+        self.engine.process_query("qué pasa si mentir")
+        self.consciousness.evaluate_decision("mentir", -1.0)
+        self.assertIn("negativas", self.engine.process_query("qué pasa si mentir"))
+
+    def test_unknown_concept_is_invalidated_when_added(self):
+        self.assertIn("No tengo", self.engine.process_query("nieve es agua"))
+        self.memory.add_memory("nieve", "agua", 1.0)
+        self.assertIn("nieve → agua", self.engine.process_query("nieve es agua"))
+
+    def test_path_answer_evicted_by_node_on_path(self):
+        self.assertIn("fuego → calor → sol", self.engine.process_query("fuego es sol"))
+        self.memory.add_memory("fuego", "sol", 5.0)
+        self.assertIn("fuego → sol", self.engine.process_query("fuego es sol"))
+
+    def test_close_stops_listening(self):
+        self.engine.process_query("fuego")
+        self.engine.close()
+        self.memory.add_memory("fuego", "humo", 1.0)
+        self.assertEqual(self.cache.invalidations, 0)
+        self.assertNotIn(self.engine.landmarks._on_memory_change, self.memory._listeners)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,25 @@
 import unittest
 from core.reasoning import ReasoningEngine
+from core.feedback_loop import FeedbackLoop
+from core.graph_registry import get_memory_manager, get_consciousness_engine
 
 class TestReasoning(unittest.TestCase):
     def setUp(self):
         self.engine = ReasoningEngine()
 
+    def tearDown(self):
+        self.engine.close()
+
     def test_basic_reasoning(self):
         result = self.engine.process_query("¿Qué es el fuego?")
         self.assertIsInstance(result, str)
         self.assertNotEqual(result, "")
 
+    def test_shares_graphs_with_registry(self):
+        feedback = FeedbackLoop()
+        self.assertIs(self.engine.memory, get_memory_manager())
+        self.assertIs(feedback.memory, self.engine.memory)
+        self.assertIs(feedback.consciousness, get_consciousness_engine())
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+from core.memory_manager import MemoryManager
+from core.node_versions import NodeVersions
+from core.reasoning import ReasoningEngine
+from core.relevance import RelevanceEngine
+
+
+class TestRelevanceEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory = MemoryManager(os.path.join(self.tmpdir.name, "memory_graph.json"), autosave_interval=0)
+        for a, b, peso in [("fuego", "calor", 2.0), ("fuego", "humo", 0.5), ("calor", "sol", 1.0),
+                           ("sol", "verano", 1.0), ("humo", "nube", 1.0), ("nube", "lluvia", 1.0),
+                           ("fuego", "hielo", 0.0), ("lejos", "remoto", 1.0)]:
+            self.memory.add_memory(a, b, peso)
+
+    def tearDown(self):
+        self.memory.close()
+        self.tmpdir.cleanup()
+
+    def test_matches_exact_pagerank(self):
+        relevance = RelevanceEngine(self.memory, alpha=0.15, epsilon=1e-9)
+        aproximado = relevance.personalized_pagerank(["fuego"])
+        grafo = nx.Graph((u, v, d) for u, v, d in self.memory.graph.edges(data=True) if d["peso"] > 0)
+        exacto = nx.pagerank(grafo, alpha=0.85, personalization={"fuego": 1.0}, weight="peso", tol=1e-12, max_iter=10000)
+        for nodo in ("fuego", "calor", "humo", "sol", "lluvia"):
+            self.assertAlmostEqual(aproximado[nodo], exacto[nodo], places=4)
+        self.assertNotIn("lejos", aproximado)  # Otra componente: no se visita
+        self.assertNotIn("hielo", aproximado)  # Arista sin peso positivo
+
+    def test_rank_and_cache(self):
+        relevance = RelevanceEngine(self.memory)
+        orden = [nodo for nodo, _ in relevance.rank(["fuego"], top_k=3)]
+        self.assertEqual(orden[0], "calor")
+        self.assertNotIn("fuego", orden)
+        relevance.rank(["fuego"])
+        self.assertEqual((relevance.hits, relevance.misses), (1, 1))
+        self.memory.add_memory("fuego", "ceniza", 5.0)
+        self.assertEqual(relevance.rank(["fuego"], top_k=1)[0][0], "ceniza")
+        self.assertEqual(relevance.misses, 2)
+        self.assertEqual(relevance.rank(["desconocido"]), [])
+
+    def test_pagerank_ranking_mode(self):
+        engine = ReasoningEngine(self.memory, consciousness=_SinConciencia(), ranking="pagerank")
+        self.assertEqual(engine.conceptos_relacionados("fuego")[0][0], "calor")
+        self.assertIn("sol", [nodo for nodo, _ in engine.conceptos_relacionados("fuego")])  # Más allá de un salto
+        engine.close()
+        with self.assertRaises(ValueError):
+            ReasoningEngine(self.memory, consciousness=_SinConciencia(), ranking="azar")
+
+
+class _SinConciencia:
+    node_versions = NodeVersions()
+
+    def get_concept_info(self, concepto):
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
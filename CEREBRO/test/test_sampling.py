@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from core.memory_manager import MemoryManager
+from learning.sampling import NeighborSampler
+
+
+class TestNeighborSampler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.memory = MemoryManager(os.path.join(self.tmpdir.name, "memory_graph.json"), autosave_interval=0)
+        for i in range(1, 30):
+            self.memory.add_memory("centro", f"n{i}", peso=float(i))
+            self.memory.add_memory(f"n{i}", f"m{i}", peso=0.5)
+
+    def tearDown(self):
+        self.memory.close()
+        self.tmpdir.cleanup()
+
+    def features(self, nodos):
+        return [np.full(3, len(nodo), dtype=np.float32) for nodo in nodos]
+
+    def test_batches_are_bounded_and_cover_all_seeds(self):
+        sampler = NeighborSampler(self.memory, self.features, batch_size=4, fanouts=(3, 2), seed=0)
+        self.assertEqual(sampler.max_batch_nodes, 4 * (1 + 3 + 6))
+        semillas = []
+        for lote in sampler.batches():
+            self.assertLessEqual(len(lote.nodos), sampler.max_batch_nodes)
+            self.assertEqual(lote.x.shape, (len(lote.nodos), 3))
+            self.assertEqual(lote.a.shape, (len(lote.nodos), len(lote.nodos)))
+            denso = lote.a.toarray()
+            np.testing.assert_array_equal(denso, denso.T)
+            semillas.extend(lote.nodos[:lote.n_semillas])
+        self.assertEqual(sorted(semillas), sorted(self.memory.nodes()))
+        self.assertEqual(len(list(sampler)), len(sampler))
+
+    def test_edges_keep_weights(self):
+        sampler = NeighborSampler(self.memory, self.features, fanouts=(1,), seed=1)
+        lote = sampler.sample(["n7"])
+        self.assertEqual(len(lote.nodos), 2)
+        vecino = lote.nodos[1]
+        esperado = self.memory.graph["n7"][vecino]["peso"]
+        self.assertEqual(lote.a.toarray()[0, 1], esperado)
+
+    def test_binary_graph_decodes_only_sampled_neighbors(self):
+        path = os.path.join(self.tmpdir.name, "memory_graph.crbg")
+        memory = MemoryManager(path, autosave_interval=0)
+        for i in range(1, 30):
+            memory.add_memory("centro", f"n{i}", peso=float(i))
+        memory.persistence.compact()
+        memory.close()
+
+        vista = MemoryManager(path, autosave_interval=0)
+        decodificados = []
+        node_name = vista._csr.node_name
+        vista._csr.node_name = lambda i: decodificados.append(i) or node_name(i)
+        vecinos = NeighborSampler(vista, self.features, fanouts=(3,), seed=0)._vecinos("centro", 3)
+        self.assertEqual(len(vecinos), 3)
+        self.assertEqual(len(decodificados), 3)
+        for vecino, peso in vecinos:
+            self.assertEqual(peso, float(vecino[1:]))
+        self.assertIsNone(vista._graph)
+        vista.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,13 +19,50 @@ class GrafoNeuronal(Model):
         # 🚨 Validación antes de procesar
         if tf.reduce_any(tf.math.is_nan(X)):
             raise ValueError("❌ Error: `X` contiene valores NaN.")
-        if tf.reduce_any(tf.math.is_nan(A)):
+        if tf.reduce_any(tf.math.is_nan(A.values)):
             raise ValueError("❌ Error: `A` contiene valores NaN.")
 
         X = self.conv1([X, A])
         X = self.conv2([X, A])
         return self.fc(X)
 
+def grafo_a_sparse_tensor(grafo, nodos, attr="peso"):
+    """
+    📌 Adyacencia como `tf.SparseTensor` construida desde la lista de aristas.
+    - No reserva la matriz densa N×N; conserva `attr` (1.0 si la arista no lo tiene).
+    - En grafos no dirigidos cada arista aparece en ambos sentidos, como en `nx.to_numpy_array`.
+    """
+    nodo_a_idx = {nodo: idx for idx, nodo in enumerate(nodos)}
+    aristas = [(nodo_a_idx[u], nodo_a_idx[v], p) for u, v, p in grafo.edges(data=attr, default=1.0)]
+    filas = np.array([u for u, _, _ in aristas], dtype=np.int64)
+    columnas = np.array([v for _, v, _ in aristas], dtype=np.int64)
+    pesos = np.array([p for _, _, p in aristas], dtype=np.float32)
+
+    if not grafo.is_directed():
+        reflejo = filas != columnas  # Los bucles (u, u) solo se cuentan una vez
+        filas, columnas = np.concatenate([filas, columnas[reflejo]]), np.concatenate([columnas, filas[reflejo]])
+        pesos = np.concatenate([pesos, pesos[reflejo]])
+
+    A = tf.sparse.SparseTensor(
+        indices=np.stack([filas, columnas], axis=1).reshape(-1, 2),
+        values=pesos,
+        dense_shape=(len(nodos), len(nodos))
+    )
+    return tf.sparse.reorder(A)
+
+
+def perdida_mse_dispersa(salida, A):
+    """
+    📌 Igual que `tf.reduce_mean(tf.square(salida - A))` con `A` densa, pero sobre el `SparseTensor`.
+    - Σ_ij (s_i - A_ij)² = N·Σ s_i² - 2·Σ_i s_i·Σ_j A_ij + Σ A_ij², sin materializar la matriz N×N.
+    """
+    s = tf.reshape(salida, [-1])
+    n = tf.cast(tf.shape(s)[0], tf.float32)
+    suma_filas = tf.sparse.reduce_sum(A, axis=1)
+    total = n * tf.reduce_sum(tf.square(s)) - 2.0 * tf.reduce_sum(s * suma_filas) + tf.reduce_sum(tf.square(A.values))
+    return total / (n * n)
+
+
 def convertir_grafo_para_gnn(grafo, nlp):
     """Convierte el grafo de NetworkX a un formato compatible con Spektral (TensorFlow)."""
 
@@ -36,30 +73,26 @@ def convertir_grafo_para_gnn(grafo, nlp):
         raise ValueError("❌ Error: El grafo está vacío, no se puede convertir para la GNN.")
 
     # ✅ Generar embeddings iniciales con spaCy
-    X = np.array([
-        nlp(nodo).vector if nlp(nodo).vector_norm > 0 else np.zeros((300,))
-        for nodo in nodos
-    ])
+    docs = (nlp(nodo) for nodo in nodos)  # Una sola pasada de spaCy por nodo
+    X = np.array([doc.vector if doc.vector_norm > 0 else np.zeros((300,)) for doc in docs])
 
     # 🚨 Verificación: ¿X está vacío o tiene valores NaN?
     if X.size == 0 or np.isnan(X).any():
         raise ValueError("❌ Error: `X` contiene valores NaN o está vacío.")
 
-    # ✅ Convertir la matriz de adyacencia correctamente
-    A = nx.to_numpy_array(grafo, nodelist=nodos, dtype=np.float32)
+    # ✅ Matriz de adyacencia dispersa directamente desde las aristas (sin la matriz densa N×N)
+    A = grafo_a_sparse_tensor(grafo, nodos)
 
-    # 🚨 Verificación: ¿A está vacío o tiene valores NaN?
-    if A.size == 0 or np.isnan(A).any():
-        raise ValueError("❌ Error: `A` contiene valores NaN o está vacío.")
+    # 🚨 Verificación: ¿A tiene valores NaN?
+    if np.isnan(A.values.numpy()).any():
+        raise ValueError("❌ Error: `A` contiene valores NaN.")
 
     # ✅ Convertir a Tensores de TensorFlow
-    A = tf.convert_to_tensor(A, dtype=tf.float32)
     X = tf.convert_to_tensor(X, dtype=tf.float32)
 
     print("✅ Grafo convertido para TensorFlow y Spektral")
-    print(f"📊 X shape: {X.shape}, A shape: {A.shape}")
+    print(f"📊 X shape: {X.shape}, A shape: {tuple(A.dense_shape.numpy())}, aristas: {A.values.shape[0]}")
     print(f"📊 X sample: {X.numpy()[:3]}")  # Imprimir las primeras 3 filas para verificar
-    print(f"📊 A sample: {A.numpy()[:3]}")  # Imprimir las primeras 3 filas para verificar
     return A, X, nodo_a_idx
 
 
@@ -71,7 +104,7 @@ def entrenar_gnn(A, X, epochs=50, lr=0.01):
     for epoch in range(epochs):
         with tf.GradientTape() as tape:
             salida = modelo([X, A], training=True)
-            loss = tf.reduce_mean(tf.square(salida - A))  # Función de pérdida MSE
+            loss = perdida_mse_dispersa(salida, A)  # Función de pérdida MSE (sobre `A` dispersa)
 
         gradientes = tape.gradient(loss, modelo.trainable_variables)
         modelo.optimizer.apply_gradients(zip(gradientes, modelo.trainable_variables))
@@ -1,16 +1,20 @@
 import tensorflow as tf
 
-from GNN.model import GrafoNeuronal
+from GNN.model import GrafoNeuronal, perdida_mse_dispersa
 
 
 def entrenar_gnn(A, X, epochs=50, lr=0.01):
     modelo = GrafoNeuronal(input_dim=X.shape[1])
-    modelo.compile(optimizer=tf.keras.optimizers.Adam(lr), loss="mse")
+    optimizador = tf.keras.optimizers.Adam(lr)
 
     for epoch in range(epochs):
-        loss = modelo.train_on_batch([X, A], A)
+        # `A` es un SparseTensor: la pérdida MSE se calcula sin densificarla
+        with tf.GradientTape() as tape:
+            loss = perdida_mse_dispersa(modelo([X, A], training=True), A)
+        gradientes = tape.gradient(loss, modelo.trainable_variables)
+        optimizador.apply_gradients(zip(gradientes, modelo.trainable_variables))
         if epoch % 10 == 0:
-            print(f"🔄 Epoch {epoch}/{epochs} - Pérdida: {loss:.4f}")
+            print(f"🔄 Epoch {epoch}/{epochs} - Pérdida: {loss.numpy():.4f}")
 
     print("✅ GNN entrenada con éxito")
     return modelo
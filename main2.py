@@ -22,7 +22,7 @@ def menu():
     # 🚨 Verificación: ¿X y A contienen valores válidos?
     if tf.reduce_any(tf.math.is_nan(X)):
         raise ValueError("❌ Error: X contiene valores NaN.")
-    if tf.reduce_any(tf.math.is_nan(A)):
+    if tf.reduce_any(tf.math.is_nan(A.values)):
         raise ValueError("❌ Error: A contiene valores NaN.")
 
     modelo_gnn = entrenar_gnn(A, X, epochs=50, lr=0.01)